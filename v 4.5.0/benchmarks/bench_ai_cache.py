@@ -0,0 +1,128 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ AI Response Cache Benchmark - a day of repeated game questions
+(popular items asked about again and again, in different words)
+through chat_with_groq against a local fake Groq endpoint: API
+calls, hit rate, time saved, and answers served for the wrong
+question (a near-duplicate match that shouldn't have happened)
+Run from the bot folder: python benchmarks/bench_ai_cache.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from config import AI_CACHE_SIMILARITY
+from utils import ai_cache, ai_chat, wiki_corpus, wiki_vectors
+from utils.ai_scheduler import AIScheduler
+from utils.http_client import close_http_client
+from utils.llm_router import LLMRouter, Provider
+from utils.wiki_index import content_hash
+
+ITEMS = 150
+QUESTIONS = 2000
+API_SECONDS = 0.02       # Fake Groq latency (real calls take ~1-3 s)
+COMMON = ("the a to of and in is you it for on with can get do how what where does best use "
+          "drop from level boss quest sword fruit damage stats build i are this that your").split()
+
+# Same intent, different wording - should share an answer
+INTENTS = {
+    'obtain': ["how do i get {x}", "How do I get {x}??", "how to get {x}", "how can i get {x}",
+               "{x} how to get", "{x}, how do you get it"],
+    'stats': ["what does {x} do", "What does {x} do?", "what is {x}", "what are {x} stats",
+              "what are the stats of {x}", "{x} stats"]
+}
+
+def word(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 9)))
+
+def make_corpus(rng: random.Random, items: list) -> dict:
+    pages = {}
+    for item in items:
+        topic = [item] + [word(rng) for _ in range(5)]
+        words = [rng.choice(COMMON) if rng.random() < 0.7 else rng.choice(topic) for _ in range(300)]
+        content = ' '.join(words)
+        pages[item.title()] = {"title": item.title(), "content": content, "content_hash": content_hash(content),
+                               "url": f"https://sbor.fandom.com/wiki/{item.title()}", "images": [],
+                               "last_updated": "2026-01-01T00:00:00"}
+    return pages
+
+def make_questions(rng: random.Random, items: list) -> list:
+    """Zipf-popular items, random intent and wording"""
+    weights = [1 / (rank + 1) for rank in range(len(items))]
+    questions = []
+    for item in rng.choices(items, weights=weights, k=QUESTIONS):
+        intent = rng.choice(sorted(INTENTS))
+        questions.append((rng.choice(INTENTS[intent]).format(x=item), (item, intent)))
+    return questions
+
+api_calls = 0
+
+async def fake_groq(request: web.Request) -> web.Response:
+    global api_calls
+    body = await request.json()
+    api_calls += 1
+    await asyncio.sleep(API_SECONDS)
+    # Cacheable questions are sent without the "username: " prefix
+    question = body['messages'][-1]['content'].split(': ', 1)[-1]
+    return web.json_response({'choices': [{'message': {'content': f"ANSWER::{question}"}}]})
+
+async def run(questions: list, intent_of: dict) -> dict:
+    global api_calls
+    api_calls = 0
+    wrong = 0
+    start = time.perf_counter()
+    for i, (question, target) in enumerate(questions):
+        answer, _ = await ai_chat.chat_with_groq(question, i, "member")
+        wrong += intent_of[answer.split("::", 1)[1]] != target
+    return {'calls': api_calls, 'seconds': time.perf_counter() - start, 'wrong': wrong}
+
+async def main():
+    rng = random.Random(23)
+    items = sorted({word(rng) for _ in range(ITEMS)})
+    questions = make_questions(rng, items)
+    intent_of = {question: target for question, target in questions}
+
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', fake_groq)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/chat/completions"
+    ai_chat.llm_router = LLMRouter([Provider("groq", url, "bench", "bench")])
+    # Local fake endpoint - no provider quota to respect
+    ai_chat.ai_scheduler = AIScheduler(rpm=10 ** 6, tpm=10 ** 9, burst=100)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, "wiki_corpus")
+        wiki_vectors.WIKI_VECTORS_DIR = os.path.join(tmp, "wiki_vectors")
+        wiki_corpus.get_corpus("sbor").update(make_corpus(rng, items))
+        wiki_vectors.get_wiki_vectors().rebuild(["sbor"])
+
+        print(f"questions: {QUESTIONS} about {ITEMS} items (Zipf), {sum(map(len, INTENTS.values()))} wordings "
+              f"of {len(INTENTS)} intents  fake API: {API_SECONDS * 1000:.0f} ms/call")
+        for name, similarity in (("no cache", None), ("exact keys only", 1.0),
+                                 (f"near-duplicates ≥ {AI_CACHE_SIMILARITY}", AI_CACHE_SIMILARITY)):
+            ai_cache.response_cache.__init__(max_size=0 if similarity is None else ai_cache.AI_CACHE_SIZE,
+                                             min_similarity=similarity or 1.0)
+            result = await run(questions, intent_of)
+            stats = ai_cache.get_response_cache_stats()
+            print(f"{name:24} API calls {result['calls']:5}  hit rate {stats['hit_rate'] * 100:5.1f}% "
+                  f"({stats['near_hits']} rephrased)  {result['seconds']:6.2f} s  "
+                  f"wrong answers {result['wrong']}")
+        wiki_corpus.close_corpora()
+
+    await close_http_client()
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
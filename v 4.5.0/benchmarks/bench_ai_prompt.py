@@ -0,0 +1,94 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ AI Prompt Benchmark - prompt size and build time per request
+as learned facts pile up: the old string rebuild (whole knowledge
+base + every fact category + all wiki info) vs the budgeted builder
+Run from the bot folder: python benchmarks/bench_ai_prompt.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import AI_PROMPT_TOKEN_BUDGET
+from utils import ai_chat
+from utils.ai_prompt import build_messages, estimate_tokens, get_prompt_stats, prompt_tokens
+
+CATEGORY_COUNTS = (5, 50, 500)   # Learned fact categories (5 facts each)
+REQUESTS = 500
+PASSAGE_WORDS = 120              # One wiki_vectors chunk
+
+def words(rng: random.Random, count: int) -> str:
+    return ' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+                    for _ in range(count))
+
+def make_facts(rng: random.Random, categories: int) -> dict:
+    return {f"topic_{i}": [f"someone said: remember {words(rng, 12)}" for _ in range(5)] for i in range(categories)}
+
+def make_request(rng: random.Random) -> tuple:
+    passages = [{'game': "SBOR", 'title': words(rng, 2).title(), 'content': words(rng, PASSAGE_WORDS),
+                 'url': ''} for _ in range(3)]
+    history = []
+    for _ in range(5):
+        history.append({"role": "user", "content": words(rng, 20)})
+        history.append({"role": "assistant", "content": words(rng, 60)})
+    return passages, history, f"member: {words(rng, 15)}?"
+
+def legacy_messages(passages: list, history: list, message: str) -> list:
+    """What chat_with_groq did before: rebuild everything, append everything"""
+    text = "\n\nTHINGS I'VE LEARNED:\n"
+    for category, facts in ai_chat.learned_facts.items():
+        text += f"\n{category.upper()}:\n"
+        for fact in facts[:5]:
+            text += f"- {fact}\n"
+    system_prompt = ai_chat.KNOWLEDGE_BASE + text
+    system_prompt += "\n\nRELEVANT GAME INFO FROM DATABASE:\n"
+    for info in passages:
+        system_prompt += f"\n[{info['game']} - {info['title']}]\n{info['content']}\n"
+    return [{"role": "system", "content": system_prompt}] + history[-5:] + [{"role": "user", "content": message}]
+
+def size(messages: list) -> tuple:
+    return (sum(estimate_tokens(msg['content']) for msg in messages),
+            len(json.dumps(messages, ensure_ascii=False).encode('utf-8')))
+
+def timed(build, requests: list) -> float:
+    """Seconds per request to assemble the messages"""
+    start = time.perf_counter()
+    for request in requests:
+        build(*request)
+    return (time.perf_counter() - start) / len(requests)
+
+def new_messages(passages: list, history: list, message: str) -> list:
+    return build_messages(ai_chat.KNOWLEDGE_BASE, ai_chat.get_learned_facts_text(), passages, history, message)[0]
+
+def main():
+    rng = random.Random(20)
+    requests = [make_request(rng) for _ in range(REQUESTS)]
+    print(f"budget: {AI_PROMPT_TOKEN_BUDGET} tokens  requests: {REQUESTS} "
+          f"(3 wiki chunks of {PASSAGE_WORDS} words, 5 exchanges of history)")
+
+    for categories in CATEGORY_COUNTS:
+        ai_chat.learned_facts = make_facts(rng, categories)
+        ai_chat.learned_facts_text = None
+        old_s = timed(legacy_messages, requests)
+        old_tokens, old_bytes = size(legacy_messages(*requests[-1]))
+        new_s = timed(new_messages, requests)
+        stats = get_prompt_stats()
+
+        print(f"{categories:4} fact categories   old: ~{old_tokens:6} tokens {old_bytes / 1024:6.1f} KB  "
+              f"{old_s * 1e6:6.0f} µs   new: ~{stats['last']['total']:5} tokens "
+              f"{stats['bytes']['p50'] / 1024:5.1f} KB  {new_s * 1e6:6.0f} µs  "
+              f"(facts {stats['last']['facts']}, wiki {stats['last']['wiki']}, history {stats['last']['history']})")
+
+    largest = max(prompt_tokens.samples)
+    print(f"largest prompt built: ~{largest:.0f} tokens "
+          f"{'✅ within' if largest <= AI_PROMPT_TOKEN_BUDGET else '❌ over'} budget")
+
+if __name__ == "__main__":
+    main()
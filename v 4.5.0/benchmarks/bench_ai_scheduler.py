@@ -0,0 +1,161 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ AI Scheduler Benchmark - a rush of questions from many channels
+(one spammer included) against a local fake Groq endpoint that
+answers 429 over its requests-per-second quota. The old per-channel
+cooldown vs the shared queue: answered, bounced, 429s, wait times
+and how evenly the answers are spread over users.
+Time is scaled down: a "minute" of quota here is one second.
+Run from the bot folder: python benchmarks/bench_ai_scheduler.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter, deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from utils import ai_cache, ai_chat
+from utils.ai_scheduler import AIScheduler
+from utils.http_client import close_http_client
+from utils.llm_router import LLMRouter, Provider
+from utils.metrics import LatencyTracker, format_latency
+
+QUOTA = 10               # Fake provider: requests per rolling second, 429 above that
+API_SECONDS = 0.3        # Fake Groq latency
+RUSH_SECONDS = 10        # Questions arrive over this long
+QUIET_CHANNELS = 40       # Plus channel 0, where the spammer is
+USERS_PER_CHANNEL = 2    # Each asks once or twice
+SPAM = 15                # Questions the spammer fires in the first seconds
+COOLDOWN = 2             # The old per-channel MIN_REQUEST_INTERVAL
+DEADLINE = 4             # Scaled down from AI_QUEUE_DEADLINE
+
+# ═══════════════════════════════════════════════════════════════
+# FAKES
+# ═══════════════════════════════════════════════════════════════
+
+recent = deque()
+provider = Counter()
+
+async def fake_groq(request: web.Request) -> web.Response:
+    now = time.monotonic()
+    while recent and recent[0] <= now - 1:
+        recent.popleft()
+    if len(recent) >= QUOTA:
+        provider['429'] += 1
+        return web.json_response({'error': 'rate limited'}, status=429, headers={'Retry-After': '1'})
+    recent.append(now)
+    provider['ok'] += 1
+    await asyncio.sleep(API_SECONDS)
+    return web.json_response({'choices': [{'message': {'content': "ANSWER"}}]})
+
+def make_traffic(rng: random.Random) -> list:
+    """(arrival second, channel, user), sorted by arrival"""
+    traffic = [(rng.uniform(0, 1.5), 0, "spammer") for _ in range(SPAM)]
+    for channel_id in range(QUIET_CHANNELS + 1):
+        for user in range(USERS_PER_CHANNEL if channel_id else 2):
+            for _ in range(rng.randint(1, 2)):
+                traffic.append((rng.uniform(0, RUSH_SECONDS), channel_id, f"member{channel_id}-{user}"))
+    return sorted(traffic)
+
+def outcome(answer: str) -> str:
+    if answer == "ANSWER":
+        return 'answered'
+    if "too many requests" in answer:
+        return '429'
+    if "cooling down" in answer:
+        return 'cooldown'
+    if "already got questions" in answer:
+        return 'per-user limit'
+    if "swamped" in answer or "too busy" in answer:
+        return 'queue full/deadline'
+    return answer
+
+# ═══════════════════════════════════════════════════════════════
+# RUNS
+# ═══════════════════════════════════════════════════════════════
+
+async def run(traffic: list, cooldown: bool) -> dict:
+    last_request = {}
+    outcomes, answered = Counter(), Counter()
+    waits = LatencyTracker()
+    provider.clear()
+    start = time.monotonic()
+
+    async def ask(at: float, channel_id: int, user: str):
+        await asyncio.sleep(max(0.0, start + at - time.monotonic()))
+        asked = time.monotonic()
+        if cooldown:
+            # What chat_with_groq did before: one request per channel every COOLDOWN seconds
+            wait = last_request.get(channel_id, 0) + COOLDOWN - asked
+            if wait > 0:
+                outcomes['cooldown'] += 1
+                return
+            last_request[channel_id] = asked
+        answer, _ = await ai_chat.chat_with_groq("how do i get the dark blade?", channel_id, user, user_id=user)
+        result = outcome(answer)
+        outcomes[result] += 1
+        if result == 'answered':
+            answered[user] += 1
+            waits.record(time.monotonic() - asked - API_SECONDS)
+
+    await asyncio.gather(*(ask(*question) for question in traffic))
+    users = {user for _, _, user in traffic}
+    return {
+        'outcomes': outcomes,
+        'provider_429': provider['429'],
+        'seconds': time.monotonic() - start,
+        'wait': waits.summary(),
+        'spammer': answered['spammer'],
+        'users_answered': sum(1 for user in users if answered[user]),
+        'users': len(users)
+    }
+
+async def main():
+    app = web.Application()
+    app.router.add_post('/v1/chat/completions', fake_groq)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/chat/completions"
+    ai_chat.llm_router = LLMRouter([Provider("groq", url, "bench", "bench")])
+
+    async def no_wiki(query):
+        return []
+    ai_chat.search_game_database = no_wiki
+    ai_chat.conversations.save = lambda *args, **kwargs: True
+    ai_cache.response_cache.__init__(max_size=0)
+
+    traffic = make_traffic(random.Random(24))
+    print(f"{len(traffic)} questions over {RUSH_SECONDS} s from {QUIET_CHANNELS + 1} channels "
+          f"({SPAM} from one spammer)  fake quota {QUOTA} req/s, {API_SECONDS * 1000:.0f} ms/call")
+
+    unlimited = AIScheduler(max_concurrency=10 ** 6, rpm=10 ** 9, tpm=10 ** 12, burst=10 ** 6,
+                            max_queue=10 ** 6, per_user=10 ** 6)
+    # Quotas scaled to one second = one minute, with a little headroom under the provider's
+    fair = AIScheduler(max_concurrency=4, rpm=(QUOTA - 2) * 60, tpm=10 ** 12, burst=2,
+                       max_queue=50, per_user=2, deadline=DEADLINE)
+    for name, scheduler, cooldown in (("per-channel cooldown", unlimited, True),
+                                      ("shared fair queue", fair, False)):
+        ai_chat.ai_scheduler = scheduler
+        result = await run(traffic, cooldown)
+        outcomes = ', '.join(f"{kind} {count}" for kind, count in sorted(result['outcomes'].items()))
+        print(f"{name:21} {outcomes}  (provider 429s {result['provider_429']})  {result['seconds']:5.1f} s")
+        print(f"{'':21} users answered {result['users_answered']}/{result['users']}  "
+              f"spammer answered {result['spammer']}/{SPAM}  wait {format_latency(result['wait'])}")
+        await asyncio.sleep(1.1)  # Let the fake quota window drain between runs
+
+    stats = fair.stats()
+    print(f"queue: peak {stats['peak_queued']} waiting  served {stats['served']}  rejected {stats['rejected']}  "
+          f"past deadline {stats['timed_out']}  429 pauses {stats['rate_limited']}")
+    await close_http_client()
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ AI Streaming Benchmark - time until the member sees words:
+waiting for the whole completion vs streaming it into an edited
+reply. A local fake Groq endpoint sends tokens at a steady pace,
+a fake Discord channel records every post and edit.
+Run from the bot folder: python benchmarks/bench_ai_stream.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from config import AI_STREAM_EDIT_INTERVAL
+from utils import ai_cache, ai_chat
+from utils.ai_scheduler import AIScheduler
+from utils.http_client import close_http_client
+from utils.llm_router import LLMRouter, Provider
+from utils.stream_reply import StreamingReply, get_stream_stats
+
+ANSWER_TOKENS = 600      # Long enough to roll into a follow-up message
+TOKEN_SECONDS = 0.01     # Generation speed of the fake model
+FIRST_TOKEN_SECONDS = 0.3
+DISCORD_LATENCY = 0.08   # Per post/edit
+EDIT_LIMIT = (5, 5.0)    # Discord: 5 edits per 5 seconds per message
+
+# ═══════════════════════════════════════════════════════════════
+# FAKES
+# ═══════════════════════════════════════════════════════════════
+
+def make_answer(rng: random.Random) -> list:
+    return [' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 9)))
+            for _ in range(ANSWER_TOKENS)]
+
+async def fake_groq(request: web.Request) -> web.StreamResponse:
+    body = await request.json()
+    tokens = request.app['tokens']
+    await asyncio.sleep(FIRST_TOKEN_SECONDS)
+    if not body.get('stream'):
+        await asyncio.sleep(TOKEN_SECONDS * len(tokens))
+        return web.json_response({'choices': [{'message': {'content': ''.join(tokens)}}]})
+
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+    await response.prepare(request)
+    for token in tokens:
+        chunk = {'choices': [{'delta': {'content': token}}]}
+        await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        await asyncio.sleep(TOKEN_SECONDS)
+    await response.write(b"data: [DONE]\n\n")
+    return response
+
+class FakeSent:
+    def __init__(self, log: list, content: str):
+        self.log, self.content, self.edits = log, content, []
+
+    async def edit(self, content: str):
+        await asyncio.sleep(DISCORD_LATENCY)
+        self.edits.append(time.monotonic())
+        self.content = content
+        self.log.append(('edit', time.monotonic()))
+
+class FakeChannel:
+    def __init__(self, log: list, messages: list):
+        self.id, self.log, self.messages = 1, log, messages
+
+    async def send(self, content: str) -> FakeSent:
+        await asyncio.sleep(DISCORD_LATENCY)
+        sent = FakeSent(self.log, content)
+        self.messages.append(sent)
+        self.log.append(('send', time.monotonic()))
+        return sent
+
+class FakeMessage:
+    def __init__(self):
+        self.log, self.messages = [], []
+        self.channel = FakeChannel(self.log, self.messages)
+
+    async def reply(self, content: str, mention_author: bool = True) -> FakeSent:
+        return await self.channel.send(content)
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+async def answer(stream: bool, channel_id: int) -> tuple:
+    message = FakeMessage()
+    started = time.monotonic()
+    reply = StreamingReply(message, started)
+    text, _ = await ai_chat.chat_with_groq("how do i get the dark blade?", channel_id, "member",
+                                           on_text=reply.update if stream else None)
+    await reply.finish(text)
+    return message, reply.first_visible, time.monotonic() - started
+
+def worst_edit_burst(message: FakeMessage) -> int:
+    window = EDIT_LIMIT[1]
+    return max((sum(1 for t in sent.edits if start <= t < start + window)
+                for sent in message.messages for start in sent.edits), default=0)
+
+async def main():
+    app = web.Application()
+    app['tokens'] = make_answer(random.Random(22))
+    app.router.add_post('/v1/chat/completions', fake_groq)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    url = f"http://127.0.0.1:{port}/v1/chat/completions"
+    ai_chat.llm_router = LLMRouter([Provider("groq", url, "bench", "bench")])
+    # Local fake endpoint - no provider quota to respect
+    ai_chat.ai_scheduler = AIScheduler(rpm=10 ** 6, tpm=10 ** 9, burst=100)
+
+    async def no_wiki(query):
+        return []
+    ai_chat.search_game_database = no_wiki
+    ai_chat.conversations.save = lambda *args, **kwargs: True
+    # Both runs ask the same question - the second must reach the API too
+    ai_cache.response_cache.__init__(max_size=0)
+
+    full = ''.join(app['tokens']).strip()
+    print(f"answer: {ANSWER_TOKENS} tokens, {len(full)} chars, first token after {FIRST_TOKEN_SECONDS} s, "
+          f"then {TOKEN_SECONDS * 1000:.0f} ms/token  (edit interval {AI_STREAM_EDIT_INTERVAL} s)")
+    for stream, channel_id in ((False, 1), (True, 2)):
+        message, first, total = await answer(stream, channel_id)
+        shown = "".join(sent.content for sent in message.messages).replace(" ", "").replace("\n", "")
+        complete = shown == full.replace(" ", "")
+        print(f"{'streamed' if stream else 'blocking':9} first words after {first:5.2f} s   done after {total:5.2f} s   "
+              f"messages {len(message.messages)}  edits {sum(len(sent.edits) for sent in message.messages):3}  "
+              f"worst {EDIT_LIMIT[1]:.0f}s edit burst {worst_edit_burst(message)}/{EDIT_LIMIT[0]}  "
+              f"{'✅ full answer shown' if complete else '❌ text differs'}")
+
+    stats = get_stream_stats()
+    print(f"stream updates coalesced into edits: {stats['updates']} → {stats['edits']}")
+    await close_http_client()
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Badword Benchmark - Old regex loop vs compiled matcher
+Run from the bot folder: python benchmarks/bench_badwords.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import random
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.badword_matcher import BadwordMatcher
+
+BADWORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "badwords.txt")
+TERM_COUNTS = [150, 5000, 50000]
+MESSAGE_COUNT = 200
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+def load_real_badwords() -> list:
+    """Load the shipped badwords.txt"""
+    try:
+        with open(BADWORDS_FILE, 'r', encoding='utf-8') as f:
+            return [line.strip().lower() for line in f if line.strip() and not line.startswith('#')]
+    except OSError:
+        return []
+
+def make_terms(count: int, rng: random.Random) -> list:
+    """Real badwords padded with random words/phrases up to count"""
+    terms = set(load_real_badwords()[:count])
+    while len(terms) < count:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        if rng.random() < 0.1:
+            word += ' ' + ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 6)))
+        terms.add(word)
+    return list(terms)
+
+def make_messages(terms: list, rng: random.Random) -> list:
+    """Chat-like messages, about 1 in 10 containing a term"""
+    filler = "gg lol anyone want to grind the boss raid later i need more gems for my sword".split()
+    messages = []
+    for _ in range(MESSAGE_COUNT):
+        words = [rng.choice(filler) for _ in range(rng.randint(4, 20))]
+        if rng.random() < 0.1:
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        messages.append(' '.join(words))
+    return messages
+
+# ═══════════════════════════════════════════════════════════════
+# CONTENDERS
+# ═══════════════════════════════════════════════════════════════
+
+def legacy_check(terms: list, text: str) -> bool:
+    """The old per-word re.search loop from check_badwords"""
+    text_lower = text.lower()
+    for badword in terms:
+        if re.search(r'\b' + re.escape(badword) + r'\b', text_lower, re.UNICODE):
+            return True
+    return False
+
+def time_per_message(func, messages: list) -> float:
+    """Average microseconds per message"""
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return (time.perf_counter() - start) / len(messages) * 1e6
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    rng = random.Random(1234)
+    print(f"{'terms':>8} | {'build ms':>9} | {'legacy us/msg':>14} | {'matcher us/msg':>15} | {'speedup':>8}")
+    print("-" * 68)
+
+    for count in TERM_COUNTS:
+        terms = make_terms(count, rng)
+        messages = make_messages(terms, rng)
+
+        start = time.perf_counter()
+        matcher = BadwordMatcher(terms)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        # The legacy loop gets slow fast, so give it fewer messages at scale
+        legacy_messages = messages[:max(5, MESSAGE_COUNT * 150 // count)]
+
+        # Sanity check - both must agree
+        for message in legacy_messages[:5]:
+            assert legacy_check(terms, message) == (matcher.search(message) is not None), message
+        legacy_us = time_per_message(lambda m: legacy_check(terms, m), legacy_messages)
+        matcher_us = time_per_message(matcher.find_all, messages)
+
+        print(f"{count:>8} | {build_ms:>9.1f} | {legacy_us:>14.1f} | {matcher_us:>15.1f} | {legacy_us / matcher_us:>7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Conversation Memory Benchmark - AI chat in thousands of
+channels/threads: the old unbounded dicts vs the LRU store,
+plus snapshot and restore time for a redeploy
+Run from the bot folder: python benchmarks/bench_conversations.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import gc
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CONVERSATION_HISTORY, CONVERSATION_MAX_BYTES, CONVERSATION_MAX_CHANNELS
+from utils.conversation_store import ConversationStore
+
+CHANNELS = 20000        # Threads come and go - every one is a new key
+EXCHANGES = 100000
+HOT_CHANNELS = 50       # Most of the traffic is in a few channels
+
+def text(rng: random.Random, words: int) -> str:
+    return ' '.join(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+                    for _ in range(words))
+
+def make_traffic(rng: random.Random) -> list:
+    phrases = [text(rng, 40) for _ in range(500)]
+    return [(rng.randrange(HOT_CHANNELS) if rng.random() < 0.7 else rng.randrange(CHANNELS),
+             rng.choice(phrases)[:rng.randint(40, 200)], rng.choice(phrases) * 3) for _ in range(EXCHANGES)]
+
+def legacy(traffic: list) -> tuple:
+    """The old conversation_memory / last_request_time pair"""
+    conversation_memory, last_request_time = {}, {}
+    for channel_id, message, reply in traffic:
+        last_request_time[channel_id] = datetime.utcnow()
+        history = conversation_memory.setdefault(channel_id, [])
+        history.append({"role": "user", "content": message})
+        history.append({"role": "assistant", "content": reply})
+        conversation_memory[channel_id] = history[-5 * 2:]
+    return conversation_memory, last_request_time
+
+def bounded(traffic: list) -> ConversationStore:
+    store = ConversationStore()
+    for channel_id, message, reply in traffic:
+        store.history(channel_id)
+        store.add_exchange(channel_id, message, reply)
+    return store
+
+def measure(run, traffic: list) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run(traffic)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current
+
+def main():
+    rng = random.Random(21)
+    traffic = make_traffic(rng)
+    print(f"exchanges: {EXCHANGES} over {CHANNELS} channels (70% in {HOT_CHANNELS})  "
+          f"caps: {CONVERSATION_MAX_CHANNELS} channels, {CONVERSATION_MAX_BYTES / 2 ** 20:.0f} MB, "
+          f"{CONVERSATION_HISTORY} messages each")
+
+    (memory, times), old_s, old_bytes = measure(legacy, traffic)
+    print(f"old dicts    {old_s * 1e6 / EXCHANGES:5.1f} µs/exchange  resident {old_bytes / 2 ** 20:6.1f} MB  "
+          f"channels {len(memory)} (+{len(times)} cooldown stamps, never evicted)")
+    del memory, times
+
+    store, new_s, new_bytes = measure(bounded, traffic)
+    stats = store.stats()
+    print(f"LRU store    {new_s * 1e6 / EXCHANGES:5.1f} µs/exchange  resident {new_bytes / 2 ** 20:6.1f} MB  "
+          f"channels {stats['channels']} (evicted {stats['evictions']})  accounted {stats['bytes'] / 2 ** 20:.1f} MB")
+
+    hot = all(store.history(channel_id) for channel_id in range(HOT_CHANNELS))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "conversations.json")
+        start = time.perf_counter()
+        store.save(path)
+        save_s = time.perf_counter() - start
+        restored = ConversationStore()
+        start = time.perf_counter()
+        loaded = restored.load(path)
+        load_s = time.perf_counter() - start
+        same = all(restored.history(channel_id) == store.history(channel_id) for channel_id in list(store.channels))
+        print(f"snapshot {os.path.getsize(path) / 2 ** 20:.1f} MB in {save_s * 1000:.0f} ms, "
+              f"restored {loaded} channels in {load_s * 1000:.0f} ms")
+
+    print("✅ busy channels kept their history" if hot else "❌ a busy channel was evicted")
+    print("✅ restored conversations match" if same else "❌ restored conversations differ")
+
+if __name__ == "__main__":
+    main()
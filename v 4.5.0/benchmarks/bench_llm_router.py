@@ -0,0 +1,181 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ LLM Router Benchmark - three local stub providers (two OpenAI-
+style, one Anthropic-style) while Groq is healthy, gets a slow
+tail, goes down and comes back. Groq only (what chat_with_groq
+did before) vs the router: answered, latency, who answered.
+Time is scaled down: stub calls take tens of milliseconds.
+Run from the bot folder: python benchmarks/bench_llm_router.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from utils.http_client import close_http_client
+from utils.llm_router import AIProvidersUnavailable, LLMRouter, Provider
+from utils.metrics import LatencyTracker, format_latency
+
+REQUESTS_PER_PHASE = 80
+CONCURRENCY = 4
+STREAM_TOKENS = 20
+TOKEN_SECONDS = 0.005
+
+def healthy(seconds: float, tail: float = 0.03):
+    """Usually about seconds, sometimes a 1.5 s straggler"""
+    return lambda rng: ('ok', 1.5 if rng.random() < tail else seconds * rng.uniform(0.7, 1.3))
+
+def slow(rng):
+    return ('ok', 2.0 if rng.random() < 0.35 else 0.08 * rng.uniform(0.7, 1.3))
+
+def down(rng):
+    return ('error', 503)
+
+PHASES = [
+    ("all healthy", {'groq': healthy(0.08), 'grok': healthy(0.15), 'anthropic': healthy(0.2)}),
+    ("groq slow tail", {'groq': slow, 'grok': healthy(0.15), 'anthropic': healthy(0.2)}),
+    ("groq down", {'groq': down, 'grok': healthy(0.15), 'anthropic': healthy(0.2)}),
+    ("groq recovered", {'groq': healthy(0.08), 'grok': healthy(0.15), 'anthropic': healthy(0.2)})
+]
+
+# ═══════════════════════════════════════════════════════════════
+# STUB PROVIDERS
+# ═══════════════════════════════════════════════════════════════
+
+behaviour = {}
+rng = random.Random(25)
+
+def make_stub(name: str, api: str) -> web.Application:
+    async def handle(request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        result, value = behaviour[name](rng)
+        if result == 'error':
+            await asyncio.sleep(0.02)
+            return web.json_response({'error': 'unavailable'}, status=value)
+        await asyncio.sleep(value)
+        tokens = [f" {name}{i}" for i in range(STREAM_TOKENS)]
+        if not body.get('stream'):
+            text = ''.join(tokens)
+            if api == 'anthropic':
+                return web.json_response({'content': [{'type': 'text', 'text': text}]})
+            return web.json_response({'choices': [{'message': {'content': text}}]})
+
+        response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+        try:
+            await response.prepare(request)
+            for token in tokens:
+                if api == 'anthropic':
+                    event = {'type': 'content_block_delta', 'delta': {'type': 'text_delta', 'text': token}}
+                else:
+                    event = {'choices': [{'delta': {'content': token}}]}
+                await response.write(f"data: {json.dumps(event)}\n\n".encode())
+                await asyncio.sleep(TOKEN_SECONDS)
+            await response.write(b"data: [DONE]\n\n" if api == 'openai' else b'data: {"type": "message_stop"}\n\n')
+        except ConnectionResetError:
+            pass   # Lost a hedge race - the router hung up
+        return response
+
+    app = web.Application()
+    app.router.add_post('/v1/chat', handle)
+    return app
+
+async def serve(app: web.Application) -> tuple:
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/chat"
+
+# ═══════════════════════════════════════════════════════════════
+# RUNS
+# ═══════════════════════════════════════════════════════════════
+
+async def run_phase(router: LLMRouter) -> dict:
+    latency = LatencyTracker()
+    answered_by = Counter()
+    failed = 0
+    todo = list(range(REQUESTS_PER_PHASE))
+
+    async def worker():
+        nonlocal failed
+        while todo:
+            i = todo.pop()
+            stream = i % 2 == 0
+            shown = []
+
+            def on_text(text: str):
+                if not shown:
+                    shown.append(time.monotonic())
+                shown.append(text)
+            messages = [{"role": "system", "content": "You are a bench."}, {"role": "user", "content": f"q{i}"}]
+            started = time.monotonic()
+            try:
+                text, provider = await router.complete(messages, 100, on_text if stream else None)
+            except AIProvidersUnavailable:
+                failed += 1
+                continue
+            # Streamed: time to the first words on screen, else to the whole answer
+            latency.record((shown[0] if stream else time.monotonic()) - started)
+            answered_by[provider] += 1
+            # Streamed words must all come from the provider that answered
+            if not text.startswith(f"{provider}0") or (stream and shown[-1].strip() != text):
+                print(f"❌ request {i}: wrong text from {provider}")
+
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    return {'latency': latency.summary(), 'answered_by': answered_by, 'failed': failed}
+
+async def main():
+    stubs = [("groq", "openai"), ("grok", "openai"), ("anthropic", "anthropic")]
+    runners, urls = [], {}
+    for name, api in stubs:
+        runner, urls[name] = await serve(make_stub(name, api))
+        runners.append(runner)
+
+    def providers(names: list) -> list:
+        return [Provider(name, urls[name], "bench", "bench", api) for name, api in stubs if name in names]
+
+    configs = [
+        # No circuit breaker either - every request went to Groq, whatever state it was in
+        ("groq only", LLMRouter(providers(["groq"]), breaker_error_rate=1.1, breaker_failures=10 ** 6)),
+        # Delays scaled down like the stubs
+        ("router", LLMRouter(providers(["groq", "grok", "anthropic"]), expected_latency=0.15,
+                             hedge_default_delay=0.5, hedge_min_delay=0.15, breaker_cooldown=1.0,
+                             health_seconds=3.0))
+    ]
+    print(f"{REQUESTS_PER_PHASE} requests per phase ({CONCURRENCY} at a time, half streamed); "
+          f"latency = first words (streamed) or whole answer")
+    results = {name: [] for name, _ in configs}
+    for phase, behaviours in PHASES:
+        behaviour.update(behaviours)
+        for name, router in configs:
+            results[name].append(await run_phase(router))
+        await asyncio.sleep(1.1)   # Lets a tripped breaker reach its trial call, like time passing
+
+    for (phase, _), *per_config in zip(PHASES, *results.values()):
+        print(f"── {phase}")
+        for (name, _), result in zip(configs, per_config):
+            served = ', '.join(f"{provider} {count}" for provider, count in result['answered_by'].most_common())
+            print(f"   {name:10} failed {result['failed']:3}/{REQUESTS_PER_PHASE}  {format_latency(result['latency'])}"
+                  f"  answered by: {served or '-'}")
+
+    stats = configs[1][1].stats()
+    print(f"router: hedged {stats['hedged']} (backup won {stats['hedge_wins']})  failovers {stats['failovers']}  "
+          f"failed {stats['failed']}")
+    for provider in stats['providers']:
+        print(f"   {provider['name']:10} {provider['state']:9} calls {provider['calls']:4}  errors {provider['errors']:3}  "
+              f"cancelled {provider['cancelled']:3}  breaker trips {provider['trips']}")
+
+    await close_http_client()
+    for runner in runners:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    asyncio.run(main())
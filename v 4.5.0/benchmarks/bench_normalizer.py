@@ -0,0 +1,116 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Normalizer Benchmark - Normalization + matching per message
+Fails (exit 1) if a message costs more than the budget, or if a
+known case is flagged wrongly
+Run from the bot folder: python benchmarks/bench_normalizer.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.badword_matcher import BadwordMatcher
+from utils.text_normalizer import normalize_variants, normalize_term
+
+from bench_badwords import make_terms
+
+BUDGET_US = 1000       # Per-message budget (p99, cold cache) - remote calls take ~100ms+
+MESSAGE_COUNT = 5000
+TERM_COUNT = 5000
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+TRICKS = [
+    lambda w: w.upper(),
+    lambda w: '\u200b'.join(w),                 # zero-width spaces
+    lambda w: w.replace('a', '4').replace('e', '3').replace('s', '$'),
+    lambda w: ''.join(c * 3 for c in w),              # repeated letters
+    lambda w: w.replace('o', 'о').replace('a', 'а'),  # Cyrillic
+    lambda w: '.'.join(w),
+    lambda w: ''.join(chr(ord(c) + 0xFEE0) if c.isalpha() else c for c in w),  # fullwidth
+]
+
+# Must stay clean: digits/symbols that aren't leetspeak, real double letters
+FALSE_POSITIVES = [
+    "the annal of the guild war",
+    "see you at 5 3 x",
+    "I'm at 7!t",
+    "boss raid at 5 4 3 2 1 go",
+    "gg!! tea time",
+]
+# Must still be caught
+OBFUSCATED = [
+    "sh!t", "$h1t", "p0rn!", "f.u.c.k", "f u c k", "fuuuuck", "a$$", "53x", "@ss",
+]
+CASE_TERMS = ["anal", "sex", "tit", "shit", "porn", "fuck", "ass"]
+
+def make_messages(terms: list, rng: random.Random) -> list:
+    """Unique chat messages, some with an obfuscated badword"""
+    filler = "gg lol anyone want to grind the boss raid later i need more gems for my sword".split()
+    messages = []
+    for i in range(MESSAGE_COUNT):
+        words = [rng.choice(filler) for _ in range(rng.randint(4, 25))]
+        if rng.random() < 0.2:
+            words.insert(rng.randrange(len(words)), rng.choice(TRICKS)(rng.choice(terms)))
+        messages.append(' '.join(words) + f" #{i}")  # unique -> cold cache
+    return messages
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+def check(matcher: BadwordMatcher, text: str) -> bool:
+    """Same flow as moderation.check_badwords"""
+    return any(matcher.search(variant) for variant in normalize_variants(text))
+
+def check_cases() -> int:
+    """Known false positives / obfuscations -> how many came out wrong"""
+    matcher = BadwordMatcher(normalize_term(t) for t in CASE_TERMS)
+    wrong = [text for text in FALSE_POSITIVES if check(matcher, text)]
+    wrong += [text for text in OBFUSCATED if not check(matcher, text)]
+    for text in wrong:
+        print(f"❌ wrong verdict: {text!r} -> {normalize_variants(text)}")
+    total = len(FALSE_POSITIVES) + len(OBFUSCATED)
+    print(f"cases:    {total - len(wrong)}/{total} right -> {'✅ OK' if not wrong else '❌ WRONG'}")
+    return len(wrong)
+
+def main() -> int:
+    rng = random.Random(42)
+    terms = make_terms(TERM_COUNT, rng)
+    matcher = BadwordMatcher(normalize_term(t) for t in terms)
+    messages = make_messages(terms, rng)
+
+    timings = []
+    caught = 0
+    for message in messages:
+        start = time.perf_counter()
+        caught += check(matcher, message)
+        timings.append((time.perf_counter() - start) * 1e6)
+
+    # Warm pass - every text is now cached
+    start = time.perf_counter()
+    for message in messages:
+        check(matcher, message)
+    warm_us = (time.perf_counter() - start) / len(messages) * 1e6
+
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    rate = 1e6 / (sum(timings) / len(timings))
+
+    print(f"messages: {len(messages)}  terms: {TERM_COUNT}  flagged: {caught}")
+    print(f"cold p50: {p50:.1f} us  p99: {p99:.1f} us  ({rate:,.0f} msg/s)")
+    print(f"warm avg: {warm_us:.1f} us")
+    print(f"budget:   {BUDGET_US} us p99 -> {'✅ OK' if p99 <= BUDGET_US else '❌ OVER BUDGET'}")
+    wrong = check_cases()
+    return 0 if p99 <= BUDGET_US and not wrong else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Batch Benchmark - one action=parse per page (HTML) vs
+batched prop=revisions wikitext queries + process-pool parsing,
+on a 5,000-page fixture wiki served by the fake MediaWiki
+Run from the bot folder: python benchmarks/bench_wiki_batch.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_mediawiki import FakeWiki, serve
+from utils import crawl_scheduler, wiki_corpus, wiki_featcher, wiki_journal
+from utils.http_client import close_http_client, get_session
+
+PAGES = 5000
+LEGACY_SAMPLE = 200   # The per-page path is slow, so time a sample and compare rates
+LATENCY = 0.01        # Simulated round trip per request
+DELAY = 0.02          # Gap between requests for the run
+BOT_DELAY = 0.5       # The old fixed RATE_LIMIT_DELAY, for the projection
+
+# ═══════════════════════════════════════════════════════════════
+# FIXTURES
+# ═══════════════════════════════════════════════════════════════
+
+WORDS = ("blade soul raid boss quest level drop rate sword fruit sea king damage "
+         "stamina defense skill combo dungeon floor guild trade rarity legendary").split()
+
+def sentence(rng: random.Random) -> str:
+    return ' '.join(rng.choices(WORDS, k=rng.randint(8, 20))).capitalize() + '.'
+
+def fixture_page(title: str, rng: random.Random) -> tuple:
+    """
+    Roughly what a Fandom article looks like (infobox, prose, lists), as the
+    rendered HTML and as its wikitext, plus the facts either must keep
+    """
+    infobox = [(rng.choice(WORDS).title(), str(rng.randint(1, 9999))) for _ in range(rng.randint(4, 10))]
+    sections = [(rng.choice(WORDS).title(), [f"{sentence(rng)} {sentence(rng)}" for _ in range(rng.randint(1, 3))])
+                for _ in range(rng.randint(2, 4))]
+    links = [w.title() for w in rng.choices(WORDS, k=12)]
+
+    rows = ''.join(f"<tr><th>{key}</th><td>{value}</td></tr>" for key, value in infobox)
+    prose = ''.join(f"<h2><span class=\"mw-headline\">{heading}</span></h2>" + ''.join(f"<p>{p}</p>" for p in paragraphs)
+                    for heading, paragraphs in sections)
+    items = ''.join(f"<li><a href=\"/wiki/{w}\">{w}</a></li>" for w in links)
+    html = (f"<div class=\"mw-parser-output\"><aside class=\"portable-infobox\"><h2>{title}</h2>"
+            f"<table>{rows}</table></aside>{prose}<ul>{items}</ul>"
+            f"<style>.infobox{{float:right}}</style><script>window.wgPage=\"{title}\";</script></div>")
+
+    params = ''.join(f"|{key.lower()} = {value}\n" for key, value in infobox)
+    body = ''.join(f"== {heading} ==\n" + ''.join(f"{p}\n\n" for p in paragraphs) for heading, paragraphs in sections)
+    bullets = ''.join(f"* [[{w}]]\n" for w in links)
+    wikitext = f"{{{{Infobox item\n|title = {title}\n{params}}}}}\n{body}{bullets}[[Category:Items]]\n"
+
+    facts = [value for _, value in infobox] + [p for _, paragraphs in sections for p in paragraphs] + links
+    return html, wikitext, facts
+
+def make_wiki(rng: random.Random) -> tuple:
+    """The fake wiki and every page's facts"""
+    wiki = FakeWiki(latency=LATENCY)
+    facts = {}
+    for i in range(PAGES):
+        title = f"{rng.choice(WORDS).title()} {i}"
+        html, wikitext, facts[title] = fixture_page(title, rng)
+        wiki.create(title, "", html=html, wikitext=wikitext)
+        wiki.pages[title]['images'] = [f"{title.replace(' ', '_')}_{n}.png" for n in range(rng.randint(0, 3))]
+    return wiki, facts
+
+# ═══════════════════════════════════════════════════════════════
+# CONTENDERS
+# ═══════════════════════════════════════════════════════════════
+
+async def legacy_scrape(titles: list, wiki_data: dict):
+    """The old loop: action=parse per page, BeautifulSoup on the event loop"""
+    session = get_session()
+    wiki = wiki_featcher.WIKIS["fake"]
+    for title in titles:
+        params = {"action": "parse", "page": title, "format": "json", "prop": "text|images"}
+        async with session.get(wiki["api_url"], params=params) as response:
+            data = await response.json()
+        text = wiki_featcher.html_to_text(data["parse"]["text"]["*"])
+        wiki_data[title] = wiki_featcher.make_page_data("fake", title, text, data["parse"]["images"])
+        await asyncio.sleep(DELAY)
+
+async def batched_scrape(titles: list, wiki_data: dict):
+    journal = await wiki_journal.get_journal()
+    wiki_journal.run_storage_sync(journal.start_crawl, "fake", "full", True, None, titles, (), True)
+    corpus = wiki_corpus.get_corpus("fake")
+    await wiki_featcher.scrape_pages("fake", titles, corpus, get_session(), journal)
+    await wiki_featcher.merge_checkpoint("fake", corpus, journal)
+    wiki_data.update((title, corpus.get(title)) for title in titles)
+    failed = wiki_journal.run_storage_sync(journal.titles, "fake", "failed")
+    assert not failed, failed[:5]
+
+async def measure(wiki: FakeWiki, scrape, titles: list) -> dict:
+    """Time a scrape and track how long the event loop was stuck"""
+    lag = [0.0]
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag[0] = max(lag[0], time.perf_counter() - start - 0.005)
+
+    wiki.calls.clear()
+    watcher = asyncio.create_task(ticker())
+    wiki_data = {}
+    start = time.perf_counter()
+    await scrape(titles, wiki_data)
+    elapsed = time.perf_counter() - start
+    watcher.cancel()
+
+    requests = len(wiki.calls)
+    # Same run at the bot's real delay: one sleep per request either way
+    projected = elapsed + requests * (BOT_DELAY - DELAY)
+    return {
+        'data': wiki_data,
+        'requests': requests,
+        'rate': len(titles) / elapsed * 60,
+        'bot_rate': len(titles) / projected * 60,
+        'lag_ms': lag[0] * 1000
+    }
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+async def main():
+    rng = random.Random(14)
+    wiki, facts = make_wiki(rng)
+    titles = sorted(wiki.pages)
+    sample = rng.sample(titles, LEGACY_SAMPLE)
+
+    server, base_url = serve(wiki)
+    with tempfile.TemporaryDirectory() as tmp:
+        wiki_featcher.WIKIS = {"fake": {"name": "Fake Wiki", "base_url": base_url, "api_url": f"{base_url}/api.php"}}
+        wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, "wiki_corpus")
+        wiki_journal.WIKI_JOURNAL_FILE = os.path.join(tmp, "wiki_crawl.db")
+        # One request at a time at the same pace, so only batching + parsing differ
+        crawl_scheduler.CRAWL_START_CONCURRENCY = crawl_scheduler.CRAWL_MAX_CONCURRENCY = 1
+        crawl_scheduler.CRAWL_RATE_LIMIT = (1 / DELAY, 1)
+        crawl_scheduler.CRAWL_JITTER = 0
+        try:
+            legacy = await measure(wiki, legacy_scrape, sample)
+            batched = await measure(wiki, batched_scrape, titles)
+
+            # HTML and wikitext read differently ("Rarity 12" vs "rarity: 12") - compare what's kept
+            same = all(fact in legacy['data'][t]['content'] and fact in batched['data'][t]['content']
+                       for t in sample for fact in facts[t])
+            same = same and all(legacy['data'][t]['images'] == batched['data'][t]['images'] for t in sample)
+            print(f"pages: {PAGES}  latency: {LATENCY * 1000:.0f} ms  delay: {DELAY} s "
+                  f"(projected at {BOT_DELAY} s)  parser processes: {wiki_featcher.PARSE_WORKERS}")
+            for name, result, count in (("per-page", legacy, LEGACY_SAMPLE), ("batched", batched, PAGES)):
+                print(f"{name:9} {count:5} pages  {result['requests']:5} requests  "
+                      f"{result['rate']:8.0f} pages/min  {result['bot_rate']:7.0f} pages/min at {BOT_DELAY} s  "
+                      f"max loop stall {result['lag_ms']:6.1f} ms")
+            print(f"speedup at {BOT_DELAY} s delay: {batched['bot_rate'] / legacy['bot_rate']:.0f}x  "
+                  f"{'✅ same facts kept' if same else '❌ content differs'}")
+        finally:
+            wiki_featcher.close_parse_pool()
+            wiki_journal.close_journal()
+            wiki_corpus.close_corpora()
+            await close_http_client()
+            server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
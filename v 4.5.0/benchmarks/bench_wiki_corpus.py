@@ -0,0 +1,133 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Corpus Benchmark - memory and page reads for a 20k-page
+corpus: json.load of wiki_data.json vs the mmap'd corpus store
+(migrated from that same file)
+Run from the bot folder: python benchmarks/bench_wiki_corpus.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import gc
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.wiki_corpus import WikiCorpus, migrate_wiki_data
+from utils.wiki_index import content_hash
+
+PAGES_PER_WIKI = 10000
+CONTENT_CHARS = 5000     # Same cap as make_page_data
+VOCABULARY = 20000
+READS = 2000
+APPENDS = 500            # One WIKI_MERGE_BATCH
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+def make_wiki_data(rng: random.Random) -> dict:
+    words = [''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 11))) for _ in range(VOCABULARY)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY)]
+    data = {}
+    for wiki_key in ("sbor", "bloxfruits"):
+        pages = {}
+        for i in range(PAGES_PER_WIKI):
+            title = f"{' '.join(rng.choices(words[:2000], k=2)).title()} {i}"
+            content = ' '.join(rng.choices(words, weights=weights, k=CONTENT_CHARS // 6))[:CONTENT_CHARS]
+            pages[title] = {
+                "title": title,
+                "content": content,
+                "content_hash": content_hash(content),
+                "url": f"https://{wiki_key}.fandom.com/wiki/{title.replace(' ', '_')}",
+                "images": [f"{title.replace(' ', '_')}_{n}.png" for n in range(rng.randint(0, 5))],
+                "revid": rng.randint(1, 10 ** 6),
+                "last_updated": "2026-01-01T00:00:00"
+            }
+        data[wiki_key] = pages
+    return data
+
+def measure(load) -> tuple:
+    """(result, seconds, bytes still allocated, peak bytes) for load()"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+def mb(size: int) -> str:
+    return f"{size / 2 ** 20:7.1f} MB"
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    rng = random.Random(17)
+    wiki_data = make_wiki_data(rng)
+    sample = [(key, title) for key in wiki_data for title in rng.sample(sorted(wiki_data[key]), READS // 2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "wiki_data.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(wiki_data, f, indent=2, ensure_ascii=False)
+        json_size = os.path.getsize(json_path)
+        del wiki_data
+
+        # Old: every caller loads the whole file
+        def legacy_load():
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        legacy, legacy_s, legacy_mem, legacy_peak = measure(legacy_load)
+        start = time.perf_counter()
+        legacy_pages = [legacy[key][title] for key, title in sample]
+        legacy_read_s = time.perf_counter() - start
+        del legacy
+
+        start = time.perf_counter()
+        directory = os.path.join(tmp, "wiki_corpus")
+        migrate_wiki_data(json_path, directory)
+        migrate_s = time.perf_counter() - start
+        corpus_size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        # New: open = read the small title index, bodies stay on disk
+        corpora, open_s, open_mem, open_peak = measure(
+            lambda: {key: WikiCorpus(key, directory) for key in ("sbor", "bloxfruits")})
+        start = time.perf_counter()
+        pages = [corpora[key].get(title) for key, title in sample]
+        read_s = time.perf_counter() - start
+        same = pages == legacy_pages
+
+        # A merge: append a batch, update the index
+        batch = {title: {**page, "content": page["content"][::-1], "last_updated": "2026-02-01T00:00:00"}
+                 for (_, title), page in zip(sample[:APPENDS], pages)}
+        start = time.perf_counter()
+        corpora["sbor"].update(batch)
+        append_s = time.perf_counter() - start
+        stats = corpora["sbor"].stats()
+        for corpus in corpora.values():
+            corpus.close()
+
+    total = PAGES_PER_WIKI * 2
+    print(f"pages: {total}  wiki_data.json: {mb(json_size)}  corpus files: {mb(corpus_size)} "
+          f"(migrated in {migrate_s:.1f} s)")
+    print(f"json.load    {legacy_s * 1000:8.0f} ms  resident {mb(legacy_mem)}  peak {mb(legacy_peak)}  "
+          f"{READS} reads: {legacy_read_s / READS * 1e6:6.1f} µs each")
+    print(f"corpus open  {open_s * 1000:8.0f} ms  resident {mb(open_mem)}  peak {mb(open_peak)}  "
+          f"{READS} reads: {read_s / READS * 1e6:6.1f} µs each")
+    print(f"append {APPENDS} pages + index write: {append_s * 1000:.0f} ms "
+          f"(dead bytes now {mb(stats['dead_bytes'])}, compactions: {stats['compactions']})")
+    print(f"resident memory: {legacy_mem / open_mem:.0f}x smaller")
+    print("✅ corpus pages match wiki_data.json" if same else "❌ corpus pages differ from wiki_data.json")
+
+if __name__ == "__main__":
+    main()
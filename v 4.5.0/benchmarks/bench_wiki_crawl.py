@@ -0,0 +1,131 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Crawl Benchmark - one wiki after the other, one request
+at a time vs per-host AIMD budgets crawling both wikis at once,
+against fake wikis that answer 429 over capacity and send maxlag
+Run from the bot folder: python benchmarks/bench_wiki_crawl.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_mediawiki import FakeWiki, serve
+from utils import crawl_scheduler, wiki_corpus, wiki_featcher, wiki_index, wiki_journal, wiki_vectors
+from utils.http_client import close_http_client
+
+PAGES = 800          # Per wiki
+LATENCY = 0.25       # A 50-page content query is slow on a real wiki
+CAPACITY = 2         # Concurrent requests before the fake answers 429
+MAXLAG_REQUESTS = 3  # Requests that get a maxlag error mid-crawl
+
+# ═══════════════════════════════════════════════════════════════
+# SETUP
+# ═══════════════════════════════════════════════════════════════
+
+def make_wikis() -> dict:
+    wikis = {}
+    for key in ("sbor", "bloxfruits"):
+        wiki = FakeWiki(latency=LATENCY)
+        for i in range(PAGES):
+            wiki.create(f"{key.title()} Page {i}", f"{key} page {i} about raids, bosses and drops")
+        wiki.capacity = CAPACITY
+        wikis[key] = wiki
+    return wikis
+
+def configure(mode: str, servers: dict, tmp: str):
+    """Fresh files, index and budgets for a run"""
+    wiki_featcher.WIKIS = {
+        key: {"name": key, "base_url": url, "api_url": f"{url}/api.php"} for key, url in servers.items()
+    }
+    wiki_corpus.close_corpora()
+    wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, mode, "wiki_corpus")
+    wiki_vectors.WIKI_VECTORS_DIR = os.path.join(tmp, mode, "wiki_vectors")
+    wiki_vectors._vectors = None
+    wiki_featcher.WIKI_SYNC_FILE = os.path.join(tmp, mode, "wiki_sync.json")
+    wiki_featcher.WIKI_STATS_FILE = os.path.join(tmp, mode, "wiki_stats.json")
+    wiki_journal.close_journal()
+    wiki_journal.WIKI_JOURNAL_FILE = os.path.join(tmp, mode, "wiki_crawl.db")
+    wiki_index._index = wiki_index.WikiIndex(os.path.join(tmp, mode, "wiki_index"))
+    crawl_scheduler._budgets.clear()
+    if mode == "sequential":
+        # Roughly the old fetcher: one request in flight per wiki
+        crawl_scheduler.CRAWL_START_CONCURRENCY = crawl_scheduler.CRAWL_MAX_CONCURRENCY = 1
+    else:
+        crawl_scheduler.CRAWL_START_CONCURRENCY = CONFIG_START
+        crawl_scheduler.CRAWL_MAX_CONCURRENCY = CONFIG_MAX
+
+CONFIG_START = crawl_scheduler.CRAWL_START_CONCURRENCY
+CONFIG_MAX = crawl_scheduler.CRAWL_MAX_CONCURRENCY
+
+async def run(mode: str, wikis: dict, servers: dict, tmp: str) -> dict:
+    configure(mode, servers, tmp)
+    for wiki in wikis.values():
+        wiki.calls.clear()
+        wiki.peak_in_flight = 0
+        wiki.lagged = MAXLAG_REQUESTS
+
+    updates = []
+
+    async def progress(message: str):
+        updates.append(message)
+
+    start = time.perf_counter()
+    if mode == "sequential":
+        counts = {key: await wiki_featcher.fetch_wiki(key, True, progress) for key in wikis}
+    else:
+        counts = await wiki_featcher.fetch_all_wikis(True, progress)
+    elapsed = time.perf_counter() - start
+
+    complete = all(set(wiki_corpus.get_corpus(key)) == set(wiki.pages) for key, wiki in wikis.items())
+    return {
+        'elapsed': elapsed,
+        'pages': sum(counts.values()),
+        'complete': complete,
+        'calls': sum((Counter(w.calls) for w in wikis.values()), Counter()),
+        'peak': max(w.peak_in_flight for w in wikis.values()),
+        'budgets': crawl_scheduler.get_crawl_stats(),
+        'last_update': updates[-1] if updates else "-"
+    }
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+async def main():
+    wikis = make_wikis()
+    started = {key: serve(wiki) for key, wiki in wikis.items()}
+    servers = {key: url for key, (_, url) in started.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            results = {mode: await run(mode, wikis, servers, tmp) for mode in ("sequential", "adaptive")}
+        finally:
+            wiki_featcher.close_parse_pool()
+            wiki_journal.close_journal()
+            wiki_corpus.close_corpora()
+            await close_http_client()
+            for server, _ in started.values():
+                server.shutdown()
+
+    print(f"\n2 wikis x {PAGES} pages  latency: {LATENCY * 1000:.0f} ms  capacity: {CAPACITY}  "
+          f"maxlag errors: {MAXLAG_REQUESTS} per wiki")
+    for mode, result in results.items():
+        calls = result['calls']
+        print(f"{mode:10} {result['elapsed']:6.1f} s  {result['pages'] / result['elapsed'] * 60:7.0f} pages/min  "
+              f"requests: {sum(calls.values())} (429: {calls['throttled']}, maxlag: {calls['maxlag']})  "
+              f"peak in flight: {result['peak']}  {'✅ complete' if result['complete'] else '❌ pages missing'}")
+        for host, stats in result['budgets'].items():
+            print(f"    {host}: window {stats['concurrency']} (peak {stats['peak_concurrency']})  "
+                  f"throttled {stats['throttled']}  retries {stats['retries']}")
+        print(f"    last progress update: {result['last_update']}")
+    print(f"speedup: {results['sequential']['elapsed'] / results['adaptive']['elapsed']:.1f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
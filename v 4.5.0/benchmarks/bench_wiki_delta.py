@@ -0,0 +1,130 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Delta Sync Benchmark - full crawl vs recentchanges delta
+against the local fake MediaWiki (edits, creates, deletes, moves)
+Run from the bot folder: python benchmarks/bench_wiki_delta.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_mediawiki import FakeWiki, serve
+from utils import crawl_scheduler, wiki_corpus, wiki_featcher, wiki_index, wiki_journal, wiki_vectors
+from utils.http_client import close_http_client
+
+PAGES = 400
+EDITS = 12
+CREATES = 5
+DELETES = 4
+MOVES = 3          # suppressredirect - old title disappears
+REDIRECT_MOVES = 2  # old title stays as a redirect page
+
+# ═══════════════════════════════════════════════════════════════
+# SETUP
+# ═══════════════════════════════════════════════════════════════
+
+def point_fetcher_at(base_url: str, tmp: str):
+    """Aim the fetcher at the fake wiki and keep every file in tmp"""
+    wiki_featcher.WIKIS = {"fake": {"name": "Fake Wiki", "base_url": base_url, "api_url": f"{base_url}/api.php"}}
+    wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, "wiki_corpus")
+    wiki_vectors.WIKI_VECTORS_DIR = os.path.join(tmp, "wiki_vectors")
+    wiki_featcher.WIKI_SYNC_FILE = os.path.join(tmp, "wiki_sync.json")
+    wiki_featcher.WIKI_STATS_FILE = os.path.join(tmp, "wiki_stats.json")
+    wiki_journal.WIKI_JOURNAL_FILE = os.path.join(tmp, "wiki_crawl.db")
+    crawl_scheduler.CRAWL_RATE_LIMIT = (1000.0, 1000)
+    crawl_scheduler.CRAWL_JITTER = 0
+    wiki_index._index = wiki_index.WikiIndex(os.path.join(tmp, "wiki_index"))
+
+def make_changes(wiki: FakeWiki, rng: random.Random) -> dict:
+    """What the wiki editors did between two fetches"""
+    titles = sorted(wiki.pages)
+    rng.shuffle(titles)
+    touched = {'edit': titles[:EDITS]}
+    titles = titles[EDITS:]
+    touched['delete'], titles = titles[:DELETES], titles[DELETES:]
+    touched['move'], titles = titles[:MOVES], titles[MOVES:]
+    touched['redirect'] = titles[:REDIRECT_MOVES]
+
+    for title in touched['edit']:
+        wiki.edit(title, f"{title} was rebalanced in the latest update")
+    for i in range(CREATES):
+        wiki.create(f"New Page {i}", f"Brand new page number {i}")
+    for title in touched['delete']:
+        wiki.delete(title)
+    for title in touched['move']:
+        wiki.move(title, f"{title} (Renamed)")
+    for title in touched['redirect']:
+        wiki.move(title, f"{title} (Moved)", leave_redirect=True)
+    # Edited twice, then deleted: must end up gone
+    wiki.create("Short Lived", "about to vanish")
+    wiki.edit("Short Lived", "still about to vanish")
+    wiki.delete("Short Lived")
+    return touched
+
+def check(wiki: FakeWiki) -> list:
+    """Differences between the cached data and the wiki itself"""
+    cached = wiki_corpus.get_corpus("fake")
+    problems = [f"missing {t}" for t in wiki.pages if t not in cached]
+    problems += [f"stale {t}" for t in cached if t not in wiki.pages]
+    for title, page in wiki.pages.items():
+        text = page['html'][3:-4]
+        if title in cached and cached.get(title)['content'] != text:
+            problems.append(f"outdated {title}")
+    indexed = {title for _, title in wiki_index.get_wiki_index().live}
+    if indexed != set(wiki.pages):
+        problems.append(f"index has {len(indexed)} pages, wiki has {len(wiki.pages)}")
+    return problems
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+async def timed_fetch(wiki: FakeWiki, force: bool = False):
+    wiki.calls.clear()
+    start = time.perf_counter()
+    scraped = await wiki_featcher.fetch_wiki("fake", force=force)
+    return scraped, time.perf_counter() - start, Counter(wiki.calls)
+
+async def main():
+    rng = random.Random(13)
+    wiki = FakeWiki()
+    for i in range(PAGES):
+        wiki.create(f"Page {i}", f"Content of page {i} with some words")
+
+    server, base_url = serve(wiki)
+    with tempfile.TemporaryDirectory() as tmp:
+        point_fetcher_at(base_url, tmp)
+        try:
+            scraped, full_s, full_calls = await timed_fetch(wiki)
+            print(f"full sync:  {scraped} pages in {full_s:.2f} s  requests: {dict(full_calls)}")
+
+            touched = make_changes(wiki, rng)
+            wiki.flaky.add(touched['edit'][0])  # fails once, must be retried next time
+            scraped, delta_s, delta_calls = await timed_fetch(wiki)
+            print(f"delta sync: {scraped} pages in {delta_s:.2f} s  requests: {dict(delta_calls)}")
+            print(f"changes: {', '.join(f'{len(v)} {k}' for k, v in touched.items())}, {CREATES} create")
+
+            scraped, _, idle_calls = await timed_fetch(wiki)
+            print(f"retry run:  {scraped} pages  requests: {dict(idle_calls)}")
+
+            problems = check(wiki)
+            print("✅ cache matches the wiki" if not problems else f"❌ {len(problems)} problems: {problems[:10]}")
+            print(f"requests: {sum(delta_calls.values())} vs {sum(full_calls.values())} "
+                  f"({sum(full_calls.values()) / max(1, sum(delta_calls.values())):.0f}x fewer)")
+        finally:
+            wiki_featcher.close_parse_pool()
+            wiki_journal.close_journal()
+            wiki_corpus.close_corpora()
+            await close_http_client()
+            server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
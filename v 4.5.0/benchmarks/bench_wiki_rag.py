@@ -0,0 +1,164 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Context Benchmark - what the AI chat gets to read:
+the old substring scan of the first 50 pages vs the BM25 index
+(fallback without numpy) vs hashed TF-IDF chunk vectors
+Run from the bot folder: python benchmarks/bench_wiki_rag.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import wiki_corpus, wiki_vectors
+from utils.wiki_index import WikiIndex, content_hash
+
+PAGES_PER_WIKI = 2500
+CONTENT_CHARS = 5000     # Same cap as make_page_data
+VOCABULARY = 20000
+QUESTIONS = 300
+TOP_K = 3                # WIKI_CONTEXT_CHUNKS
+TOPIC_WORDS = 8          # Names/items a page is about, repeated through its text
+FILLER = "what is the best way to get a in how do i does anyone know where can find".split()
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+def make_wiki_data(rng: random.Random) -> tuple:
+    """Zipf-ish background text plus a handful of topic words per page (its items, bosses, places)"""
+    vocabulary = sorted({''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 11)))
+                         for _ in range(VOCABULARY)})
+    rng.shuffle(vocabulary)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    data, topics = {}, {}
+    for wiki_key in ("sbor", "bloxfruits"):
+        pages = {}
+        for i in range(PAGES_PER_WIKI):
+            title = f"{' '.join(rng.choices(vocabulary[:3000], k=2)).title()} {i}"
+            words = rng.choices(vocabulary, weights=weights, k=CONTENT_CHARS // 6)
+            topic = topics[(wiki_key, title)] = rng.sample(vocabulary[1000:], TOPIC_WORDS)
+            for position in rng.sample(range(len(words)), len(words) // 10):
+                words[position] = rng.choice(topic)
+            content = ' '.join(words)[:CONTENT_CHARS]
+            pages[title] = {
+                "title": title,
+                "content": content,
+                "content_hash": content_hash(content),
+                "url": f"https://{wiki_key}.fandom.com/wiki/{title.replace(' ', '_')}",
+                "images": [],
+                "last_updated": "2026-01-01T00:00:00"
+            }
+        data[wiki_key] = pages
+    return data, topics, set(vocabulary[:300])
+
+def make_questions(wiki_data: dict, topics: dict, common: set, rng: random.Random) -> list:
+    """A member asking about something one page covers: two of its topic words plus a stray one, amid filler"""
+    questions = []
+    for _ in range(QUESTIONS):
+        wiki_key = rng.choice(sorted(wiki_data))
+        title = rng.choice(sorted(wiki_data[wiki_key]))
+        words = [word for word in wiki_data[wiki_key][title]["content"].split() if word not in common]
+        picked = rng.sample(topics[(wiki_key, title)], 2) + [rng.choice(words)]
+        question = rng.sample(FILLER, 4) + picked
+        rng.shuffle(question)
+        questions.append((' '.join(question) + '?', (wiki_key, title)))
+    return questions
+
+# ═══════════════════════════════════════════════════════════════
+# CONTENDERS
+# ═══════════════════════════════════════════════════════════════
+
+def legacy_context(directory: str, query: str) -> list:
+    """The old search_game_database: reload both files, first 50 pages, substring of the whole message"""
+    query_lower = query.lower()
+    results = []
+    for wiki_key in ("sbor", "bloxfruits"):
+        with open(os.path.join(directory, f"{wiki_key}_wiki.json"), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for page_key, page_data in list(data.get('pages', {}).items())[:50]:
+            if query_lower in page_key or query_lower in page_data.get('content', '').lower():
+                results.append((wiki_key, page_data['title']))
+                if len(results) >= 2:
+                    return results
+    return results
+
+def evaluate(search, questions: list) -> dict:
+    hits, timings = 0, []
+    for question, target in questions:
+        start = time.perf_counter()
+        found = search(question)
+        timings.append((time.perf_counter() - start) * 1000)
+        hits += target in found
+    timings.sort()
+    return {
+        'recall': hits / len(questions),
+        'p50': timings[len(timings) // 2],
+        'p99': timings[int(len(timings) * 0.99)]
+    }
+
+def report(name: str, result: dict, extra: str = ""):
+    print(f"{name:22} hit@{TOP_K}: {result['recall'] * 100:5.1f}%   "
+          f"p50 {result['p50']:8.2f} ms   p99 {result['p99']:8.2f} ms   {extra}")
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    rng = random.Random(19)
+    wiki_data, topics, common = make_wiki_data(rng)
+    questions = make_questions(wiki_data, topics, common, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for wiki_key, pages in wiki_data.items():
+            with open(os.path.join(tmp, f"{wiki_key}_wiki.json"), 'w', encoding='utf-8') as f:
+                json.dump({"pages": {title.lower(): page for title, page in pages.items()}}, f, ensure_ascii=False)
+        legacy = evaluate(lambda q: legacy_context(tmp, q), questions[:30])
+
+        wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, "wiki_corpus")
+        for wiki_key, pages in wiki_data.items():
+            wiki_corpus.get_corpus(wiki_key).update(pages)
+
+        index = WikiIndex(os.path.join(tmp, "wiki_index"))
+        for wiki_key, pages in wiki_data.items():
+            index.update_wiki(wiki_key, pages)
+        bm25 = evaluate(lambda q: [(seg.docs[doc][0], seg.docs[doc][1]) for seg, doc, _, _ in index.search(q, TOP_K)],
+                        questions)
+
+        print(f"pages: {PAGES_PER_WIKI * 2}  questions: {QUESTIONS} (2 topic words + 1 stray word of a page, among filler)")
+        report("old substring, 50 pp", legacy, "(30 questions - it re-reads both files every time)")
+        report("BM25 index (no numpy)", bm25)
+
+        directory = os.path.join(tmp, "wiki_vectors")
+        store = wiki_vectors.WikiVectors(directory)
+        start = time.perf_counter()
+        store.rebuild(sorted(wiki_data))
+        build_s = time.perf_counter() - start
+        vectors = evaluate(lambda q: [(hit["wiki"], hit["title"]) for hit in store.search(q, TOP_K)], questions)
+        stats = store.stats()
+        report("TF-IDF chunk vectors", vectors, f"{stats['chunks']} chunks, {stats['entries']} non-zeros, "
+                                                f"{stats['bytes'] / 2 ** 20:.0f} MB, built in {build_s:.1f} s")
+
+        # A crawl that changed 1% of the pages: only those are re-embedded
+        store = wiki_vectors.WikiVectors.load(directory)
+        pages = wiki_data["sbor"]
+        for title in rng.sample(sorted(pages), len(pages) // 100):
+            content = pages[title]["content"] + " patched"
+            pages[title] = dict(pages[title], content=content, content_hash=content_hash(content))
+        wiki_corpus.get_corpus("sbor").update(pages)
+        start = time.perf_counter()
+        result = store.update_wiki("sbor")
+        print(f"incremental update: {result['embedded']} pages re-embedded in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms (rebuilt: {result['rebuilt']})")
+        wiki_corpus.close_corpora()
+
+if __name__ == "__main__":
+    main()
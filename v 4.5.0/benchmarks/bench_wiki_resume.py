@@ -0,0 +1,147 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Resume Benchmark - SIGKILL a full crawl halfway, start it
+again, and check it picks up from the journal (no pages fetched
+twice, nothing lost, the corpus never left half-written)
+Run from the bot folder: python benchmarks/bench_wiki_resume.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BOT_DIR)
+
+from benchmarks.fake_mediawiki import FakeWiki, serve
+
+PAGES = 3000
+LATENCY = 0.05
+MERGE_BATCH = 300    # Smaller than the bot's so a few merges happen before the kill
+KILL_AFTER = 1200    # Journaled pages before we pull the plug
+
+# ═══════════════════════════════════════════════════════════════
+# CHILD (the bot process being crashed)
+# ═══════════════════════════════════════════════════════════════
+
+async def child(base_url: str, tmp: str):
+    from utils import crawl_scheduler, wiki_corpus, wiki_featcher, wiki_index, wiki_journal, wiki_vectors
+    from utils.http_client import close_http_client
+
+    wiki_featcher.WIKIS = {"fake": {"name": "Fake Wiki", "base_url": base_url, "api_url": f"{base_url}/api.php"}}
+    wiki_corpus.WIKI_CORPUS_DIR = os.path.join(tmp, "wiki_corpus")
+    wiki_vectors.WIKI_VECTORS_DIR = os.path.join(tmp, "wiki_vectors")
+    wiki_featcher.WIKI_SYNC_FILE = os.path.join(tmp, "wiki_sync.json")
+    wiki_featcher.WIKI_STATS_FILE = os.path.join(tmp, "wiki_stats.json")
+    wiki_featcher.WIKI_MERGE_BATCH = MERGE_BATCH
+    wiki_journal.WIKI_JOURNAL_FILE = os.path.join(tmp, "wiki_crawl.db")
+    wiki_index._index = wiki_index.WikiIndex(os.path.join(tmp, "wiki_index"))
+    crawl_scheduler.CRAWL_RATE_LIMIT = (50.0, 10)
+    try:
+        print(json.dumps({'scraped': await wiki_featcher.fetch_wiki("fake")}))
+    finally:
+        wiki_featcher.close_parse_pool()
+        wiki_journal.close_journal()
+        wiki_corpus.close_corpora()
+        await close_http_client()
+
+# ═══════════════════════════════════════════════════════════════
+# PARENT
+# ═══════════════════════════════════════════════════════════════
+
+def journaled_pages(tmp: str) -> int:
+    """Pages the crawl has checkpointed so far (merged or not)"""
+    path = os.path.join(tmp, "wiki_crawl.db")
+    if not os.path.exists(path):
+        return 0
+    try:
+        with sqlite3.connect(path, timeout=1) as conn:
+            return conn.execute("SELECT COUNT(*) FROM queue WHERE state = 'done'").fetchone()[0]
+    except sqlite3.Error:
+        return 0
+
+def cached_pages(tmp: str) -> set:
+    """Titles in the corpus (reopened from disk, as the bot would after a crash)"""
+    from utils.wiki_corpus import WikiCorpus
+    corpus = WikiCorpus("fake", os.path.join(tmp, "wiki_corpus"))
+    titles = set(corpus)
+    corpus.close()
+    return titles
+
+def last_crawl(tmp: str) -> dict:
+    """The crawl entry /wikiinfo would show"""
+    with open(os.path.join(tmp, "wiki_stats.json"), encoding='utf-8') as f:
+        return json.load(f)["fake"]["crawl"]
+
+def start_child(base_url: str, tmp: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, os.path.abspath(__file__), "--child", base_url, tmp],
+                            cwd=BOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+def main():
+    wiki = FakeWiki(latency=LATENCY)
+    for i in range(PAGES):
+        wiki.create(f"Page {i:05d}", f"Content of page {i}")
+    server, base_url = serve(wiki)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            # Run 1: crash it
+            start = time.perf_counter()
+            process = start_child(base_url, tmp)
+            while journaled_pages(tmp) < KILL_AFTER and process.poll() is None:
+                time.sleep(0.05)
+            process.send_signal(signal.SIGKILL)
+            process.wait()
+            first_s = time.perf_counter() - start
+            first_calls = Counter(wiki.calls)
+            done_at_kill = journaled_pages(tmp)
+            merged_at_kill = len(cached_pages(tmp))
+            crawl_at_kill = last_crawl(tmp)
+
+            # Run 2: resume
+            wiki.calls.clear()
+            start = time.perf_counter()
+            process = start_child(base_url, tmp)
+            output, _ = process.communicate(timeout=600)
+            second_s = time.perf_counter() - start
+            second_calls = Counter(wiki.calls)
+            resumed = [line for line in output.splitlines() if "Resuming" in line]
+
+            cached = cached_pages(tmp)
+            crawl_after = last_crawl(tmp)
+        finally:
+            server.shutdown()
+
+    # What one uninterrupted crawl needs: one query per batch of 50
+    baseline = -(-PAGES // 50)
+    queries = first_calls['query'] + second_calls['query']
+    print(f"pages: {PAGES}  killed after {first_s:.1f} s with {done_at_kill} pages journaled, "
+          f"{merged_at_kill} already merged into the corpus")
+    print(f"run 1 requests: {dict(first_calls)}")
+    print(f"run 2 requests: {dict(second_calls)}  ({second_s:.1f} s)")
+    print(f"resume line: {resumed[0].strip() if resumed else '❌ did not resume'}")
+    print(f"allpages requests: {first_calls['allpages']} + {second_calls['allpages']} "
+          f"(the listing is not repeated after the crash)")
+    print(f"batch queries: {queries} vs {baseline} for an uninterrupted crawl "
+          f"({queries - baseline} redone: batches in flight at the kill)")
+    print(f"manifest after the kill: {crawl_at_kill['state']} {crawl_at_kill['mode']} sync "
+          f"(/wikiinfo shows it as interrupted)")
+    print(f"manifest after the resume: {crawl_after['state']}, resumed={crawl_after['resumed']}, "
+          f"{crawl_after['scraped']} scraped in {crawl_after['seconds']} s, {crawl_after['requests']} requests")
+    complete = set(cached) == set(wiki.pages)
+    print("✅ every page cached after the resume" if complete else
+          f"❌ {len(set(wiki.pages) - set(cached))} pages missing")
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        asyncio.run(child(sys.argv[2], sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,148 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏱️ Wiki Search Benchmark - JSON re-parse + scan vs BM25 index,
+and a 30-page incremental refresh vs a full rebuild
+Run from the bot folder: python benchmarks/bench_wiki_search.py
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.wiki_index import WikiIndex
+
+PAGES_PER_WIKI = 2500
+CONTENT_CHARS = 5000     # Same cap as scrape_page
+VOCABULARY = 20000
+QUERY_COUNT = 200
+LEGACY_QUERIES = 10      # The old path re-parses the whole file, so keep it short
+REFRESHED_PAGES = 30
+
+# ═══════════════════════════════════════════════════════════════
+# DATA
+# ═══════════════════════════════════════════════════════════════
+
+def make_vocabulary(rng: random.Random) -> list:
+    words = set("dragon sword fruit raid boss quest level gems shop sea king blade soul".split())
+    while len(words) < VOCABULARY:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 11))))
+    return list(words)
+
+def make_wiki_data(vocabulary: list, rng: random.Random) -> dict:
+    """Zipf-ish word frequencies, like real wiki text"""
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    data = {}
+    for wiki_key in ("sbor", "bloxfruits"):
+        pages = {}
+        for i in range(PAGES_PER_WIKI):
+            title = ' '.join(rng.choices(vocabulary[:2000], k=rng.randint(1, 3))).title() + f" {i}"
+            words = rng.choices(vocabulary, weights=weights, k=CONTENT_CHARS // 6)
+            pages[title] = {
+                "title": title,
+                "content": ' '.join(words)[:CONTENT_CHARS],
+                "url": f"https://{wiki_key}.fandom.com/wiki/{title.replace(' ', '_')}",
+                "images": [],
+                "last_updated": "2025-01-01T00:00:00"
+            }
+        data[wiki_key] = pages
+    return data
+
+def make_queries(vocabulary: list, rng: random.Random) -> list:
+    queries = []
+    for _ in range(QUERY_COUNT):
+        words = rng.sample(vocabulary[:5000], rng.randint(1, 3))
+        if rng.random() < 0.3:
+            words[-1] = words[-1][:max(2, len(words[-1]) - 2)]  # half-typed last word
+        queries.append(' '.join(words))
+    return queries
+
+# ═══════════════════════════════════════════════════════════════
+# CONTENDERS
+# ═══════════════════════════════════════════════════════════════
+
+def legacy_search(filepath: str, query: str, limit: int = 5) -> list:
+    """The old search_wikis: load_wiki_data() + substring scan"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        wiki_data = json.load(f)
+    query_lower = query.lower()
+    results = []
+    for wiki_key, pages in wiki_data.items():
+        for page_title, page_data in pages.items():
+            if query_lower in page_title.lower() or query_lower in page_data.get("content", "").lower():
+                results.append((100 if query_lower in page_title.lower() else 50, page_title,
+                                page_data.get("content", "")[:200]))
+    results.sort(key=lambda x: x[0], reverse=True)
+    return results[:limit]
+
+def percentiles(timings: list) -> tuple:
+    timings = sorted(timings)
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+# ═══════════════════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    rng = random.Random(7)
+    vocabulary = make_vocabulary(rng)
+    wiki_data = make_wiki_data(vocabulary, rng)
+    queries = make_queries(vocabulary, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "wiki_data.json")
+        index_dir = os.path.join(tmp, "wiki_index")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(wiki_data, f, indent=2, ensure_ascii=False)
+
+        start = time.perf_counter()
+        index = WikiIndex(index_dir)
+        for wiki_key, pages in wiki_data.items():
+            index.update_wiki(wiki_key, pages)
+        build_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        index = WikiIndex.load(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+        index_mb = sum(os.path.getsize(os.path.join(index_dir, n)) for n in os.listdir(index_dir)) / 1e6
+
+        # A routine fetch: a few stale pages re-scraped, one actually edited per ten
+        pages = dict(wiki_data["sbor"])
+        refreshed = rng.sample(sorted(pages), REFRESHED_PAGES)
+        for title in refreshed[:REFRESHED_PAGES // 10]:
+            pages[title] = dict(pages[title], content=pages[title]["content"] + " patched")
+        start = time.perf_counter()
+        result = index.update_wiki("sbor", pages)
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        legacy = []
+        for query in queries[:LEGACY_QUERIES]:
+            start = time.perf_counter()
+            legacy_search(json_path, query)
+            legacy.append((time.perf_counter() - start) * 1000)
+
+        ranked, full = [], []
+        for query in queries:
+            start = time.perf_counter()
+            hits = index.search(query)
+            ranked.append((time.perf_counter() - start) * 1000)
+            for segment, doc_id, _, terms in hits:
+                segment.snippet(doc_id, terms)
+            full.append((time.perf_counter() - start) * 1000)
+
+        print(f"pages: {len(index)}  segments: {len(index.segments)}  queries: {len(queries)}")
+        print(f"json: {os.path.getsize(json_path) / 1e6:.1f} MB   index: {index_mb:.1f} MB")
+        print(f"full build: {build_s:.2f} s   load: {load_ms:.0f} ms (once per process)")
+        print(f"refresh {REFRESHED_PAGES} pages: {incremental_ms:.0f} ms  {result}")
+        print(f"legacy  p50: {percentiles(legacy)[0]:8.2f} ms   p99: {percentiles(legacy)[1]:8.2f} ms")
+        print(f"ranking p50: {percentiles(ranked)[0]:8.3f} ms   p99: {percentiles(ranked)[1]:8.3f} ms")
+        print(f"+snippets p50: {percentiles(full)[0]:6.3f} ms   p99: {percentiles(full)[1]:8.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+═══════════════════════════════════════════════════════════════
+🧪 Fake MediaWiki - Local stand-in for a Fandom api.php
+Just enough of allpages / recentchanges / parse / batched
+prop=revisions|images|extracts to exercise the wiki fetcher
+offline, with a request counter per API call and optional
+throttling (429 over capacity, maxlag errors)
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+class FakeWiki:
+    """Pages + a recentchanges log; every change moves the clock one minute"""
+
+    def __init__(self, start: datetime = None, latency: float = 0.0, extract_limit: int = 20):
+        # Default to a day ago so watermarks look fresh to the fetcher
+        self.clock = start or (datetime.utcnow() - timedelta(days=1)).replace(microsecond=0)
+        self.pages = {}    # title -> {'pageid', 'revid', 'html', 'wikitext'}
+        self.changes = []  # recentchanges rows, oldest first
+        self.next_id = 1
+        self.calls = []    # one entry per API request, e.g. 'parse', 'recentchanges'
+        self.flaky = set() # titles whose next fetch fails (then recovers)
+        self.latency = latency              # seconds added to every response
+        self.extract_limit = extract_limit  # extracts per request with exintro (TextExtracts' exlimit); 1 without
+        self.capacity = None  # concurrent requests before we answer 429
+        self.lagged = 0       # the next N requests that send maxlag get a maxlag error
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    # ═══════════════════════════════════════════════════════════
+    # EDITING (what wiki users do between fetches)
+    # ═══════════════════════════════════════════════════════════
+
+    def _tick(self) -> str:
+        self.clock += timedelta(minutes=1)
+        return self.clock.strftime(TIME_FORMAT)
+
+    def _id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    def _log(self, row: dict):
+        row.update(ns=0, rcid=self._id(), timestamp=self._tick())
+        self.changes.append(row)
+
+    def create(self, title: str, text: str, html: str = None, wikitext: str = None):
+        self.pages[title] = {'pageid': self._id(), 'revid': self._id(), 'html': html or f"<p>{text}</p>",
+                             'wikitext': text if wikitext is None else wikitext, 'images': []}
+        self._log({'type': 'new', 'title': title, 'revid': self.pages[title]['revid']})
+
+    def edit(self, title: str, text: str):
+        self.pages[title].update(revid=self._id(), html=f"<p>{text}</p>", wikitext=text)
+        self._log({'type': 'edit', 'title': title, 'revid': self.pages[title]['revid']})
+
+    def delete(self, title: str):
+        del self.pages[title]
+        self._log({'type': 'log', 'title': title, 'logtype': 'delete', 'logaction': 'delete', 'logparams': {}})
+
+    def move(self, old: str, new: str, leave_redirect: bool = False):
+        page = self.pages.pop(old)
+        self.pages[new] = page
+        params = {'target_ns': 0, 'target_title': new}
+        if leave_redirect:
+            self.pages[old] = {'pageid': self._id(), 'revid': self._id(), 'html': f"<p>Redirect to {new}</p>",
+                               'wikitext': f"Redirect to {new}", 'images': []}
+        else:
+            params['suppressredirect'] = ''
+        self._log({'type': 'log', 'title': old, 'logtype': 'move', 'logaction': 'move', 'logparams': params})
+
+    # ═══════════════════════════════════════════════════════════
+    # API
+    # ═══════════════════════════════════════════════════════════
+
+    def admit(self, params: dict):
+        """Throttling decision before a request is served: None, or (status, headers, body)"""
+        with self.lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            if self.capacity is not None and self.in_flight > self.capacity:
+                self.calls.append('throttled')
+                return 429, {'Retry-After': '1'}, {'error': {'code': 'ratelimited', 'info': 'Too many requests'}}
+            if self.lagged and 'maxlag' in params:
+                self.lagged -= 1
+                self.calls.append('maxlag')
+                return 200, {'Retry-After': '1'}, {'error': {'code': 'maxlag', 'info': 'Waiting for a database server: 7 seconds lagged.', 'lag': 7}}
+        return None
+
+    def done(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def handle(self, params: dict) -> dict:
+        with self.lock:
+            if params.get('action') == 'parse':
+                self.calls.append('parse')
+                return self._parse(params)
+            if params.get('list') == 'allpages':
+                self.calls.append('allpages')
+                return self._allpages(params)
+            if params.get('list') == 'recentchanges':
+                self.calls.append('recentchanges')
+                return self._recentchanges(params)
+            if params.get('action') == 'query' and 'titles' in params:
+                self.calls.append('query')
+                return self._query_pages(params)
+            self.calls.append('unknown')
+            return {'error': {'code': 'badvalue', 'info': 'Unsupported by the fake wiki'}}
+
+    def _parse(self, params: dict) -> dict:
+        title = params.get('page', '')
+        if title in self.flaky:
+            self.flaky.discard(title)
+            return {'error': {'code': 'internal_api_error_DBQueryError', 'info': 'Database query error.'}}
+        if title not in self.pages:
+            return {'error': {'code': 'missingtitle', 'info': "The page you specified doesn't exist."}}
+        page = self.pages[title]
+        return {'parse': {'title': title, 'pageid': page['pageid'], 'revid': page['revid'],
+                          'text': {'*': page['html']}, 'images': page['images']}}
+
+    def _query_pages(self, params: dict) -> dict:
+        """
+        prop=revisions|images|extracts for many titles (formatversion=2 only).
+        Like TextExtracts, a full-page extract (no exintro) is one page per request.
+        """
+        titles = params['titles'].split('|')
+        normalized = [{'from': t, 'to': t.replace('_', ' ')} for t in titles if '_' in t]
+        props = params.get('prop', '').split('|')
+        content = 'content' in params.get('rvprop', '').split('|')
+        extract_limit = self.extract_limit if 'exintro' in params else 1
+        offset = int(params.get('excontinue', 0))
+        done = params.get('continue', '').split('|')
+        pages, extracts = [], 0
+        for i, title in enumerate(t.replace('_', ' ') for t in titles):
+            if title not in self.pages:
+                pages.append({'ns': 0, 'title': title, 'missing': True})
+                continue
+            page = self.pages[title]
+            row = {'pageid': page['pageid'], 'ns': 0, 'title': title}
+            if 'extracts' in props and i >= offset and extracts < extract_limit:
+                if title in self.flaky:
+                    self.flaky.discard(title)  # no extract this time, like a parser timeout
+                else:
+                    row['extract'] = page['html']
+                extracts += 1
+            if 'revisions' in props and 'revisions' not in done:
+                revision = {'revid': page['revid'], 'timestamp': self.clock.strftime(TIME_FORMAT)}
+                if content and title in self.flaky:
+                    self.flaky.discard(title)  # no content this time, like a timed-out read
+                elif content:
+                    revision['slots'] = {'main': {'contentmodel': 'wikitext', 'content': page['wikitext']}}
+                row['revisions'] = [revision]
+            if 'images' in props and 'images' not in done and page['images']:
+                row['images'] = [{'ns': 6, 'title': f"File:{image}"} for image in page['images']]
+            pages.append(row)
+        data = {'batchcomplete': True, 'query': {'pages': pages}}
+        if normalized:
+            data['query']['normalized'] = normalized
+        remaining = [i for i, t in enumerate(titles) if i >= offset and t.replace('_', ' ') in self.pages]
+        if 'extracts' in props and len(remaining) > extract_limit:
+            data.pop('batchcomplete')
+            data['continue'] = {'excontinue': remaining[extract_limit], 'continue': '||revisions|images'}
+        return data
+
+    def _allpages(self, params: dict) -> dict:
+        limit = int(params.get('aplimit', 10))
+        titles = sorted(t for t in self.pages if t >= params.get('apcontinue', ''))
+        data = {'query': {'allpages': [{'pageid': self.pages[t]['pageid'], 'ns': 0, 'title': t} for t in titles[:limit]]}}
+        if len(titles) > limit:
+            data['continue'] = {'apcontinue': titles[limit], 'continue': '-||'}
+        return data
+
+    def _recentchanges(self, params: dict) -> dict:
+        limit = int(params.get('rclimit', 10))
+        rows = list(self.changes)
+        if params.get('rcdir', 'older') == 'older':
+            rows.reverse()
+            if 'rcstart' in params:
+                rows = [r for r in rows if r['timestamp'] <= params['rcstart']]
+        elif 'rcstart' in params:
+            rows = [r for r in rows if r['timestamp'] >= params['rcstart']]
+        if 'rccontinue' in params:
+            rcid = int(params['rccontinue'].split('|')[1])
+            rows = rows[next((i for i, r in enumerate(rows) if r['rcid'] == rcid), len(rows)):]
+        data = {'query': {'recentchanges': rows[:limit]}}
+        if len(rows) > limit:
+            nxt = rows[limit]
+            stamp = nxt['timestamp'].replace('-', '').replace(':', '').replace('T', '').rstrip('Z')
+            data['continue'] = {'rccontinue': f"{stamp}|{nxt['rcid']}", 'continue': '-||'}
+        return data
+
+# ═══════════════════════════════════════════════════════════════
+# HTTP SERVER
+# ═══════════════════════════════════════════════════════════════
+
+def serve(wiki: FakeWiki, host: str = "127.0.0.1", port: int = 0):
+    """Start the fake api.php in a thread. Returns (server, base_url)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = {k: v[-1] for k, v in parse_qs(urlparse(self.path).query).items()}
+            try:
+                rejected = wiki.admit(query)
+                if wiki.latency:
+                    time.sleep(wiki.latency)
+                status, headers, data = rejected or (200, {}, wiki.handle(query))
+            finally:
+                wiki.done()
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # Client went away (killed crawler)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
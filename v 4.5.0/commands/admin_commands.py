@@ -10,6 +10,16 @@ from discord import app_commands
 from datetime import datetime
 from config import *
 from utils import is_admin
+from utils.conversation_store import save_conversations
+from utils.http_client import close_http_client, get_http_status
+from utils.moderation import save_verdict_cache
+from utils.mod_pipeline import stop_moderation_pipeline
+from utils.modlog_sink import close_modlog_sink
+from utils.state_store import flush_all_stores_async
+from utils.storage import close_storage
+from utils.wiki_corpus import close_corpora
+from utils.wiki_featcher import close_parse_pool
+from utils.wiki_journal import close_journal
 
 def setup(bot):
     """Setup admin commands"""
@@ -29,8 +39,37 @@ def setup(bot):
             ephemeral=True
         )
         
+        await stop_moderation_pipeline()
+        await close_modlog_sink()
+        save_verdict_cache()
+        save_conversations()
+        await flush_all_stores_async()
+        close_storage()
+        close_parse_pool()
+        close_journal()
+        close_corpora()
+        await close_http_client()
         await bot.close()
     
+    @bot.tree.command(name="httpstats", description="[ADMIN] View HTTP connection pool stats")
+    async def httpstats(interaction: discord.Interaction):
+        """HTTP pool stats"""
+        if not is_admin(interaction):
+            await interaction.response.send_message(
+                "❌ This command is for administrators only!",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="🌐 HTTP Connection Pools",
+            description=get_http_status()[:4000],
+            color=discord.Color.blue(),
+            timestamp=datetime.now()
+        )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @bot.tree.command(name="sync", description="[ADMIN] Sync slash commands")
     async def sync(interaction: discord.Interaction):
         """Sync commands"""
@@ -12,6 +12,11 @@ from utils import is_staff
 # Import AI system
 try:
     from utils.ai_chat import get_ai_status, clear_memory, get_memory_stats
+    from utils.ai_prompt import get_prompt_stats, format_prompt_stats
+    from utils.ai_cache import get_response_cache_stats, format_response_cache_stats
+    from utils.stream_reply import get_stream_stats, format_stream_stats
+    from utils.ai_scheduler import get_ai_scheduler_stats, format_ai_scheduler_stats
+    from utils.llm_router import get_llm_router_stats, format_llm_router_stats
     AI_AVAILABLE = True
 except:
     AI_AVAILABLE = False
@@ -44,7 +49,42 @@ def setup(bot):
         
         embed.add_field(
             name="💾 Memory Stats",
-            value=stats,
+            value=(
+                f"{stats['total_messages']} messages in {stats['channels']}/{stats['max_channels']} channels\n"
+                f"{stats['bytes'] / 1024:.0f} KB of {stats['max_bytes'] / 1024 / 1024:.0f} MB · "
+                f"evicted {stats['evictions']} · expired {stats['expired']}\n"
+                f"Snapshots: {stats['snapshots']} · Learned facts: {stats['learned_facts']}"
+            ),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🧮 Prompt Size",
+            value=format_prompt_stats(get_prompt_stats()),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🗃️ Response Cache",
+            value=format_response_cache_stats(get_response_cache_stats()),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="⚡ Streaming",
+            value=format_stream_stats(get_stream_stats()),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🚦 Request Queue",
+            value=format_ai_scheduler_stats(get_ai_scheduler_stats()),
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🔀 Providers",
+            value=format_llm_router_stats(get_llm_router_stats()),
             inline=False
         )
         
@@ -120,7 +160,8 @@ def setup(bot):
             response, sources = await chat_with_groq(
                 message,
                 interaction.channel.id,
-                interaction.user.name
+                interaction.user.name,
+                user_id=interaction.user.id
             )
             
             embed = discord.Embed(
@@ -218,7 +218,8 @@ def get_admin_commands_embed():
         name="🔧 System",
         value=(
             "`/shutdown` - Shutdown bot\n"
-            "`/sync` - Sync slash commands"
+            "`/sync` - Sync slash commands\n"
+            "`/httpstats` - HTTP connection pool stats"
         ),
         inline=False
     )
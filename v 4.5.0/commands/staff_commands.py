@@ -10,9 +10,11 @@ from discord import app_commands
 from datetime import datetime
 import json
 import os
-import aiohttp
 from config import *
-from utils import is_staff, load_json, save_json
+from utils import is_staff, load_json
+from utils.state_store import get_store
+from utils import moderation
+from utils.http_client import get_session, get_timeout
 
 def setup(bot):
     """Setup staff commands"""
@@ -35,17 +37,15 @@ def setup(bot):
             )
             return
         
-        faqs = load_json('data/faqs.json')
+        faqs = get_store('data/faqs.json')
         
-        faq_id = len(faqs) + 1
-        faqs[str(faq_id)] = {
+        faq_id = len(faqs.snapshot()) + 1
+        faqs.set(str(faq_id), {
             'question': question,
             'answer': answer,
             'added_by': str(interaction.user.id),
             'added_at': datetime.now().isoformat()
-        }
-        
-        save_json('data/faqs.json', faqs)
+        })
         
         await interaction.response.send_message(
             f"✅ Added FAQ #{faq_id}:\n**Q:** {question}\n**A:** {answer}",
@@ -97,17 +97,17 @@ def setup(bot):
             )
             return
         
-        faqs = load_json('data/faqs.json')
+        faqs = get_store('data/faqs.json')
+        removed_faq = faqs.get(str(faq_id))
         
-        if str(faq_id) not in faqs:
+        if removed_faq is None:
             await interaction.response.send_message(
                 f"❌ FAQ #{faq_id} not found!",
                 ephemeral=True
             )
             return
         
-        removed_faq = faqs.pop(str(faq_id))
-        save_json('data/faqs.json', faqs)
+        faqs.delete(str(faq_id))
         
         await interaction.response.send_message(
             f"✅ Removed FAQ #{faq_id}: {removed_faq['question']}",
@@ -128,10 +128,10 @@ def setup(bot):
             )
             return
         
-        badwords = load_json('data/badwords.json')
+        count = moderation.reload_badwords()
         
         await interaction.response.send_message(
-            f"✅ Reloaded {len(badwords.get('words', []))} badwords!",
+            f"✅ Reloaded {count} badwords!",
             ephemeral=True
         )
     
@@ -146,21 +146,19 @@ def setup(bot):
             )
             return
         
-        badwords = load_json('data/badwords.json')
-        word_lower = word.lower()
-        
-        if word_lower in badwords.get('words', []):
+        if word.lower() in moderation.BADWORDS:
             await interaction.response.send_message(
                 f"⚠️ '{word}' is already in the badwords list!",
                 ephemeral=True
             )
             return
         
-        if 'words' not in badwords:
-            badwords['words'] = []
-        
-        badwords['words'].append(word_lower)
-        save_json('data/badwords.json', badwords)
+        if not moderation.add_badword(word):
+            await interaction.response.send_message(
+                "❌ Couldn't save the badwords list!",
+                ephemeral=True
+            )
+            return
         
         await interaction.response.send_message(
             f"✅ Added '{word}' to badwords list!",
@@ -178,18 +176,19 @@ def setup(bot):
             )
             return
         
-        badwords = load_json('data/badwords.json')
-        word_lower = word.lower()
-        
-        if word_lower not in badwords.get('words', []):
+        if word.lower() not in moderation.BADWORDS:
             await interaction.response.send_message(
                 f"❌ '{word}' is not in the badwords list!",
                 ephemeral=True
             )
             return
         
-        badwords['words'].remove(word_lower)
-        save_json('data/badwords.json', badwords)
+        if not moderation.remove_badword(word):
+            await interaction.response.send_message(
+                "❌ Couldn't save the badwords list!",
+                ephemeral=True
+            )
+            return
         
         await interaction.response.send_message(
             f"✅ Removed '{word}' from badwords list!",
@@ -207,16 +206,19 @@ def setup(bot):
             )
             return
         
-        badwords = load_json('data/badwords.json')
-        text_lower = text.lower()
-        
-        found_words = [word for word in badwords.get('words', []) if word in text_lower]
+        found_words = sorted({term for term, _, _ in moderation.find_badwords(text)})
+        flagged, reason, _ = moderation.check_badwords(text)
         
         if found_words:
             await interaction.response.send_message(
                 f"⚠️ Found badwords: {', '.join(found_words)}",
                 ephemeral=True
             )
+        elif flagged:
+            await interaction.response.send_message(
+                f"⚠️ {reason}",
+                ephemeral=True
+            )
         else:
             await interaction.response.send_message(
                 "✅ No badwords detected!",
@@ -482,23 +484,23 @@ def setup(bot):
     async def fetch_roblox_group(group_id: str) -> dict:
         """Fetch Roblox group information from API"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Get group info
-                async with session.get(f"https://groups.roblox.com/v1/groups/{group_id}") as resp:
-                    if resp.status != 200:
-                        return None
-                    group_data = await resp.json()
-                
-                # Get group icon
-                async with session.get(f"https://thumbnails.roblox.com/v1/groups/icons?groupIds={group_id}&size=420x420&format=Png") as resp:
-                    if resp.status == 200:
-                        thumb_data = await resp.json()
-                        if thumb_data.get("data"):
-                            group_data["iconUrl"] = thumb_data["data"][0].get("imageUrl")
-                    else:
-                        group_data["iconUrl"] = None
-                
-                return group_data
+            session = get_session()
+            # Get group info
+            async with session.get(f"https://groups.roblox.com/v1/groups/{group_id}", timeout=get_timeout('roblox')) as resp:
+                if resp.status != 200:
+                    return None
+                group_data = await resp.json()
+            
+            # Get group icon
+            async with session.get(f"https://thumbnails.roblox.com/v1/groups/icons?groupIds={group_id}&size=420x420&format=Png", timeout=get_timeout('roblox')) as resp:
+                if resp.status == 200:
+                    thumb_data = await resp.json()
+                    if thumb_data.get("data"):
+                        group_data["iconUrl"] = thumb_data["data"][0].get("imageUrl")
+                else:
+                    group_data["iconUrl"] = None
+            
+            return group_data
         except Exception as e:
             print(f"❌ Failed to fetch Roblox group: {e}")
             return None
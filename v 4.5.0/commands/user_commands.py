@@ -5,6 +5,7 @@ COMPLETE with profile tracking, settings, wiki search, suggestions
 ═══════════════════════════════════════════════════════════════
 """
 
+import asyncio
 import discord
 from discord import app_commands, ui
 from datetime import datetime
@@ -20,7 +21,7 @@ from utils import (
     get_moderation_status,
     get_badword_count
 )
-from utils.wiki_fetcher import search_wikis, get_wiki_stats
+from utils.wiki_featcher import search_wikis, get_wiki_stats
 
 # ═══════════════════════════════════════════════════════════════
 # PROFILE EDIT MODAL
@@ -418,7 +419,8 @@ def setup(bot):
         """Search wikis"""
         await interaction.response.defer()
         
-        results = search_wikis(query, limit=5)
+        # A cold index loads (or rebuilds) from every corpus - not on the event loop
+        results = await asyncio.to_thread(search_wikis, query, 5)
         
         if not results:
             await interaction.followup.send(
@@ -456,12 +458,24 @@ def setup(bot):
         )
         
         for wiki_name, wiki_stats in stats['wikis'].items():
-            embed.add_field(
-                name=f"📖 {wiki_name}",
-                value=f"Pages: **{wiki_stats['pages']}**\n"
-                      f"Last Update: {wiki_stats['last_update'][:10] if wiki_stats['last_update'] != 'Never' else 'Never'}",
-                inline=True
-            )
+            last_crawl = wiki_stats['last_crawl']
+            value = (f"Pages: **{wiki_stats['pages']}** ({wiki_stats['bytes'] / 1024 / 1024:.1f} MB)\n"
+                     f"Last Update: {wiki_stats['last_update'][:10] if wiki_stats['last_update'] != 'Never' else 'Never'}\n"
+                     f"Full Sync: {(wiki_stats['last_full_sync'] or 'Never')[:10]} · "
+                     f"Delta Sync: {(wiki_stats['last_delta_sync'] or 'Never')[:10]}\n")
+            if last_crawl.get('seconds') is not None:
+                value += f"Last Crawl: {last_crawl['mode']}, {last_crawl['seconds']:.0f}s"
+                if wiki_stats['average_crawl_seconds'] is not None:
+                    value += f" (avg {wiki_stats['average_crawl_seconds']:.0f}s)"
+                value += "\n"
+            value += wiki_stats['health']
+            
+            embed.add_field(name=f"📖 {wiki_name}", value=value, inline=True)
+        
+        index = stats['index']
+        if index:
+            embed.set_footer(text=f"Search index: {index['pages']} pages · {index['segments']} segments · "
+                                  f"{index['bytes'] / 1024 / 1024:.1f} MB")
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
@@ -598,6 +612,71 @@ def setup(bot):
                 inline=False
             )
         
+        # Remote provider latency
+        try:
+            from utils.moderation import get_enabled_providers, get_provider_latency_stats, get_batcher_stats
+            from utils.metrics import format_latency
+            latency = get_provider_latency_stats()
+            batching = get_batcher_stats()
+            lines = [
+                f"**{name}:** {format_latency(latency[name])} · {latency[name]['timeouts']} timeouts\n"
+                f"↳ avg batch {batching[name]['avg_batch']:.1f} · {batching[name]['queued']} queued · "
+                f"{batching[name]['rate_limited']} rate limited"
+                for name in get_enabled_providers()
+            ]
+            if lines:
+                embed.add_field(
+                    name="⏱️ Provider Latency",
+                    value="\n".join(lines),
+                    inline=False
+                )
+        except Exception as e:
+            print(f"⚠️ Latency stats error: {e}")
+        
+        # Verdict cache
+        try:
+            from utils.moderation import get_verdict_cache_stats
+            cache = get_verdict_cache_stats()
+            embed.add_field(
+                name="🗃️ Verdict Cache",
+                value=f"{cache['hits']} hits · {cache['misses']} misses ({cache['hit_rate']:.0%})\n"
+                      f"{cache['size']}/{cache['max_size']} entries",
+                inline=True
+            )
+        except Exception as e:
+            print(f"⚠️ Verdict cache stats error: {e}")
+        
+        # Moderation queue
+        try:
+            from utils.mod_pipeline import get_pipeline_stats
+            from utils.metrics import format_latency
+            pipeline = get_pipeline_stats()
+            if pipeline:
+                embed.add_field(
+                    name="🏭 Moderation Queue",
+                    value=f"{pipeline['workers']} workers · {pipeline['depth']}/{pipeline['capacity']} queued "
+                          f"(peak {pipeline['high_water']})\n"
+                          f"{pipeline['processed']} checked · {pipeline['flagged']} removed · {pipeline['shed']} shed\n"
+                          f"Queue wait: {format_latency(pipeline['queue_wait'])}",
+                    inline=False
+                )
+        except Exception as e:
+            print(f"⚠️ Pipeline stats error: {e}")
+        
+        # Modlog writer
+        try:
+            from utils.modlog_sink import get_modlog_stats
+            modlog = get_modlog_stats()
+            if modlog:
+                embed.add_field(
+                    name="📮 Modlog",
+                    value=f"{modlog['events']} events in {modlog['messages_sent']} messages · "
+                          f"{modlog['buffered']} buffered · {modlog['spilled']} spilled to disk",
+                    inline=False
+                )
+        except Exception as e:
+            print(f"⚠️ Modlog stats error: {e}")
+        
         await interaction.response.send_message(embed=embed, ephemeral=True)
     
     @bot.tree.command(name="help", description="View all available commands")
@@ -73,6 +73,40 @@ CHAT_FILTER_ENABLED = True
 AI_MODERATION_ENABLED = True
 UPDATE_INTERVAL = 300
 
+# ═══════════════════════════════════════════════════════════════
+# MODERATION
+# ═══════════════════════════════════════════════════════════════
+
+MODERATION_LATENCY_BUDGET = 5.0     # Max seconds to wait for remote providers
+MODERATION_TIMEOUT_POLICY = 'open'  # 'open' = allow message, 'closed' = remove it
+
+# Verdict cache - repeated messages ("lol", "gg", spam waves) skip the APIs
+VERDICT_CACHE_SIZE = 10000       # Max cached verdicts (LRU eviction)
+VERDICT_CACHE_TTL = 3600         # Seconds before a verdict is re-checked
+VERDICT_CACHE_PERSIST = True     # Save on /shutdown, reload on startup
+
+# Remote provider queue - batches messages during raids
+MODERATION_BATCH_WINDOW = 0.02   # Seconds to collect messages before sending
+MODERATION_BATCH_SIZE = 32       # Max messages per batched request (OpenAI)
+MODERATION_MAX_CONCURRENCY = 4   # Max in-flight requests per provider
+
+# Token bucket per provider: (requests per second, burst)
+MODERATION_RATE_LIMITS = {
+    'perspective': (1.0, 5),
+    'openai': (5.0, 10)
+}
+
+# Worker pool - on_message only enqueues, workers classify/delete/warn/log
+MODERATION_WORKERS = 4           # Concurrent moderation workers
+MODERATION_QUEUE_SIZE = 1000     # Max queued messages before shedding load
+MODERATION_WARNING_SECONDS = 10  # Warning message auto-deletes after this
+MODERATION_DRAIN_TIMEOUT = 10    # Seconds /shutdown waits for the queue to empty
+
+# Modlog writer - events are buffered and packed (10 embeds per message)
+MODLOG_FLUSH_INTERVAL = 2.0      # Seconds between flushes
+MODLOG_MAX_BUFFER = 500          # Events kept in memory before spilling to disk
+MODLOG_RATE_LIMIT = (1.0, 5)     # Modlog messages per second, burst
+
 # ═══════════════════════════════════════════════════════════════
 # LANGUAGES
 # ═══════════════════════════════════════════════════════════════
@@ -106,6 +140,121 @@ SUPPORTED_TIMEZONES = {
     'Pacific/Auckland': 'NZDT/NZST (New Zealand)'
 }
 
+# ═══════════════════════════════════════════════════════════════
+# HTTP CLIENT (shared connection pool for every outbound API call)
+# ═══════════════════════════════════════════════════════════════
+
+HTTP_POOL_LIMIT = 100          # Max open connections in total
+HTTP_POOL_LIMIT_PER_HOST = 20  # Max open connections per host
+HTTP_KEEPALIVE_SECONDS = 30    # Keep idle connections this long
+HTTP_DNS_CACHE_SECONDS = 300   # Cache DNS lookups this long
+
+# Total timeout (seconds) per service
+HTTP_TIMEOUTS = {
+    'perspective': 8,
+    'openai': 8,
+    'llm': 15,
+    'llm_stream': 60,
+    'roblox': 10,
+    'wiki': 30,
+    'default': 15
+}
+
+# ═══════════════════════════════════════════════════════════════
+# STATE STORE (user settings / profiles kept in memory)
+# ═══════════════════════════════════════════════════════════════
+
+STATE_FLUSH_DELAY = 2.0  # Seconds to collect changes before writing the file
+
+# Where the state lives: 'json' (one file per dataset, fine for small
+# servers) or 'sqlite' (WAL mode, indexed; JSON files are migrated once)
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'json')
+
+# ═══════════════════════════════════════════════════════════════
+# WIKI SEARCH
+# ═══════════════════════════════════════════════════════════════
+
+WIKI_INDEX_COMPACTION_HOURS = 6  # Merge index segments / purge replaced pages this often
+
+# Crawler - each wiki host gets its own budget, wikis crawl in parallel
+CRAWL_START_CONCURRENCY = 2    # Requests in flight per host to begin with
+CRAWL_MAX_CONCURRENCY = 6      # Never more than this, however fast the wiki answers
+CRAWL_RATE_LIMIT = (4.0, 4)    # Per host: (requests per second, burst)
+CRAWL_JITTER = 0.1             # Random extra wait (seconds) before each request
+CRAWL_MAXLAG = 5               # Ask MediaWiki to refuse us when replicas lag > this
+CRAWL_MAX_RETRIES = 5          # Tries per request/batch before giving up
+CRAWL_BACKOFF_BASE = 1.0       # Seconds; doubles on every retry (with jitter)
+CRAWL_MAX_BACKOFF = 120        # Cap on any back-off, Retry-After included
+CRAWL_PROGRESS_INTERVAL = 10   # Seconds between progress_callback updates
+WIKI_MERGE_BATCH = 500         # Journaled pages merged into the wiki store at a time
+
+# AI chat context - wiki chunks retrieved by vector similarity (needs numpy)
+WIKI_CONTEXT_CHUNKS = 3        # Chunks added to the AI's system prompt
+WIKI_CONTEXT_MIN_SCORE = 0.15  # Cosine similarity below this isn't worth the tokens
+
+# ═══════════════════════════════════════════════════════════════
+# AI CHAT
+# ═══════════════════════════════════════════════════════════════
+
+# Token budget per AI request (estimated locally) - the prompt is cut to fit
+AI_PROMPT_TOKEN_BUDGET = 4000   # System prompt + facts + wiki + history + message
+AI_FACTS_TOKEN_BUDGET = 800     # Learned facts beyond this are left out of the prompt
+AI_MIN_PASSAGE_TOKENS = 60      # A wiki passage trimmed below this is dropped instead
+
+# Conversation memory - per-channel history, least recently used channels evicted first
+CONVERSATION_HISTORY = 10            # Messages kept per channel (5 exchanges)
+CONVERSATION_ENTRY_CHARS = 2000      # A longer message is cut to this when remembered
+CONVERSATION_MAX_CHANNELS = 1000     # Channels/threads remembered at once
+CONVERSATION_MAX_BYTES = 8 * 1024 * 1024  # Memory cap for all conversations together
+CONVERSATION_IDLE_HOURS = 48         # Forget a channel after this long without AI chat
+CONVERSATION_SNAPSHOT_MINUTES = 5    # Save conversations to disk this often (if changed)
+
+# Streaming replies - the answer is posted as it's generated, then edited
+AI_STREAMING_ENABLED = True
+AI_STREAM_EDIT_INTERVAL = 1.2   # Min seconds between edits of a reply (Discord allows ~5 per 5 s)
+AI_STREAM_MESSAGE_CHARS = 1900  # Text beyond this rolls into a follow-up message
+AI_STREAM_IDLE_TIMEOUT = 10     # Give up if a provider sends nothing for this long
+
+# Response cache - repeated questions (same wiki context) skip the API call
+AI_CACHE_SIZE = 500             # Answers kept (LRU eviction)
+AI_CACHE_TTL = 6 * 3600         # Seconds an answer is reused
+AI_CACHE_SIMILARITY = 0.9       # Rephrased question counts as the same above this cosine (1 = exact only)
+
+# Request scheduler - every AI call queues here (fair by channel, then user)
+AI_MAX_CONCURRENCY = 4          # AI calls in flight at once
+AI_RATE_LIMIT_RPM = 30          # Provider quota: requests per minute...
+AI_RATE_LIMIT_TPM = 12000       # ...and tokens per minute (prompt + max reply)
+AI_REQUEST_BURST = 5            # Requests that may go out back to back
+AI_QUEUE_SIZE = 50              # Waiting requests before new ones get a "busy" reply
+AI_QUEUE_PER_USER = 2           # Waiting requests per user
+AI_QUEUE_DEADLINE = 20          # Seconds a request may wait for its turn
+AI_MAX_REPLY_TOKENS = 500       # max_tokens of every completion
+
+# LLM providers, in order of preference (ones without an API key are left out).
+# 'api' is the request format: 'openai' (chat completions) or 'anthropic' (messages)
+AI_PROVIDERS = [
+    {'name': 'groq', 'api': 'openai', 'model': 'llama-3.3-70b-versatile', 'key': GROQ_API_KEY,
+     'url': 'https://api.groq.com/openai/v1/chat/completions'},
+    {'name': 'grok', 'api': 'openai', 'model': 'grok-3-mini', 'key': GROK_API_KEY,
+     'url': 'https://api.x.ai/v1/chat/completions'},
+    {'name': 'openai', 'api': 'openai', 'model': 'gpt-4o-mini', 'key': OPENAI_API_KEY,
+     'url': 'https://api.openai.com/v1/chat/completions'},
+    {'name': 'anthropic', 'api': 'anthropic', 'model': 'claude-3-5-haiku-latest', 'key': ANTHROPIC_API_KEY,
+     'url': 'https://api.anthropic.com/v1/messages'}
+]
+
+# Provider routing - the healthiest provider answers, a slow one gets a backup racing it
+AI_HEALTH_WINDOW = 50           # Recent calls per provider its latency and error rate come from...
+AI_HEALTH_SECONDS = 300         # ...if no older than this (a sidelined provider's errors fade out)
+AI_EXPECTED_LATENCY = 1.5       # Seconds assumed for a provider that hasn't answered yet
+AI_HEDGE_MIN_SAMPLES = 10       # Calls before a provider's own p95 sets its hedge delay...
+AI_HEDGE_DEFAULT_DELAY = 4.0    # ...until then, start a backup provider after this long
+AI_HEDGE_MIN_DELAY = 1.0        # Never start a backup sooner than this
+AI_BREAKER_ERROR_RATE = 0.5     # Stop using a provider above this error rate...
+AI_BREAKER_MIN_CALLS = 4        # ...over at least this many recent calls
+AI_BREAKER_FAILURES = 3         # ...or after this many failures in a row
+AI_BREAKER_COOLDOWN = 30        # Seconds before a stopped provider gets one trial call
+
 # ═══════════════════════════════════════════════════════════════
 # FILE PATHS
 # ═══════════════════════════════════════════════════════════════
@@ -114,7 +263,16 @@ DATA_DIR = "data"
 CUSTOM_KNOWLEDGE_FILE = f"{DATA_DIR}/custom_knowledge.json"
 GUILD_FAQS_FILE = f"{DATA_DIR}/guild_faqs.json"
 USER_SETTINGS_FILE = f"{DATA_DIR}/user_settings.json"
+PROFILES_FILE = f"{DATA_DIR}/profiles.json"
+LEGACY_PROFILES_FILE = f"{DATA_DIR}/user_profiles.json"
+FAQS_FILE = f"{DATA_DIR}/faqs.json"
+LEARNED_FACTS_FILE = f"{DATA_DIR}/learned_facts.json"
+BADWORDS_JSON_FILE = f"{DATA_DIR}/badwords.json"
+SQLITE_DB_FILE = f"{DATA_DIR}/csr_bot.db"
 BADWORDS_FILE = "badwords.txt"
+VERDICT_CACHE_FILE = f"{DATA_DIR}/verdict_cache.json"
+MODLOG_OVERFLOW_FILE = f"{DATA_DIR}/modlog_overflow.jsonl"
+CONVERSATIONS_FILE = f"{DATA_DIR}/conversations.json"
 
 os.makedirs(DATA_DIR, exist_ok=True)
 
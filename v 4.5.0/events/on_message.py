@@ -4,15 +4,13 @@
 ═══════════════════════════════════════════════════════════════
 """
 
-import discord
-import asyncio
 import re
-from datetime import datetime
-from config import CHAT_FILTER_ENABLED, AI_MODERATION_ENABLED, MODLOG_CHANNEL_ID
+import time
+from config import CHAT_FILTER_ENABLED, AI_MODERATION_ENABLED, AI_STREAMING_ENABLED
 
 # Import moderation
 try:
-    from utils import check_message_toxicity
+    from utils.mod_pipeline import get_pipeline
     MODERATION_AVAILABLE = True
 except:
     MODERATION_AVAILABLE = False
@@ -21,6 +19,7 @@ except:
 # Import AI chat system
 try:
     from utils.ai_chat import chat_with_groq, get_ai_status
+    from utils.stream_reply import StreamingReply
     AI_AVAILABLE = True
     print("✅ AI chat system loaded!")
     print(get_ai_status())
@@ -59,6 +58,7 @@ def setup(bot):
             is_reply_to_bot = message.reference.resolved.author == bot.user
         
         if bot_mentioned or starts_with_csr or is_reply_to_bot:
+            started = time.monotonic()
             if not AI_AVAILABLE:
                 await message.reply(
                     "⚠️ **AI chat is not configured!**\n\n"
@@ -100,10 +100,14 @@ def setup(bot):
                     # Get AI response
                     print(f"💬 AI Chat from {message.author.name}: {clean_msg[:50]}...")
                     
+                    # Words show up as they're generated, edited in place
+                    reply = StreamingReply(message, started)
                     ai_response, sources = await chat_with_groq(
                         clean_msg,
                         message.channel.id,
-                        message.author.name
+                        message.author.name,
+                        user_id=message.author.id,
+                        on_text=reply.update if AI_STREAMING_ENABLED else None
                     )
                     
                     # Build response
@@ -115,16 +119,8 @@ def setup(bot):
                         for game, title, url in sources[:2]:  # Max 2 sources
                             response += f"• [{game}: {title}]({url})\n"
                     
-                    # Split if too long (Discord limit is 2000 chars)
-                    if len(response) > 2000:
-                        chunks = [response[i:i+1900] for i in range(0, len(response), 1900)]
-                        for i, chunk in enumerate(chunks):
-                            if i == 0:
-                                await message.reply(chunk, mention_author=False)
-                            else:
-                                await message.channel.send(chunk)
-                    else:
-                        await message.reply(response, mention_author=False)
+                    # Final text - overflow past 1900 chars goes into follow-up messages
+                    await reply.finish(response)
                     
                     print(f"✅ AI Response sent to {message.author.name}")
                 
@@ -146,55 +142,8 @@ def setup(bot):
         
         if MODERATION_AVAILABLE and (CHAT_FILTER_ENABLED or AI_MODERATION_ENABLED):
             try:
-                is_toxic, category, confidence = await check_message_toxicity(message.content)
-                
-                if is_toxic:
-                    # Delete message
-                    try:
-                        await message.delete()
-                    except:
-                        pass
-                    
-                    # Send warning to channel
-                    try:
-                        warning = await message.channel.send(
-                            f"⚠️ {message.author.mention} Your message was removed.\n"
-                            f"**Reason:** {category}"
-                        )
-                        # Auto-delete warning after 10 seconds
-                        await asyncio.sleep(10)
-                        await warning.delete()
-                    except:
-                        pass
-                    
-                    # Log to modlog
-                    try:
-                        modlog = bot.get_channel(MODLOG_CHANNEL_ID)
-                        if modlog:
-                            embed = discord.Embed(
-                                title="⚠️ Message Deleted",
-                                description=f"**User:** {message.author.mention}\n**Channel:** {message.channel.mention}",
-                                color=discord.Color.red(),
-                                timestamp=datetime.utcnow()
-                            )
-                            embed.add_field(
-                                name="Content",
-                                value=f"```{message.content[:500]}```",
-                                inline=False
-                            )
-                            embed.add_field(
-                                name="Detection",
-                                value=f"{category} ({confidence:.0%})",
-                                inline=False
-                            )
-                            embed.set_footer(text=f"User ID: {message.author.id}")
-                            
-                            await modlog.send(embed=embed)
-                    except Exception as e:
-                        print(f"⚠️ Modlog error: {e}")
-                    
-                    return  # Don't process commands if message is toxic
-            
+                # Workers classify → delete → warn → modlog in the background
+                await get_pipeline(bot).submit(message)
             except Exception as e:
                 print(f"❌ Moderation error: {e}")
         
@@ -9,9 +9,14 @@ from discord.ext import tasks
 from datetime import datetime, timedelta
 import asyncio
 from config import *
-from utils import get_moderation_status, get_badword_count, load_json
-
-PROFILES_FILE = "data/user_profiles.json"
+from utils import get_moderation_status, get_badword_count
+from utils.conversation_store import save_conversations
+from utils.http_client import start_http_client
+from utils.mod_pipeline import get_pipeline
+from utils.state_store import load_all_stores
+from utils.storage import find_birthdays
+from utils.wiki_featcher import refresh_index_stats
+from utils.wiki_index import compact_wiki_index
 
 def setup(bot):
     """Setup on_ready event"""
@@ -40,6 +45,15 @@ def setup(bot):
         
         print("═" * 60)
         
+        # Shared HTTP connection pool
+        await start_http_client()
+        
+        # Settings/profiles/FAQs into memory, read on the storage thread
+        await load_all_stores()
+        
+        # Moderation workers
+        get_pipeline(bot).start()
+        
         # Sync commands
         try:
             synced = await bot.tree.sync()
@@ -56,6 +70,10 @@ def setup(bot):
             update_member_count.start()
         if not check_birthdays.is_running():
             check_birthdays.start()
+        if not compact_wiki_search.is_running():
+            compact_wiki_search.start()
+        if not snapshot_conversations.is_running():
+            snapshot_conversations.start()
     
     @tasks.loop(seconds=UPDATE_INTERVAL)
     async def update_member_count():
@@ -104,7 +122,7 @@ def setup(bot):
         try:
             today = datetime.utcnow().strftime('%m-%d')
             
-            profiles = load_json(PROFILES_FILE, {})
+            profiles = await find_birthdays(today)
             birthday_channel = bot.get_channel(DAILYCHECKS_CHANNEL_ID)
             
             if not birthday_channel:
@@ -138,6 +156,23 @@ def setup(bot):
         except Exception as e:
             print(f"❌ Birthday check error: {e}")
     
+    @tasks.loop(hours=WIKI_INDEX_COMPACTION_HOURS)
+    async def compact_wiki_search():
+        """Merge wiki index segments left behind by incremental fetches"""
+        try:
+            if await asyncio.to_thread(compact_wiki_index):
+                await refresh_index_stats()
+        except Exception as e:
+            print(f"⚠️ Wiki index compaction error: {e}")
+    
+    @tasks.loop(minutes=CONVERSATION_SNAPSHOT_MINUTES)
+    async def snapshot_conversations():
+        """Save AI chat memory so it survives a restart (only if it changed)"""
+        try:
+            await asyncio.to_thread(save_conversations)
+        except Exception as e:
+            print(f"⚠️ Conversation snapshot error: {e}")
+    
     @update_member_count.before_loop
     async def before_update_member_count():
         await bot.wait_until_ready()
@@ -149,3 +184,9 @@ def setup(bot):
         now = datetime.utcnow()
         tomorrow = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
         await asyncio.sleep((tomorrow - now).total_seconds())
+    
+    @compact_wiki_search.before_loop
+    async def before_compact_wiki_search():
+        await bot.wait_until_ready()
+        # Nothing to compact right after startup
+        await asyncio.sleep(WIKI_INDEX_COMPACTION_HOURS * 3600)
@@ -3,6 +3,7 @@
 🛠️ Utils Package - Helper Functions & Utilities
 ═══════════════════════════════════════════════════════════════
 """
+import copy
 import json
 import os
 from typing import Optional, Dict, Any
@@ -13,8 +14,24 @@ print("🛠️ Loading utils package...")
 # JSON FILE OPERATIONS
 # ═══════════════════════════════════════════════════════════════
 
+# State store is imported on first use so `import utils.x` doesn't need config
+def _store(filepath: str):
+    from .state_store import get_store
+    return get_store(filepath)
+
+def _managed_store(filepath: str):
+    from .state_store import find_store
+    return find_store(filepath)
+
 def load_json(filepath: str, default=None) -> Any:
-    """Load JSON file, return default if not found"""
+    """
+    Load JSON file, return default if not found.
+    Managed files come back as a read-only view - change them through
+    their store (set/update/delete), not by editing and save_json
+    """
+    store = _managed_store(filepath)
+    if store is not None:
+        return store.snapshot()
     try:
         if os.path.exists(filepath):
             with open(filepath, 'r', encoding='utf-8') as f:
@@ -25,6 +42,10 @@ def load_json(filepath: str, default=None) -> Any:
 
 def save_json(filepath: str, data: Any) -> bool:
     """Save data to JSON file"""
+    store = _managed_store(filepath)
+    if store is not None:
+        store.replace(data)
+        return True
     try:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, 'w', encoding='utf-8') as f:
@@ -63,29 +84,21 @@ SETTINGS_FILE = "data/user_settings.json"
 
 def get_user_language(user_id: int) -> str:
     """Get user's language preference"""
-    settings = load_json(SETTINGS_FILE, {})
-    return settings.get(str(user_id), {}).get('language', 'en')
+    return _store(SETTINGS_FILE).get(str(user_id), {}).get('language', 'en')
 
 def set_user_language(user_id: int, language: str) -> bool:
     """Set user's language preference"""
-    settings = load_json(SETTINGS_FILE, {})
-    if str(user_id) not in settings:
-        settings[str(user_id)] = {}
-    settings[str(user_id)]['language'] = language
-    return save_json(SETTINGS_FILE, settings)
+    _store(SETTINGS_FILE).update(str(user_id), {'language': language})
+    return True
 
 def get_user_timezone(user_id: int) -> str:
     """Get user's timezone"""
-    settings = load_json(SETTINGS_FILE, {})
-    return settings.get(str(user_id), {}).get('timezone', 'UTC')
+    return _store(SETTINGS_FILE).get(str(user_id), {}).get('timezone', 'UTC')
 
 def set_user_timezone(user_id: int, timezone: str) -> bool:
     """Set user's timezone"""
-    settings = load_json(SETTINGS_FILE, {})
-    if str(user_id) not in settings:
-        settings[str(user_id)] = {}
-    settings[str(user_id)]['timezone'] = timezone
-    return save_json(SETTINGS_FILE, settings)
+    _store(SETTINGS_FILE).update(str(user_id), {'timezone': timezone})
+    return True
 
 # ═══════════════════════════════════════════════════════════════
 # PROFILE SYSTEM
@@ -93,54 +106,48 @@ def set_user_timezone(user_id: int, timezone: str) -> bool:
 
 PROFILES_FILE = "data/profiles.json"
 
+DEFAULT_PROFILE = {
+    "bio": None,
+    "birthday": None,
+    "favorite_color": None,
+    "roblox_username": None,
+    "roblox_id": None,
+    "discord_usernames": [],
+    "roblox_usernames": [],
+    "tracking_message_id": None,
+    "last_updated": None
+}
+
 def get_user_profile(user_id: int) -> dict:
     """Get user profile data"""
-    profiles = load_json(PROFILES_FILE, {})
-    return profiles.get(str(user_id), {
-        "bio": None,
-        "birthday": None,
-        "favorite_color": None,
-        "roblox_username": None,
-        "roblox_id": None,
-        "discord_usernames": [],
-        "roblox_usernames": [],
-        "tracking_message_id": None,
-        "last_updated": None
-    })
+    profile = _store(PROFILES_FILE).get(str(user_id))
+    return profile if profile is not None else copy.deepcopy(DEFAULT_PROFILE)
 
 def update_user_profile(user_id: int, data: dict) -> bool:
     """Update user profile"""
-    profiles = load_json(PROFILES_FILE, {})
-    user_id_str = str(user_id)
-    
-    if user_id_str not in profiles:
-        profiles[user_id_str] = get_user_profile(user_id)
-    
-    profiles[user_id_str].update(data)
-    return save_json(PROFILES_FILE, profiles)
+    _store(PROFILES_FILE).update(str(user_id), data, default=DEFAULT_PROFILE)
+    return True
 
 # ═══════════════════════════════════════════════════════════════
 # BADWORDS MANAGEMENT
 # ═══════════════════════════════════════════════════════════════
 
-BADWORDS_FILE = "data/badwords.txt"
+# One list for everything: the moderation module's badwords.txt. Changing it
+# through these rebuilds the matcher and clears the cached verdicts.
 
 def load_badwords() -> set:
-    """Load badwords from file"""
-    try:
-        if os.path.exists(BADWORDS_FILE):
-            with open(BADWORDS_FILE, 'r', encoding='utf-8') as f:
-                return set(line.strip().lower() for line in f if line.strip())
-    except Exception as e:
-        print(f"⚠️ Failed to load badwords: {e}")
-    return set()
+    """Current badwords"""
+    from . import moderation
+    return set(moderation.BADWORDS)
 
 def save_badwords(words: set) -> bool:
-    """Save badwords to file"""
+    """Replace the whole badwords list"""
+    from . import moderation
     try:
-        os.makedirs(os.path.dirname(BADWORDS_FILE), exist_ok=True)
-        with open(BADWORDS_FILE, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(sorted(words)))
+        with open(moderation.BADWORDS_FILE, 'w', encoding='utf-8') as f:
+            f.write("# CSR Bot Badwords\n# Add one word per line\n")
+            f.write('\n'.join(sorted(word.lower() for word in words)))
+        moderation.reload_badwords()
         return True
     except Exception as e:
         print(f"⚠️ Failed to save badwords: {e}")
@@ -148,19 +155,18 @@ def save_badwords(words: set) -> bool:
 
 def add_badword(word: str) -> bool:
     """Add word to badwords list"""
-    words = load_badwords()
-    words.add(word.lower())
-    return save_badwords(words)
+    from . import moderation
+    return moderation.add_badword(word)
 
 def remove_badword(word: str) -> bool:
     """Remove word from badwords list"""
-    words = load_badwords()
-    words.discard(word.lower())
-    return save_badwords(words)
+    from . import moderation
+    return moderation.remove_badword(word)
 
 def get_badword_count() -> int:
     """Get count of badwords"""
-    return len(load_badwords())
+    from . import moderation
+    return moderation.get_badword_count()
 
 # ═══════════════════════════════════════════════════════════════
 # MODERATION SYSTEM
@@ -172,21 +178,20 @@ async def check_message_toxicity(content: str) -> tuple:
     Returns: (is_toxic: bool, category: str, confidence: float)
     """
     from config import CHAT_FILTER_ENABLED, AI_MODERATION_ENABLED
-    import re
+    from .moderation import check_badwords
     
-    # Check badwords first
+    # Check badwords first (one pass of the compiled matcher, no file reads)
     if CHAT_FILTER_ENABLED:
-        badwords = load_badwords()
-        content_lower = content.lower()
-        
-        for word in badwords:
-            # Use word boundaries to avoid false positives
-            if re.search(r'\b' + re.escape(word) + r'\b', content_lower):
-                return (True, "Inappropriate Language", 1.0)
+        if check_badwords(content)[0]:
+            return (True, "Inappropriate Language", 1.0)
     
-    # TODO: Add AI moderation API calls here if enabled
+    # AI moderation - cached verdicts, then Perspective + OpenAI in parallel
+    # (badwords already checked above - or switched off with the chat filter)
     if AI_MODERATION_ENABLED:
-        pass  # Implement Perspective API / OpenAI Moderation
+        from .moderation import check_message_toxicity as check_ai_layers
+        is_toxic, category, confidence = await check_ai_layers(content, badwords=False)
+        if is_toxic:
+            return (True, category, confidence)
     
     return (False, None, 0.0)
 
@@ -207,34 +212,36 @@ def get_moderation_status() -> str:
 # WIKI SYSTEM
 # ═══════════════════════════════════════════════════════════════
 
-WIKI_DATA_FILE = "data/wiki_data.json"
-
 def search_wiki(query: str) -> list:
-    """Search wiki data"""
-    wiki_data = load_json(WIKI_DATA_FILE, {})
+    """Search wiki data (titles only - page bodies are read for the hits)"""
+    from .wiki_corpus import get_corpus, list_corpora
     results = []
     query_lower = query.lower()
     
-    for wiki_name, pages in wiki_data.items():
-        for page_title, page_data in pages.items():
+    for wiki_name in list_corpora():
+        corpus = get_corpus(wiki_name)
+        for page_title in corpus.titles():
             if query_lower in page_title.lower():
+                page_data = corpus.get(page_title) or {}
                 results.append({
                     "wiki": wiki_name,
                     "title": page_title,
                     "url": page_data.get("url"),
                     "content": page_data.get("content", "")[:200]
                 })
+                if len(results) == 5:
+                    return results
     
-    return results[:5]  # Return top 5 results
+    return results  # Return top 5 results
 
 def fetch_wiki_page(page_name: str, wiki: str = "sbor") -> Optional[str]:
     """Fetch specific wiki page"""
-    wiki_data = load_json(WIKI_DATA_FILE, {})
+    from .wiki_corpus import get_corpus, list_corpora
+    if wiki not in list_corpora():
+        return None
     
-    if wiki in wiki_data and page_name in wiki_data[wiki]:
-        return wiki_data[wiki][page_name].get("content")
-    
-    return None
+    page_data = get_corpus(wiki).get(page_name)
+    return page_data.get("content") if page_data else None
 
 # ═══════════════════════════════════════════════════════════════
 # FAQ SYSTEM
@@ -248,27 +255,24 @@ def get_all_faqs() -> dict:
 
 def add_faq(question: str, answer: str, keywords: str) -> str:
     """Add new FAQ, return FAQ ID"""
-    faqs = load_json(FAQ_FILE, {})
+    faqs = _store(FAQ_FILE)
     
     # Generate ID
-    faq_id = f"faq_{len(faqs) + 1}"
+    faq_id = f"faq_{len(faqs.snapshot()) + 1}"
     
-    faqs[faq_id] = {
+    faqs.set(faq_id, {
         "question": question,
         "answer": answer,
         "keywords": [k.strip().lower() for k in keywords.split(',')]
-    }
-    
-    save_json(FAQ_FILE, faqs)
+    })
     return faq_id
 
 def remove_faq(faq_id: str) -> bool:
     """Remove FAQ"""
-    faqs = load_json(FAQ_FILE, {})
+    faqs = _store(FAQ_FILE)
     
-    if faq_id in faqs:
-        del faqs[faq_id]
-        save_json(FAQ_FILE, faqs)
+    if faq_id in faqs.snapshot():
+        faqs.delete(faq_id)
         return True
     
     return False
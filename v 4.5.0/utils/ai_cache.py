@@ -0,0 +1,169 @@
+"""
+═══════════════════════════════════════════════════════════════
+🗃️ AI Response Cache - Answers to questions asked before
+Keyed on the normalized question plus a fingerprint of the wiki
+passages it retrieved; a rephrased question with the same passages
+can match too, by the same hashed term vectors the retrieval uses.
+Cleared whenever the wiki corpus or the learned facts change.
+═══════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import math
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+from config import AI_CACHE_SIZE, AI_CACHE_TTL, AI_CACHE_SIMILARITY
+from .metrics import LatencyTracker
+from .ttl_cache import TTLCache
+from .wiki_index import tokenize
+from .wiki_vectors import term_hash
+
+PUNCTUATION_RE = re.compile(r"[^\w\s]+")
+
+# Words that don't change what's being asked ("how do i get x" = "how can i get x").
+# Question words and verbs stay: "what does x do" and "how do i get x" must not match.
+FILLER_WORDS = frozenset("""
+a an the i me my you your we us it is are am be do does did can could would will should
+to of in on for this that please pls plz hey yo and or so just
+""".split())
+
+# ═══════════════════════════════════════════════════════════════
+# KEYS
+# ═══════════════════════════════════════════════════════════════
+
+def question_terms(text: str) -> List[str]:
+    return [term for term in tokenize(PUNCTUATION_RE.sub(' ', text)) if term not in FILLER_WORDS]
+
+def normalize_question(text: str) -> str:
+    """'How do I get Leopard??' and 'how can i get leopard' are the same question"""
+    return ' '.join(question_terms(text))
+
+def context_fingerprint(passages: List[dict]) -> str:
+    """Which wiki text the answer was built from (any edit to it changes the fingerprint)"""
+    digest = hashlib.sha1()
+    for info in passages:
+        digest.update(f"{info['game']}\0{info['title']}\0{info['content']}\0".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def question_vector(text: str) -> Dict[int, float]:
+    """
+    Unit vector of the question's terms, hashed like the wiki chunks.
+    No IDF on purpose: item names are rare and would outweigh the words
+    that say what's being asked about them ("get", "stats", "drops").
+    """
+    counts = Counter(term_hash(term) for term in question_terms(text))
+    norm = math.sqrt(sum(count * count for count in counts.values()))
+    return {column: count / norm for column, count in counts.items()} if norm else {}
+
+def similarity(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(column, 0.0) for column, weight in a.items())
+
+# ═══════════════════════════════════════════════════════════════
+# CACHE
+# ═══════════════════════════════════════════════════════════════
+
+class ResponseCache:
+    """
+    TTLCache of "fingerprint|normalized question" → (vector, answer, sources).
+    An exact key hit is one dict lookup; otherwise the entries with the same
+    fingerprint are compared by cosine similarity (a few hundred at most).
+    """
+
+    def __init__(self, max_size: int = AI_CACHE_SIZE, ttl: float = AI_CACHE_TTL,
+                 min_similarity: float = AI_CACHE_SIMILARITY):
+        self.entries = TTLCache(max_size, ttl)
+        self.min_similarity = min_similarity
+        self.near_hits = 0
+        self.invalidations = 0
+        self.api_latency = LatencyTracker()   # What a miss costs
+        self.saved_seconds = 0.0
+
+    def lookup(self, question: str, passages: List[dict]) -> Optional[tuple]:
+        """(answer, sources) of a cached answer to this question with this context, or None"""
+        fingerprint = context_fingerprint(passages)
+        key = f"{fingerprint}|{normalize_question(question)}"
+        entry = self.entries.get(key)
+        if entry is None and self.min_similarity < 1:
+            entry = self._nearest(fingerprint, question_vector(question))
+            if entry is not None:
+                # The exact lookup above counted it as a miss
+                self.near_hits += 1
+                self.entries.misses -= 1
+                self.entries.hits += 1
+        if entry is None:
+            return None
+        self.saved_seconds += self.api_latency.summary()['avg']
+        return entry[1], entry[2]
+
+    def _nearest(self, fingerprint: str, vector: Dict[int, float]) -> Optional[tuple]:
+        if not vector:
+            return None
+        best, best_key, best_score = None, None, self.min_similarity
+        prefix = f"{fingerprint}|"
+        now = time.time()
+        for key, (expires_at, entry) in self.entries._data.items():
+            if expires_at > now and key.startswith(prefix):
+                score = similarity(vector, entry[0])
+                if score >= best_score:
+                    best, best_key, best_score = entry, key, score
+        if best_key is not None:
+            self.entries._data.move_to_end(best_key)
+        return best
+
+    def store(self, question: str, passages: List[dict], answer: str, sources: list, seconds: float):
+        """Remember an answer that just came back from the API (seconds = what it took)"""
+        self.api_latency.record(seconds)
+        key = f"{context_fingerprint(passages)}|{normalize_question(question)}"
+        self.entries.put(key, (question_vector(question), answer, sources))
+
+    def invalidate(self, reason: str):
+        if len(self.entries):
+            self.entries.clear()
+            self.invalidations += 1
+            print(f"🗃️ AI response cache cleared ({reason})")
+
+    def stats(self) -> dict:
+        return {
+            **self.entries.stats(),
+            'near_hits': self.near_hits,
+            'invalidations': self.invalidations,
+            'saved_seconds': self.saved_seconds,
+            'api_latency': self.api_latency.summary()
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL CACHE
+# ═══════════════════════════════════════════════════════════════
+
+response_cache = ResponseCache()
+
+def invalidate_responses(reason: str):
+    """Forget every cached answer (wiki pages or learned facts changed)"""
+    response_cache.invalidate(reason)
+
+def get_response_cache_stats() -> dict:
+    return response_cache.stats()
+
+def format_response_cache_stats(stats: dict) -> str:
+    """Short summary for the status embed"""
+    lookups = stats['hits'] + stats['misses']
+    if not lookups:
+        return "no questions yet"
+    return (
+        f"Hit rate {stats['hit_rate'] * 100:.0f}% ({stats['hits']}/{lookups}, "
+        f"{stats['near_hits']} rephrased) · {stats['size']}/{stats['max_size']} answers\n"
+        f"Saved ~{stats['saved_seconds']:.0f}s of API time "
+        f"(avg call {stats['api_latency']['avg']:.1f}s) · cleared {stats['invalidations']}x"
+    )
+
+__all__ = [
+    'ResponseCache',
+    'response_cache',
+    'invalidate_responses',
+    'get_response_cache_stats',
+    'format_response_cache_stats'
+]
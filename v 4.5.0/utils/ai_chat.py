@@ -5,74 +5,85 @@ Learns from conversations, remembers facts, knows the team
 ═══════════════════════════════════════════════════════════════
 """
 
-import aiohttp
 import asyncio
-import os
-import json
-from datetime import datetime, timedelta
+import time
+from typing import Callable, Optional
+from config import (
+    LEARNED_FACTS_FILE, WIKI_CONTEXT_CHUNKS, WIKI_CONTEXT_MIN_SCORE, AI_FACTS_TOKEN_BUDGET, AI_MAX_REPLY_TOKENS
+)
+from .ai_cache import invalidate_responses, response_cache
+from .ai_prompt import build_messages, estimate_tokens
+from .ai_scheduler import AIQueueFull, AIQueueTimeout, ai_scheduler
+from .conversation_store import get_conversation_store
+from .llm_router import AIProvidersUnavailable, llm_router
+from .state_store import get_store
+from .wiki_featcher import WIKIS, search_wikis
+from .wiki_vectors import search_wiki_vectors, vectors_available
 
-# Get API key
-GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-
-# Conversation memory (last 5 messages per channel)
-conversation_memory = {}
-MAX_MEMORY = 5
+# Conversation memory (last exchanges per channel, bounded LRU, snapshotted to disk)
+conversations = get_conversation_store()
 
 # Learning database (bot learns and remembers facts)
 learned_facts = {}
-LEARNED_FACTS_FILE = "data/learned_facts.json"
-
-# Rate limiting
-last_request_time = {}
-MIN_REQUEST_INTERVAL = 2  # 2 seconds between requests per channel
+learned_facts_text = None  # Rendered prompt section, None = render again
 
 # ═══════════════════════════════════════════════════════════════
 # LEARNING SYSTEM
 # ═══════════════════════════════════════════════════════════════
 
 def load_learned_facts():
-    """Load learned facts from file"""
-    global learned_facts
+    """Load learned facts from storage"""
+    global learned_facts, learned_facts_text
     try:
-        if os.path.exists(LEARNED_FACTS_FILE):
-            with open(LEARNED_FACTS_FILE, 'r', encoding='utf-8') as f:
-                learned_facts = json.load(f)
+        learned_facts = dict(get_store(LEARNED_FACTS_FILE).snapshot())
     except:
         learned_facts = {}
+    learned_facts_text = None
 
 def save_learned_facts():
-    """Save learned facts to file"""
+    """Save learned facts (only changed categories are written)"""
     try:
-        os.makedirs("data", exist_ok=True)
-        with open(LEARNED_FACTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(learned_facts, f, indent=2, ensure_ascii=False)
+        get_store(LEARNED_FACTS_FILE).replace(learned_facts)
     except Exception as e:
         print(f"⚠️ Failed to save learned facts: {e}")
 
 def learn_fact(category: str, fact: str):
     """Learn and remember a fact"""
+    global learned_facts_text
     if category not in learned_facts:
         learned_facts[category] = []
     
     # Avoid duplicates
     if fact not in learned_facts[category]:
         learned_facts[category].append(fact)
-        save_learned_facts()
+        get_store(LEARNED_FACTS_FILE).set(category, learned_facts[category])
+        learned_facts_text = None
+        invalidate_responses("new learned fact")
         return True
     return False
 
 def get_learned_facts_text():
-    """Get all learned facts as text"""
+    """Get all learned facts as text (rendered once, again only after learn_fact adds one)"""
+    global learned_facts_text
+    if learned_facts_text is not None:
+        return learned_facts_text
     if not learned_facts:
+        learned_facts_text = ""
         return ""
     
     text = "\n\nTHINGS I'VE LEARNED:\n"
+    tokens = estimate_tokens(text)
     for category, facts in learned_facts.items():
-        text += f"\n{category.upper()}:\n"
+        section = f"\n{category.upper()}:\n"
         for fact in facts[:5]:  # Max 5 per category
-            text += f"- {fact}\n"
+            section += f"- {fact}\n"
+        tokens += estimate_tokens(section)
+        if tokens > AI_FACTS_TOKEN_BUDGET:
+            print(f"⚠️ Learned facts over {AI_FACTS_TOKEN_BUDGET} tokens - some categories left out of the prompt")
+            break
+        text += section
     
+    learned_facts_text = text
     return text
 
 # Load facts on startup
@@ -82,9 +93,8 @@ load_learned_facts()
 # CORE KNOWLEDGE BASE
 # ═══════════════════════════════════════════════════════════════
 
-def get_knowledge_context():
-    """Build knowledge base with CORRECT team info"""
-    context = """You are CSR Bot, the AI assistant for Champions of the Shattered Realm gaming community.
+# Static part of the system prompt - built once, not per request
+KNOWLEDGE_BASE = """You are CSR Bot, the AI assistant for Champions of the Shattered Realm gaming community.
 
 ═══════════════════════════════════════════════════════════════
 CRITICAL INFO ABOUT YOUR CREATORS (NEVER GET THIS WRONG!):
@@ -136,114 +146,69 @@ IMPORTANT RULES:
 - Be respectful to everyone, especially your creator
 - If unsure about something, admit it instead of guessing
 """
-    
-    # Add learned facts
-    context += get_learned_facts_text()
-    
-    return context
+
+def get_knowledge_context():
+    """Build knowledge base with CORRECT team info"""
+    return KNOWLEDGE_BASE + get_learned_facts_text()
 
 # ═══════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
-def load_json_safe(filepath: str, default=None):
-    """Safely load JSON file"""
-    try:
-        if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except:
-        pass
-    return default or {}
-
 async def search_game_database(query: str):
-    """Search wikis for game info"""
-    query_lower = query.lower()
-    results = []
-    
-    # Search SBOR wiki
+    """Wiki passages relevant to the message, from the whole corpus"""
     try:
-        sbor_data = load_json_safe("data/sbor_wiki.json", {"pages": {}})
-        for page_key, page_data in list(sbor_data.get('pages', {}).items())[:50]:
-            if query_lower in page_key or query_lower in page_data.get('content', '').lower():
-                results.append({
-                    'game': 'SBOR',
-                    'title': page_data.get('title', ''),
-                    'content': page_data.get('content', '')[:300],
-                    'url': page_data.get('url', '')
-                })
-                if len(results) >= 2:
-                    break
-    except:
-        pass
-    
-    # Search Blox Fruits wiki
-    if len(results) < 2:
-        try:
-            blox_data = load_json_safe("data/bloxfruits_wiki.json", {"pages": {}})
-            for page_key, page_data in list(blox_data.get('pages', {}).items())[:50]:
-                if query_lower in page_key or query_lower in page_data.get('content', '').lower():
-                    results.append({
-                        'game': 'Blox Fruits',
-                        'title': page_data.get('title', ''),
-                        'content': page_data.get('content', '')[:300],
-                        'url': page_data.get('url', '')
-                    })
-                    if len(results) >= 2:
-                        break
-        except:
-            pass
+        if vectors_available():
+            hits = await asyncio.to_thread(search_wiki_vectors, query, WIKI_CONTEXT_CHUNKS, WIKI_CONTEXT_MIN_SCORE)
+            games = {hit['wiki']: WIKIS.get(hit['wiki'], {}).get('name', hit['wiki']) for hit in hits}
+        else:
+            # No numpy - keyword search over the /wikisearch index instead
+            hits = [{**hit, 'content': hit['snippet']} for hit in await asyncio.to_thread(search_wikis, query, WIKI_CONTEXT_CHUNKS)]
+            games = {hit['wiki']: hit['wiki'] for hit in hits}
+    except Exception as e:
+        print(f"⚠️ Wiki context lookup failed: {e}")
+        return []
     
-    return results
+    return [{
+        'game': games[hit['wiki']],
+        'title': hit['title'],
+        'content': hit['content'],
+        'url': hit.get('url') or ''
+    } for hit in hits]
 
 # ═══════════════════════════════════════════════════════════════
 # MAIN AI CHAT FUNCTION
 # ═══════════════════════════════════════════════════════════════
 
-async def chat_with_groq(user_message: str, channel_id: int, username: str, user_id: int = None):
+async def chat_with_groq(user_message: str, channel_id: int, username: str, user_id: int = None,
+                         on_text: Optional[Callable[[str], None]] = None):
     """
-    Chat with AI using Groq API
+    Chat with AI (Groq first, other configured providers as backup)
     With learning, rate limiting, and correct team knowledge
+    on_text: stream the answer - called with the text so far as tokens arrive
     """
     
-    if not GROQ_API_KEY:
-        return "⚠️ AI system not configured. Ask staff to set up GROQ_API_KEY!", None
-    
-    # Rate limiting check
-    now = datetime.utcnow()
-    if channel_id in last_request_time:
-        time_diff = (now - last_request_time[channel_id]).total_seconds()
-        if time_diff < MIN_REQUEST_INTERVAL:
-            wait_time = MIN_REQUEST_INTERVAL - time_diff
-            return f"⏳ AI is cooling down! Try again in {int(wait_time)} seconds.", None
-    
-    last_request_time[channel_id] = now
+    if not llm_router.providers:
+        return "⚠️ AI system not configured. Ask staff to set up GROQ_API_KEY (or another AI key)!", None
     
     try:
         # Search game database
-        game_info = await search_game_database(user_message)
-        
-        # Build system context
-        system_prompt = get_knowledge_context()
-        
-        # Add game info if found
-        if game_info:
-            system_prompt += "\n\nRELEVANT GAME INFO FROM DATABASE:\n"
-            for info in game_info:
-                system_prompt += f"\n[{info['game']} - {info['title']}]\n{info['content']}\n"
+        retrieved = await search_game_database(user_message)
         
         # Get conversation history
-        if channel_id not in conversation_memory:
-            conversation_memory[channel_id] = []
+        history = conversations.history(channel_id)
         
-        history = conversation_memory[channel_id]
-        
-        # Build messages
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add history
-        for msg in history[-MAX_MEMORY:]:
-            messages.append(msg)
+        # Asked before with the same wiki context? Answer from the cache, no API call.
+        # Only fresh questions - a follow-up ("and the second one?") depends on what was said before
+        teaching = any(word in user_message.lower() for word in ["remember", "learn", "note that", "keep in mind", "fyi"])
+        cacheable = not teaching and not history and user_id not in (865472673131659264, 1348989002631352354)
+        cached = response_cache.lookup(user_message, retrieved) if cacheable else None
+        if cached:
+            ai_response, sources = cached
+            conversations.add_exchange(channel_id, user_message, ai_response)
+            if on_text:
+                on_text(ai_response)
+            return ai_response, sources
         
         # Add current message with user ID context
         user_context = f"{username}"
@@ -252,60 +217,30 @@ async def chat_with_groq(user_message: str, channel_id: int, username: str, user
         elif user_id == 1348989002631352354:  # Zephaniel's ID
             user_context += " (Guild Leader - Zephaniel𓂀Captain)"
         
-        messages.append({
-            "role": "user",
-            "content": f"{user_context}: {user_message}"
-        })
+        # A cached answer is served to whoever asks next - so it must not know who asked first
+        user_line = user_message if cacheable else f"{user_context}: {user_message}"
         
-        # Call Groq API
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                GROQ_API_URL,
-                headers={
-                    "Authorization": f"Bearer {GROQ_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "llama-3.3-70b-versatile",
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 500,
-                    "top_p": 1,
-                    "stream": False
-                },
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    ai_response = data['choices'][0]['message']['content'].strip()
-                    
-                    # Save to memory
-                    history.append({"role": "user", "content": user_message})
-                    history.append({"role": "assistant", "content": ai_response})
-                    conversation_memory[channel_id] = history[-MAX_MEMORY*2:]
-                    
-                    # Learning detection
-                    if any(word in user_message.lower() for word in ["remember", "learn", "note that", "keep in mind", "fyi"]):
-                        learn_fact("user_taught", f"{username} said: {user_message}")
-                    
-                    # Add sources if game info was used
-                    sources = []
-                    if game_info:
-                        for info in game_info:
-                            if info.get('url'):
-                                sources.append((info['game'], info['url']))
-                    
-                    return ai_response, sources
-                
-                elif response.status == 429:
-                    return "⏳ AI is getting too many requests! Wait a moment and try again.", None
-                
-                elif response.status == 401:
-                    return "⚠️ AI API key is invalid. Contact staff!", None
-                
-                else:
-                    print(f"❌ Groq API error {response.status}")
-                    return "Oops, AI is having issues! Try again? 😅", None
+        # Build messages - system prompt, facts, wiki info and history within the token budget
+        messages, game_info, prompt_tokens = build_messages(
+            KNOWLEDGE_BASE,
+            get_learned_facts_text(),
+            retrieved,
+            history,
+            user_line
+        )
+        
+        # Call the AI - when it's our turn (queued fairly, paced to the provider's quotas)
+        async with ai_scheduler.slot(channel_id, user_id or username, prompt_tokens + AI_MAX_REPLY_TOKENS):
+            return await call_llm(messages, channel_id, user_message, username, teaching, cacheable, retrieved,
+                                   game_info, on_text)
+    
+    except AIQueueFull as e:
+        if e.per_user:
+            return "⏳ You've already got questions waiting - hang on, I'll get to them!", None
+        return "⏳ AI is swamped right now! Try again in a minute.", None
+    
+    except AIQueueTimeout:
+        return "⏳ AI is too busy to get to your question right now! Try again in a bit?", None
     
     except asyncio.TimeoutError:
         return "⏰ AI took too long to respond! Try again?", None
@@ -314,29 +249,61 @@ async def chat_with_groq(user_message: str, channel_id: int, username: str, user
         print(f"❌ AI chat error: {e}")
         return "Something went wrong! Try again? 🤖", None
 
+async def call_llm(messages: list, channel_id: int, user_message: str, username: str, teaching: bool,
+                   cacheable: bool, retrieved: list, game_info: list, on_text: Optional[Callable[[str], None]]):
+    """The API call itself (healthiest provider, backed up if slow), with a scheduler slot already held"""
+    started = time.monotonic()
+    try:
+        ai_response, provider = await llm_router.complete(messages, AI_MAX_REPLY_TOKENS, on_text)
+    except AIProvidersUnavailable as e:
+        print(f"❌ No AI provider could answer: {e}")
+        if e.rate_limited or not e.errors:
+            # Every provider is over its quota (or resting) - hold everyone back, not just this channel
+            ai_scheduler.pause(e.retry_after)
+            return "⏳ AI is getting too many requests! Wait a moment and try again.", None
+        if e.auth_failed:
+            return "⚠️ AI API key is invalid. Contact staff!", None
+        return "Oops, AI is having issues! Try again? 😅", None
+    
+    # Save to memory
+    conversations.add_exchange(channel_id, user_message, ai_response)
+    
+    # Learning detection
+    if teaching:
+        learn_fact("user_taught", f"{username} said: {user_message}")
+    
+    # Add sources if game info was used
+    sources = []
+    if game_info:
+        for info in game_info:
+            if info.get('url'):
+                sources.append((info['game'], info['title'], info['url']))
+    
+    if cacheable and ai_response:
+        response_cache.store(user_message, retrieved, ai_response, sources, time.monotonic() - started)
+    
+    return ai_response, sources
+
 # ═══════════════════════════════════════════════════════════════
 # UTILITY FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
 def clear_memory(channel_id: int):
-    """Clear conversation memory for a channel"""
-    if channel_id in conversation_memory:
-        del conversation_memory[channel_id]
-    return True
+    """Clear conversation memory for a channel (False if there was none)"""
+    return conversations.clear(channel_id)
 
 def get_memory_stats():
     """Get memory statistics"""
-    total_messages = sum(len(msgs) for msgs in conversation_memory.values())
     return {
-        'channels': len(conversation_memory),
-        'total_messages': total_messages,
+        **conversations.stats(),
         'learned_facts': sum(len(facts) for facts in learned_facts.values())
     }
 
 def get_ai_status():
     """Get AI system status"""
-    if GROQ_API_KEY:
+    if llm_router.providers:
         stats = get_memory_stats()
-        return f"✅ **AI Online!**\nModel: Llama 3.3 70B (Groq)\nActive Channels: {stats['channels']}\nMemory: {stats['total_messages']} messages\nLearned Facts: {stats['learned_facts']}"
+        models = ", ".join(f"{provider.model} ({provider.name})" for provider in llm_router.providers)
+        return f"✅ **AI Online!**\nModels: {models}\nActive Channels: {stats['channels']}\nMemory: {stats['total_messages']} messages\nLearned Facts: {stats['learned_facts']}"
     else:
         return "❌ **AI Offline**\nAPI key not configured"
@@ -0,0 +1,197 @@
+"""
+═══════════════════════════════════════════════════════════════
+🧮 AI Prompt Builder - Fits every Groq request into a token budget
+The system prompt and learned facts are rendered once and reused;
+wiki passages and chat history fill whatever room is left, most
+useful first. Token counts are a local estimate (no tokenizer
+download, no API call) and every request's size is tracked.
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from config import AI_PROMPT_TOKEN_BUDGET, AI_MIN_PASSAGE_TOKENS
+from .metrics import LatencyTracker
+
+# Pieces a BPE tokenizer (Llama 3 / GPT style) splits text into, roughly
+PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+CHARS_PER_TOKEN = 4      # A long word costs about one token per 4 letters
+MESSAGE_OVERHEAD = 4     # Role / separator tokens the chat template adds per message
+
+# ═══════════════════════════════════════════════════════════════
+# TOKEN ESTIMATE
+# ═══════════════════════════════════════════════════════════════
+
+def estimate_tokens(text: str) -> int:
+    """
+    Tokens the model will see for this text - errs a little high so the
+    budget holds. Words are 1 token per 4 letters, numbers 1 per 3 digits,
+    every other symbol (emoji, punctuation, box drawing) 1 each.
+    """
+    if not text:
+        return 0
+    return sum(math.ceil(len(piece) / CHARS_PER_TOKEN) if piece[0].isalpha() else 1
+               for piece in PIECE_RE.findall(text))
+
+@lru_cache(maxsize=1024)
+def cached_tokens(text: str) -> int:
+    """estimate_tokens for strings sent again and again (system prompt, facts, history)"""
+    return estimate_tokens(text)
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Longest prefix of text (cut at a word) that fits in tokens"""
+    if estimate_tokens(text) <= tokens:
+        return text
+    used = 0
+    end = 0
+    for match in PIECE_RE.finditer(text):
+        piece = match.group()
+        used += math.ceil(len(piece) / CHARS_PER_TOKEN) if piece[0].isalpha() else 1
+        if used > tokens:
+            break
+        end = match.end()
+    cut = text.rfind(' ', 0, end)
+    return text[:cut if cut > 0 else end].rstrip() + " …"
+
+# ═══════════════════════════════════════════════════════════════
+# METRICS
+# ═══════════════════════════════════════════════════════════════
+
+prompt_tokens = LatencyTracker()   # Samples are token counts, not seconds
+prompt_bytes = LatencyTracker()    # JSON size of the messages sent
+prompt_counters = {
+    'requests': 0,
+    'over_budget': 0,        # Even system prompt + message didn't fit
+    'passages_used': 0,
+    'passages_dropped': 0,
+    'passages_trimmed': 0,
+    'history_used': 0,
+    'history_dropped': 0
+}
+last_prompt: Dict[str, int] = {}
+
+def record_prompt(sections: dict, messages: list):
+    prompt_tokens.record(sections['total'])
+    prompt_bytes.record(len(json.dumps(messages, ensure_ascii=False).encode('utf-8')))
+    prompt_counters['requests'] += 1
+    last_prompt.clear()
+    last_prompt.update(sections)
+
+def get_prompt_stats() -> dict:
+    """Prompt size per request (estimated tokens and bytes) for /aistatus"""
+    return {
+        'budget': AI_PROMPT_TOKEN_BUDGET,
+        'tokens': prompt_tokens.summary(),
+        'bytes': prompt_bytes.summary(),
+        'last': dict(last_prompt),
+        **prompt_counters
+    }
+
+def format_prompt_stats(stats: dict) -> str:
+    """Short summary for the status embed"""
+    if not stats['requests']:
+        return "no requests yet"
+    tokens, size = stats['tokens'], stats['bytes']
+    last = stats['last']
+    return (
+        f"~{tokens['p50']:.0f} tokens p50 · {tokens['p95']:.0f} p95 (budget {stats['budget']})\n"
+        f"{size['p50'] / 1024:.1f} KB p50 per request · {stats['requests']} requests\n"
+        f"Last: system {last.get('system', 0)} · facts {last.get('facts', 0)} · "
+        f"wiki {last.get('wiki', 0)} · history {last.get('history', 0)} · message {last.get('message', 0)}\n"
+        f"Wiki passages used {stats['passages_used']} / dropped {stats['passages_dropped']} · "
+        f"history dropped {stats['history_dropped']}"
+    )
+
+# ═══════════════════════════════════════════════════════════════
+# BUILDER
+# ═══════════════════════════════════════════════════════════════
+
+def format_passage(info: dict) -> str:
+    return f"\n[{info['game']} - {info['title']}]\n{info['content']}\n"
+
+WIKI_HEADER = "\n\nRELEVANT GAME INFO FROM DATABASE:\n"
+
+def build_messages(system_prompt: str, facts_text: str, passages: List[dict], history: List[dict],
+                   user_message: str, budget: Optional[int] = None) -> tuple:
+    """
+    (messages, passages actually used, estimated prompt tokens) for one
+    request, within budget tokens.
+    Always in: system prompt, learned facts, the user's message (trimmed if
+    it alone would blow the budget). Then, while room is left: the latest
+    exchange, the wiki passages best first (the last one trimmed rather than
+    dropped), then older history newest first.
+    """
+    budget = budget or AI_PROMPT_TOKEN_BUDGET
+    sections = {
+        'system': cached_tokens(system_prompt) + MESSAGE_OVERHEAD,
+        'facts': cached_tokens(facts_text) if facts_text else 0,
+        'message': estimate_tokens(user_message) + MESSAGE_OVERHEAD,
+        'wiki': 0,
+        'history': 0
+    }
+    room = budget - sections['system'] - sections['facts'] - sections['message']
+    if room < 0:
+        prompt_counters['over_budget'] += 1
+        user_message = truncate_to_tokens(user_message, max(room + sections['message'] - MESSAGE_OVERHEAD, 32))
+        sections['message'] = estimate_tokens(user_message) + MESSAGE_OVERHEAD
+        room = 0
+
+    # History is in (user, assistant) pairs: keep the newest pairs, never half of one
+    pairs = [history[max(i - 2, 0):i] for i in range(len(history), 0, -2)]
+    pair_costs = [sum(cached_tokens(msg['content']) + MESSAGE_OVERHEAD for msg in pair) for pair in pairs]
+    kept_pairs = 0
+
+    if pairs and pair_costs[0] <= room:
+        room -= pair_costs[0]
+        kept_pairs = 1
+
+    used = []
+    wiki_text = ""
+    header_cost = cached_tokens(WIKI_HEADER)
+    for info in passages:
+        cost = estimate_tokens(format_passage(info)) + (0 if used else header_cost)
+        if cost > room:
+            fit = room - (cost - estimate_tokens(info['content']))
+            if fit < AI_MIN_PASSAGE_TOKENS:
+                prompt_counters['passages_dropped'] += 1
+                continue
+            info = {**info, 'content': truncate_to_tokens(info['content'], fit)}
+            cost = estimate_tokens(format_passage(info)) + (0 if used else header_cost)
+            prompt_counters['passages_trimmed'] += 1
+        room -= cost
+        sections['wiki'] += cost
+        used.append(info)
+        wiki_text += format_passage(info)
+    prompt_counters['passages_used'] += len(used)
+
+    for cost in pair_costs[kept_pairs:]:
+        if cost > room:
+            break
+        room -= cost
+        kept_pairs += 1
+    sections['history'] = sum(pair_costs[:kept_pairs])
+    prompt_counters['history_used'] += sum(len(pair) for pair in pairs[:kept_pairs])
+    prompt_counters['history_dropped'] += sum(len(pair) for pair in pairs[kept_pairs:])
+
+    content = system_prompt + facts_text
+    if used:
+        content += WIKI_HEADER + wiki_text
+    messages = [{"role": "system", "content": content}]
+    for pair in reversed(pairs[:kept_pairs]):
+        messages.extend(pair)
+    messages.append({"role": "user", "content": user_message})
+
+    sections['total'] = sum(sections.values())
+    record_prompt(sections, messages)
+    return messages, used, sections['total']
+
+__all__ = [
+    'estimate_tokens',
+    'truncate_to_tokens',
+    'build_messages',
+    'get_prompt_stats',
+    'format_prompt_stats'
+]
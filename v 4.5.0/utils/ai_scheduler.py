@@ -0,0 +1,238 @@
+"""
+═══════════════════════════════════════════════════════════════
+🚦 AI Scheduler - One queue in front of every Groq call
+A few calls in flight at most, paced to the provider's requests-
+and tokens-per-minute quotas. Waiting requests are served round-
+robin by channel, then by user within a channel, so one busy
+channel (or one spammer) can't starve the rest. A request that
+can't start before its deadline gets a polite "busy" instead.
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Hashable, Optional
+from config import (
+    AI_MAX_CONCURRENCY,
+    AI_RATE_LIMIT_RPM,
+    AI_RATE_LIMIT_TPM,
+    AI_REQUEST_BURST,
+    AI_QUEUE_SIZE,
+    AI_QUEUE_PER_USER,
+    AI_QUEUE_DEADLINE
+)
+from .metrics import LatencyTracker, format_latency
+from .rate_limit import TokenBucket
+
+class AIQueueFull(Exception):
+    """No room in the queue (overall, or for this user)"""
+
+    def __init__(self, per_user: bool):
+        super().__init__("user already has questions waiting" if per_user else "AI queue is full")
+        self.per_user = per_user
+
+class AIQueueTimeout(Exception):
+    """Waited past the deadline without getting a slot"""
+
+class Ticket:
+    __slots__ = ('channel_id', 'user_id', 'tokens', 'future', 'enqueued')
+
+    def __init__(self, channel_id: Hashable, user_id: Hashable, tokens: int, future: asyncio.Future):
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.tokens = tokens
+        self.future = future
+        self.enqueued = time.monotonic()
+
+class AIScheduler:
+    """
+    channel → user → deque of tickets. The dispatcher waits for a free
+    slot and a request token, picks the next ticket round-robin, waits
+    for its share of the tokens-per-minute bucket, then lets it run.
+    """
+
+    def __init__(self, max_concurrency: int = AI_MAX_CONCURRENCY, rpm: float = AI_RATE_LIMIT_RPM,
+                 tpm: float = AI_RATE_LIMIT_TPM, burst: int = AI_REQUEST_BURST, max_queue: int = AI_QUEUE_SIZE,
+                 per_user: int = AI_QUEUE_PER_USER, deadline: float = AI_QUEUE_DEADLINE):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(rpm / 60, burst)
+        self.tokens = TokenBucket(tpm / 60, tpm)
+        self.max_queue = max_queue
+        self.per_user = per_user
+        self.deadline = deadline
+        self.queues: "OrderedDict[Hashable, OrderedDict[Hashable, deque]]" = OrderedDict()
+        self.queued = 0
+        self.in_flight = 0
+        self._slots = None
+        self._wakeup = None
+        self._task = None
+        self.wait_times = LatencyTracker()
+        self.peak_queued = 0
+        self.served = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.rate_limited = 0
+
+    # ═══════════════════════════════════════════════════════════
+    # QUEUE
+    # ═══════════════════════════════════════════════════════════
+
+    def _user_queued(self, user_id: Hashable) -> int:
+        # A user's tickets in every channel count towards their limit
+        return sum(len(users[user_id]) for users in self.queues.values() if user_id in users)
+
+    def _enqueue(self, ticket: Ticket):
+        users = self.queues.setdefault(ticket.channel_id, OrderedDict())
+        users.setdefault(ticket.user_id, deque()).append(ticket)
+        self.queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+
+    def _remove(self, ticket: Ticket):
+        """Take a ticket out of line (its caller gave up) if it's still waiting there"""
+        users = self.queues.get(ticket.channel_id)
+        tickets = users.get(ticket.user_id) if users else None
+        if not tickets or ticket not in tickets:
+            return  # Already picked by the dispatcher
+        tickets.remove(ticket)
+        self.queued -= 1
+        if not tickets:
+            del users[ticket.user_id]
+        if not users:
+            del self.queues[ticket.channel_id]
+
+    def _next(self) -> Optional[Ticket]:
+        """Oldest ticket of the next user of the next channel (both rotate to the back)"""
+        while self.queues:
+            channel_id, users = next(iter(self.queues.items()))
+            self.queues.move_to_end(channel_id)
+            user_id, tickets = next(iter(users.items()))
+            users.move_to_end(user_id)
+            ticket = tickets.popleft()
+            self.queued -= 1
+            if not tickets:
+                del users[user_id]
+            if not users:
+                del self.queues[channel_id]
+            if not ticket.future.done():  # Cancelled in the same instant it was picked
+                return ticket
+        return None
+
+    async def _dispatch(self):
+        while True:
+            await self._wakeup.wait()
+            if not self.queued:
+                self._wakeup.clear()
+                continue
+            await self._slots.acquire()
+            await self.requests.acquire()
+            # Picked only now, so whoever is next in line at this moment gets the slot
+            ticket = self._next()
+            if ticket is None:
+                # Everyone left in the queue gave up meanwhile
+                self._slots.release()
+                continue
+            await self.tokens.acquire(ticket.tokens)
+            if ticket.future.done():
+                self._slots.release()
+                continue
+            ticket.future.set_result(None)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._dispatch())
+
+    # ═══════════════════════════════════════════════════════════
+    # CALLERS
+    # ═══════════════════════════════════════════════════════════
+
+    @asynccontextmanager
+    async def slot(self, channel_id: Hashable, user_id: Hashable, tokens: int):
+        """
+        async with scheduler.slot(...): <one API call>
+        Raises AIQueueFull right away, or AIQueueTimeout after the deadline.
+        """
+        self._ensure_running()
+        if self.queued >= self.max_queue or self._user_queued(user_id) >= self.per_user:
+            self.rejected += 1
+            raise AIQueueFull(per_user=self.queued < self.max_queue)
+
+        ticket = Ticket(channel_id, user_id, tokens, asyncio.get_running_loop().create_future())
+        self._enqueue(ticket)
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), self.deadline)
+        except asyncio.TimeoutError:
+            # Granted in the same instant? Then go ahead anyway
+            if not ticket.future.done() or ticket.future.cancelled():
+                ticket.future.cancel()
+                self._remove(ticket)
+                self.timed_out += 1
+                raise AIQueueTimeout(f"no AI slot within {self.deadline:.0f}s")
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self._slots.release()
+            ticket.future.cancel()
+            self._remove(ticket)
+            raise
+
+        self.wait_times.record(time.monotonic() - ticket.enqueued)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.served += 1
+            self._slots.release()
+
+    def pause(self, seconds: float):
+        """Provider said 429 - hand out no requests for a while"""
+        self.rate_limited += 1
+        self.requests.pause(seconds)
+
+    def stats(self) -> dict:
+        return {
+            'queued': self.queued,
+            'peak_queued': self.peak_queued,
+            'in_flight': self.in_flight,
+            'max_concurrency': self.max_concurrency,
+            'waiting_channels': len(self.queues),
+            'wait': self.wait_times.summary(),
+            'served': self.served,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+            'rate_limited': self.rate_limited,
+            'requests_bucket': self.requests.stats(),
+            'tokens_bucket': self.tokens.stats()
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL SCHEDULER
+# ═══════════════════════════════════════════════════════════════
+
+ai_scheduler = AIScheduler()
+
+def get_ai_scheduler_stats() -> dict:
+    return ai_scheduler.stats()
+
+def format_ai_scheduler_stats(stats: dict) -> str:
+    """Short summary for the status embed"""
+    return (
+        f"Queue {stats['queued']} (peak {stats['peak_queued']}) · in flight "
+        f"{stats['in_flight']}/{stats['max_concurrency']}\n"
+        f"Wait: {format_latency(stats['wait'])}\n"
+        f"Busy replies: {stats['rejected']} queue full · {stats['timed_out']} past deadline · "
+        f"429s: {stats['rate_limited']}"
+    )
+
+__all__ = [
+    'AIScheduler',
+    'AIQueueFull',
+    'AIQueueTimeout',
+    'ai_scheduler',
+    'get_ai_scheduler_stats',
+    'format_ai_scheduler_stats'
+]
@@ -0,0 +1,135 @@
+"""
+═══════════════════════════════════════════════════════════════
+🔎 Badword Matcher - Compiled Aho-Corasick automaton
+Finds every badword/phrase in a message with ONE pass over the text
+═══════════════════════════════════════════════════════════════
+"""
+
+from collections import deque
+from typing import Iterable, List, Optional, Tuple
+
+# (term, start, end) - end is exclusive, like a slice
+Match = Tuple[str, int, int]
+
+# ═══════════════════════════════════════════════════════════════
+# HELPERS
+# ═══════════════════════════════════════════════════════════════
+
+def _is_word_char(char: str) -> bool:
+    """Same idea of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+def _lower_same_length(text: str) -> str:
+    """Lowercase text without changing its length (keeps spans valid)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters (e.g. 'İ') grow when lowercased - keep the first char only
+    return ''.join(char.lower()[:1] or char for char in text)
+
+# ═══════════════════════════════════════════════════════════════
+# MATCHER
+# ═══════════════════════════════════════════════════════════════
+
+class BadwordMatcher:
+    """
+    Multi-pattern matcher built once from the badwords list.
+    Uses word boundaries like the old r'\\b' + word + r'\\b' regex,
+    so multi-word phrases ("ball gag") work too.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.words = sorted({w.strip().lower() for w in words if w and w.strip()})
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _build(self):
+        """Build the trie, failure links and merged outputs"""
+        goto = [{}]       # node -> {char: node}
+        fail = [0]        # node -> fallback node
+        outputs = [()]    # node -> tuple of term indexes ending here
+
+        for index, word in enumerate(self.words):
+            node = 0
+            for char in word:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append(())
+                node = next_node
+            outputs[node] = outputs[node] + (index,)
+
+        # Breadth-first pass to wire failure links
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                fallback = fail[node]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[child] = target if target != child else 0
+                if outputs[fail[child]]:
+                    outputs[child] = outputs[child] + outputs[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._outputs = outputs
+
+    def _scan(self, text: str, first_only: bool = False) -> List[Match]:
+        """Walk the automaton over text and collect boundary-valid matches"""
+        if not self.words or not text:
+            return []
+
+        lowered = _lower_same_length(text)
+        length = len(lowered)
+        goto, fail, outputs, words = self._goto, self._fail, self._outputs, self.words
+        matches = []
+        node = 0
+
+        for pos, char in enumerate(lowered):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            if not outputs[node]:
+                continue
+
+            end = pos + 1
+            for index in outputs[node]:
+                word = words[index]
+                start = end - len(word)
+
+                # \b at start: word-ness changes between start-1 and start
+                before = start > 0 and _is_word_char(lowered[start - 1])
+                if before == _is_word_char(lowered[start]):
+                    continue
+                # \b at end: word-ness changes between end-1 and end
+                after = end < length and _is_word_char(lowered[end])
+                if after == _is_word_char(lowered[end - 1]):
+                    continue
+
+                matches.append((word, start, end))
+                if first_only:
+                    return matches
+
+        return matches
+
+    def find_all(self, text: str) -> List[Match]:
+        """Return every (term, start, end) match in text"""
+        matches = self._scan(text)
+        matches.sort(key=lambda m: (m[1], -m[2]))
+        return matches
+
+    def search(self, text: str) -> Optional[Match]:
+        """Return the first match found, or None"""
+        matches = self._scan(text, first_only=True)
+        return matches[0] if matches else None
+
+__all__ = ['BadwordMatcher', 'Match']
@@ -0,0 +1,238 @@
+"""
+═══════════════════════════════════════════════════════════════
+💬 Conversation Store - What the AI chat remembers per channel
+A short deque of (role, text) entries per channel, capped in size,
+with the least recently active channels dropped once the whole
+store goes over its memory budget. Snapshotted to disk so context
+survives a restart.
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import List, Optional
+from config import (
+    CONVERSATIONS_FILE,
+    CONVERSATION_HISTORY,
+    CONVERSATION_ENTRY_CHARS,
+    CONVERSATION_MAX_CHANNELS,
+    CONVERSATION_MAX_BYTES,
+    CONVERSATION_IDLE_HOURS
+)
+
+ROLES = ("user", "assistant")
+ENTRY_OVERHEAD = 64  # Bytes a (role, str) tuple costs beyond its text, roughly
+
+class Channel:
+    """History of one channel"""
+    __slots__ = ('entries', 'bytes', 'last_active')
+
+    def __init__(self):
+        self.entries = deque()   # (role index, text) - oldest first
+        self.bytes = 0
+        self.last_active = 0.0
+
+def entry_size(text: str) -> int:
+    return len(text.encode('utf-8')) + ENTRY_OVERHEAD
+
+# ═══════════════════════════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════════════════════════
+
+class ConversationStore:
+    """
+    channel id → Channel, in least → most recently used order.
+    Limits: CONVERSATION_HISTORY entries per channel (oldest fall off),
+    CONVERSATION_MAX_CHANNELS channels and CONVERSATION_MAX_BYTES in
+    total (idle channels evicted first), CONVERSATION_IDLE_HOURS of
+    silence before a channel is forgotten.
+    """
+
+    def __init__(self, max_entries: int = CONVERSATION_HISTORY, max_channels: int = CONVERSATION_MAX_CHANNELS,
+                 max_bytes: int = CONVERSATION_MAX_BYTES, idle_seconds: float = CONVERSATION_IDLE_HOURS * 3600):
+        self.max_entries = max_entries
+        self.max_channels = max_channels
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self.lock = threading.Lock()
+        self.channels: "OrderedDict[int, Channel]" = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+        self.expired = 0
+        self.snapshots = 0
+        self.last_snapshot = 0.0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def _channel(self, channel_id: int, create: bool = True) -> Optional[Channel]:
+        channel = self.channels.get(channel_id)
+        if channel is None and create:
+            channel = self.channels[channel_id] = Channel()
+        if channel is not None:
+            self.channels.move_to_end(channel_id)
+        return channel
+
+    def _drop(self, channel_id: int):
+        channel = self.channels.pop(channel_id)
+        self.bytes -= channel.bytes
+
+    def _enforce_limits(self):
+        # Never evict the channel that was just used (the last one)
+        while len(self.channels) > 1 and (len(self.channels) > self.max_channels or self.bytes > self.max_bytes):
+            self._drop(next(iter(self.channels)))
+            self.evictions += 1
+
+    # ═══════════════════════════════════════════════════════════
+    # HISTORY
+    # ═══════════════════════════════════════════════════════════
+
+    def history(self, channel_id: int) -> List[dict]:
+        """Chat messages for the prompt, oldest first"""
+        with self.lock:
+            channel = self._channel(channel_id, create=False)
+            if channel is None:
+                return []
+            return [{"role": ROLES[role], "content": text} for role, text in channel.entries]
+
+    def add_exchange(self, channel_id: int, user_message: str, reply: str):
+        """Remember one question and the AI's answer"""
+        with self.lock:
+            channel = self._channel(channel_id)
+            for role, text in ((0, user_message), (1, reply)):
+                text = text[:CONVERSATION_ENTRY_CHARS]
+                channel.entries.append((role, text))
+                size = entry_size(text)
+                channel.bytes += size
+                self.bytes += size
+            while len(channel.entries) > self.max_entries:
+                size = entry_size(channel.entries.popleft()[1])
+                channel.bytes -= size
+                self.bytes -= size
+            channel.last_active = time.time()
+            self.dirty = True
+            self._enforce_limits()
+
+    def clear(self, channel_id: int) -> bool:
+        with self.lock:
+            if channel_id not in self.channels:
+                return False
+            self._drop(channel_id)
+            self.dirty = True
+            return True
+
+    def prune(self) -> int:
+        """Forget channels nobody has talked in for CONVERSATION_IDLE_HOURS"""
+        cutoff = time.time() - self.idle_seconds
+        with self.lock:
+            idle = [channel_id for channel_id, channel in self.channels.items() if channel.last_active < cutoff]
+            for channel_id in idle:
+                self._drop(channel_id)
+            self.expired += len(idle)
+            if idle:
+                self.dirty = True
+            return len(idle)
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTENCE
+    # ═══════════════════════════════════════════════════════════
+
+    def save(self, filepath: str, force: bool = False) -> bool:
+        """Write every conversation to a JSON file (temp file + rename), skipped if nothing changed"""
+        if not self.dirty and not force:
+            return True
+        with self.lock:
+            channels = [
+                [channel_id, channel.last_active, [[role, text] for role, text in channel.entries]]
+                for channel_id, channel in self.channels.items() if channel.entries
+            ]
+            self.dirty = False
+        try:
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': time.time(), 'channels': channels}, f, ensure_ascii=False,
+                          separators=(',', ':'))
+            os.replace(tmp_path, filepath)
+            self.snapshots += 1
+            self.last_snapshot = time.time()
+            return True
+        except Exception as e:
+            self.dirty = True
+            print(f"⚠️ Failed to save conversations {filepath}: {e}")
+            return False
+
+    def load(self, filepath: str) -> int:
+        """Restore conversations saved by save() (least recently used first, as saved)"""
+        try:
+            if not os.path.exists(filepath):
+                return 0
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Failed to load conversations {filepath}: {e}")
+            return 0
+
+        cutoff = time.time() - self.idle_seconds
+        loaded = 0
+        with self.lock:
+            for channel_id, last_active, entries in data.get('channels', []):
+                if last_active < cutoff:
+                    continue
+                channel = self._channel(int(channel_id))
+                for role, text in entries[-self.max_entries:]:
+                    text = text[:CONVERSATION_ENTRY_CHARS]
+                    channel.entries.append((role, text))
+                    channel.bytes += entry_size(text)
+                self.bytes += channel.bytes
+                channel.last_active = last_active
+                loaded += 1
+            self._enforce_limits()
+        return loaded
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                'channels': len(self.channels),
+                'total_messages': sum(len(channel.entries) for channel in self.channels.values()),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'max_channels': self.max_channels,
+                'evictions': self.evictions,
+                'expired': self.expired,
+                'snapshots': self.snapshots,
+                'last_snapshot': self.last_snapshot
+            }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL STORE
+# ═══════════════════════════════════════════════════════════════
+
+_store: Optional[ConversationStore] = None
+
+def get_conversation_store() -> ConversationStore:
+    """The bot's conversation store (restored from the last snapshot on first use)"""
+    global _store
+    if _store is None:
+        _store = ConversationStore()
+        loaded = _store.load(CONVERSATIONS_FILE)
+        if loaded:
+            print(f"💬 Restored AI conversations for {loaded} channels")
+    return _store
+
+def save_conversations(force: bool = False) -> bool:
+    """Snapshot conversations to disk (periodic task and /shutdown)"""
+    if _store is None:
+        return True
+    _store.prune()
+    return _store.save(CONVERSATIONS_FILE, force)
+
+__all__ = [
+    'ConversationStore',
+    'get_conversation_store',
+    'save_conversations'
+]
@@ -0,0 +1,279 @@
+"""
+═══════════════════════════════════════════════════════════════
+🚦 Crawl Scheduler - Polite, adaptive pacing for wiki crawls
+One budget per wiki host: AIMD concurrency, a request-rate ceiling,
+Retry-After / maxlag back-off, and a jittered retry queue
+═══════════════════════════════════════════════════════════════
+"""
+
+import aiohttp
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from config import (
+    CRAWL_START_CONCURRENCY,
+    CRAWL_MAX_CONCURRENCY,
+    CRAWL_RATE_LIMIT,
+    CRAWL_JITTER,
+    CRAWL_MAXLAG,
+    CRAWL_MAX_RETRIES,
+    CRAWL_BACKOFF_BASE,
+    CRAWL_MAX_BACKOFF,
+    CRAWL_PROGRESS_INTERVAL
+)
+from .http_client import get_timeout
+from .rate_limit import TokenBucket
+
+class CrawlError(Exception):
+    """A request that won't succeed by retrying (bad params, 404...)"""
+
+class RetryableError(CrawlError):
+    """Network error or 5xx - worth another try later"""
+
+class Throttled(RetryableError):
+    """The wiki asked us to slow down (429, 503 or maxlag)"""
+
+    def __init__(self, reason: str, retry_after: Optional[float] = None):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential back-off with jitter, so retries from many workers don't line up"""
+    if retry_after is not None:
+        return min(CRAWL_MAX_BACKOFF, retry_after) + random.uniform(0, CRAWL_BACKOFF_BASE)
+    ceiling = min(CRAWL_MAX_BACKOFF, CRAWL_BACKOFF_BASE * 2 ** attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+# ═══════════════════════════════════════════════════════════════
+# HOST BUDGET (AIMD)
+# ═══════════════════════════════════════════════════════════════
+
+class HostBudget:
+    """
+    How hard we may hit one wiki host.
+    Every success widens the window by ~1 request per round trip (additive
+    increase); a 429/503/maxlag halves it and pauses the host (multiplicative
+    decrease). The token bucket caps requests/second whatever the window.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit = float(CRAWL_START_CONCURRENCY)
+        self.in_flight = 0
+        self.bucket = TokenBucket(*CRAWL_RATE_LIMIT)
+        self._slots = asyncio.Condition()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.retries = 0
+        self.peak = self.limit
+
+    async def _acquire(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        try:
+            await self.bucket.acquire()
+            # Jitter keeps parallel workers from hitting the wiki in lockstep
+            await asyncio.sleep(random.uniform(0, CRAWL_JITTER))
+        except BaseException:
+            await self._release()
+            raise
+
+    async def _release(self):
+        async with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    def _on_success(self):
+        self.limit = min(CRAWL_MAX_CONCURRENCY, self.limit + 1 / self.limit)
+        self.peak = max(self.peak, self.limit)
+
+    def _on_throttle(self, retry_after: Optional[float]):
+        self.throttled += 1
+        # Requests already in flight will get throttled too - only back off once per pause
+        if self.bucket.blocked_until <= time.monotonic():
+            self.limit = max(1.0, self.limit / 2)
+        self.bucket.pause(retry_after if retry_after is not None else backoff_delay(0))
+
+    async def get(self, session: aiohttp.ClientSession, api_url: str, params: dict) -> dict:
+        """One API call within the budget. Raises Throttled / RetryableError / CrawlError."""
+        params = {**params, "maxlag": str(CRAWL_MAXLAG)}
+        await self._acquire()
+        try:
+            self.requests += 1
+            async with session.get(api_url, params=params, timeout=get_timeout('wiki')) as response:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status in (429, 503):
+                    self._on_throttle(retry_after)
+                    raise Throttled(f"HTTP {response.status}", retry_after)
+                if response.status >= 500:
+                    self.errors += 1
+                    raise RetryableError(f"HTTP {response.status}")
+                if response.status != 200:
+                    raise CrawlError(f"HTTP {response.status}")
+                data = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.errors += 1
+            raise RetryableError(str(e) or type(e).__name__) from e
+        finally:
+            await self._release()
+
+        error = data.get("error") or {}
+        if error.get("code") == "maxlag":
+            # Replication lag on the wiki's side: MediaWiki wants us to wait
+            self._on_throttle(retry_after)
+            raise Throttled(f"maxlag ({error.get('lag', '?')}s)", retry_after)
+        self._on_success()
+        return data
+
+    async def call(self, session: aiohttp.ClientSession, api_url: str, params: dict) -> dict:
+        """get() with inline retries, for sequential chains (page lists, recent changes)"""
+        for attempt in range(CRAWL_MAX_RETRIES):
+            try:
+                return await self.get(session, api_url, params)
+            except RetryableError as e:
+                if attempt == CRAWL_MAX_RETRIES - 1:
+                    raise
+                self.retries += 1
+                delay = backoff_delay(attempt, getattr(e, "retry_after", None))
+                print(f"⏳ {self.host}: {e}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            'concurrency': round(self.limit, 2),
+            'peak_concurrency': round(self.peak, 2),
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'errors': self.errors,
+            'retries': self.retries,
+            'paused_for': self.bucket.stats()['paused_for']
+        }
+
+_budgets: Dict[str, HostBudget] = {}
+
+def get_budget(api_url: str) -> HostBudget:
+    """The budget for a wiki's host (wikis on the same host share it)"""
+    host = urlparse(api_url).netloc
+    if host not in _budgets:
+        _budgets[host] = HostBudget(host)
+    return _budgets[host]
+
+def get_crawl_stats() -> dict:
+    return {host: budget.stats() for host, budget in _budgets.items()}
+
+# ═══════════════════════════════════════════════════════════════
+# WORK QUEUE
+# ═══════════════════════════════════════════════════════════════
+
+async def crawl(budget: HostBudget, items: List, handler: Callable[[object], Awaitable[int]],
+                total: int, label: str, progress_callback=None) -> List:
+    """
+    Run handler(item) for every item with up to CRAWL_MAX_CONCURRENCY workers
+    (the budget decides how many actually hit the wiki at once).
+    handler returns how many pages it finished. Items that raise RetryableError
+    wait in the retry queue with back-off; returns the items that never made it.
+    """
+    queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait((0, item))
+
+    loop = asyncio.get_running_loop()
+    remaining = len(items)
+    all_done = asyncio.Event()
+    failed = []
+    state = {'pages': 0, 'retrying': 0}
+    started = time.monotonic()
+
+    if not items:
+        return failed
+
+    def requeue(attempt: int, item):
+        state['retrying'] -= 1
+        queue.put_nowait((attempt, item))
+
+    def finish():
+        nonlocal remaining
+        remaining -= 1
+        if remaining == 0:
+            all_done.set()
+
+    async def worker():
+        while True:
+            attempt, item = await queue.get()
+            try:
+                pages = await handler(item)
+                state['pages'] += pages
+            except RetryableError as e:
+                if attempt + 1 < CRAWL_MAX_RETRIES:
+                    budget.retries += 1
+                    state['retrying'] += 1
+                    loop.call_later(backoff_delay(attempt, getattr(e, "retry_after", None)),
+                                    requeue, attempt + 1, item)
+                    continue
+                print(f"❌ {label}: giving up on a batch after {CRAWL_MAX_RETRIES} tries: {e}")
+                failed.append(item)
+            except Exception as e:
+                print(f"❌ {label}: batch failed: {e}")
+                failed.append(item)
+            finish()
+
+    async def reporter():
+        while True:
+            await asyncio.sleep(CRAWL_PROGRESS_INTERVAL)
+            await report()
+
+    async def report():
+        minutes = max(time.monotonic() - started, 1e-6) / 60
+        message = (f"{label}: {state['pages']}/{total} pages · {state['pages'] / minutes:.0f} pages/min · "
+                   f"{budget.limit:.1f} parallel")
+        if state['retrying']:
+            message += f" · {state['retrying']} retrying"
+        if budget.throttled:
+            message += f" · throttled {budget.throttled}x"
+        try:
+            await progress_callback(message)
+        except Exception as e:
+            print(f"⚠️ Progress update failed: {e}")
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(CRAWL_MAX_CONCURRENCY, len(items)))]
+    progress = asyncio.create_task(reporter()) if progress_callback else None
+    try:
+        await all_done.wait()
+    finally:
+        for task in workers + ([progress] if progress else []):
+            task.cancel()
+        await asyncio.gather(*workers, *([progress] if progress else []), return_exceptions=True)
+
+    if progress_callback:
+        await report()
+    return failed
+
+__all__ = [
+    'CrawlError',
+    'RetryableError',
+    'Throttled',
+    'HostBudget',
+    'get_budget',
+    'get_crawl_stats',
+    'crawl'
+]
@@ -10,15 +10,19 @@ from datetime import datetime
 import pytz
 import discord
 from config import *
+from .state_store import get_store, find_store
 
 # ═══════════════════════════════════════════════════════════════
 # JSON UTILITIES
 # ═══════════════════════════════════════════════════════════════
 
 def load_json(filepath, default=None):
-    """Load JSON file"""
+    """Load JSON file (managed files: a read-only view)"""
     if default is None:
         default = {}
+    store = find_store(filepath)
+    if store is not None:
+        return store.snapshot()
     try:
         if os.path.exists(filepath):
             with open(filepath, 'r', encoding='utf-8') as f:
@@ -29,6 +33,10 @@ def load_json(filepath, default=None):
 
 def save_json(filepath, data):
     """Save JSON file"""
+    store = find_store(filepath)
+    if store is not None:
+        store.replace(data)
+        return True
     try:
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
@@ -43,29 +51,21 @@ def save_json(filepath, data):
 
 def get_user_language(user_id):
     """Get user's preferred language"""
-    settings = load_json(USER_SETTINGS_FILE)
-    return settings.get(str(user_id), {}).get('language', 'en')
+    return get_store(USER_SETTINGS_FILE).get(str(user_id), {}).get('language', 'en')
 
 def get_user_timezone(user_id):
     """Get user's timezone"""
-    settings = load_json(USER_SETTINGS_FILE)
-    return settings.get(str(user_id), {}).get('timezone', 'UTC')
+    return get_store(USER_SETTINGS_FILE).get(str(user_id), {}).get('timezone', 'UTC')
 
 def set_user_language(user_id, language):
     """Set user's language"""
-    settings = load_json(USER_SETTINGS_FILE)
-    if str(user_id) not in settings:
-        settings[str(user_id)] = {}
-    settings[str(user_id)]['language'] = language
-    return save_json(USER_SETTINGS_FILE, settings)
+    get_store(USER_SETTINGS_FILE).update(str(user_id), {'language': language})
+    return True
 
 def set_user_timezone(user_id, timezone):
     """Set user's timezone"""
-    settings = load_json(USER_SETTINGS_FILE)
-    if str(user_id) not in settings:
-        settings[str(user_id)] = {}
-    settings[str(user_id)]['timezone'] = timezone
-    return save_json(USER_SETTINGS_FILE, settings)
+    get_store(USER_SETTINGS_FILE).update(str(user_id), {'timezone': timezone})
+    return True
 
 # ═══════════════════════════════════════════════════════════════
 # TIME FORMATTING
@@ -105,19 +105,17 @@ def is_admin(interaction: discord.Interaction) -> bool:
 # ═══════════════════════════════════════════════════════════════
 
 async def log_to_modlog(bot, embed):
-    """Send embed to modlog channel"""
+    """Queue embed for the modlog channel (sent in batches)"""
     try:
-        modlog = bot.get_channel(MODLOG_CHANNEL_ID)
-        if modlog:
-            await modlog.send(embed=embed)
+        from .modlog_sink import log_event
+        log_event(bot, embed=embed)
     except Exception as e:
         print(f"⚠️ Failed to log to modlog: {e}")
 
 async def log_action(bot, message):
     """Log a moderation action - SIMPLIFIED!"""
     try:
-        modlog = bot.get_channel(MODLOG_CHANNEL_ID)
-        if modlog:
-            await modlog.send(message)
+        from .modlog_sink import log_event
+        log_event(bot, content=message)
     except Exception as e:
         print(f"⚠️ Failed to log action: {e}")
@@ -0,0 +1,136 @@
+"""
+═══════════════════════════════════════════════════════════════
+🌐 HTTP Client - One pooled aiohttp session for the whole bot
+Keep-alive, DNS caching, per-service timeouts and per-host stats
+═══════════════════════════════════════════════════════════════
+"""
+
+import aiohttp
+from collections import defaultdict
+from typing import Optional
+from config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_SECONDS,
+    HTTP_DNS_CACHE_SECONDS,
+    HTTP_TIMEOUTS
+)
+
+_session: Optional[aiohttp.ClientSession] = None
+
+# host -> counters
+_host_stats = defaultdict(lambda: {
+    'requests': 0,
+    'new_connections': 0,
+    'reused_connections': 0,
+    'errors': 0
+})
+
+# ═══════════════════════════════════════════════════════════════
+# TRACING (feeds the per-host stats)
+# ═══════════════════════════════════════════════════════════════
+
+async def _on_request_start(session, ctx, params):
+    ctx.host = params.url.host
+    _host_stats[ctx.host]['requests'] += 1
+
+async def _on_connection_create_end(session, ctx, params):
+    _host_stats[getattr(ctx, 'host', None)]['new_connections'] += 1
+
+async def _on_connection_reuseconn(session, ctx, params):
+    _host_stats[getattr(ctx, 'host', None)]['reused_connections'] += 1
+
+async def _on_request_exception(session, ctx, params):
+    _host_stats[getattr(ctx, 'host', None)]['errors'] += 1
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_connection_create_end.append(_on_connection_create_end)
+    trace.on_connection_reuseconn.append(_on_connection_reuseconn)
+    trace.on_request_exception.append(_on_request_exception)
+    return trace
+
+# ═══════════════════════════════════════════════════════════════
+# LIFECYCLE
+# ═══════════════════════════════════════════════════════════════
+
+def _create_session() -> aiohttp.ClientSession:
+    """Build the pooled session"""
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+        use_dns_cache=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=get_timeout('default'),
+        trace_configs=[_build_trace_config()]
+    )
+
+async def start_http_client() -> aiohttp.ClientSession:
+    """Create the shared session (called from on_ready)"""
+    session = get_session()
+    print(f"🌐 HTTP client ready (pool {HTTP_POOL_LIMIT}, {HTTP_POOL_LIMIT_PER_HOST}/host)")
+    return session
+
+async def close_http_client():
+    """Close the shared session (called from /shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+        print("🌐 HTTP client closed")
+    _session = None
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared session.
+    Created lazily if something needs HTTP before on_ready ran.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = _create_session()
+    return _session
+
+def get_timeout(service: str, idle: float = None) -> aiohttp.ClientTimeout:
+    """Timeout for a service (see HTTP_TIMEOUTS in config.py); idle = max seconds between reads (streams)"""
+    return aiohttp.ClientTimeout(total=HTTP_TIMEOUTS.get(service, HTTP_TIMEOUTS['default']), sock_read=idle)
+
+# ═══════════════════════════════════════════════════════════════
+# STATS
+# ═══════════════════════════════════════════════════════════════
+
+def get_pool_stats() -> dict:
+    """Per-host request/connection counters with reuse rate"""
+    stats = {}
+    for host, counters in _host_stats.items():
+        if host is None:
+            continue
+        opened = counters['new_connections'] + counters['reused_connections']
+        stats[host] = dict(counters)
+        stats[host]['reuse_rate'] = counters['reused_connections'] / opened if opened else 0.0
+    return stats
+
+def get_http_status() -> str:
+    """Short text summary for status commands"""
+    stats = get_pool_stats()
+    if not stats:
+        return "No outbound requests yet"
+    lines = []
+    for host, s in sorted(stats.items(), key=lambda item: -item[1]['requests']):
+        lines.append(
+            f"`{host}` - {s['requests']} req, {s['new_connections']} new conn, "
+            f"{s['reuse_rate']:.0%} reused, {s['errors']} errors"
+        )
+    return "\n".join(lines)
+
+__all__ = [
+    'start_http_client',
+    'close_http_client',
+    'get_session',
+    'get_timeout',
+    'get_pool_stats',
+    'get_http_status'
+]
@@ -0,0 +1,445 @@
+"""
+═══════════════════════════════════════════════════════════════
+🔀 LLM Router - Every configured AI provider behind one call
+Each provider keeps a rolling latency and error rate; requests go
+to the healthiest one. If it hasn't answered by its usual p95, the
+next provider races it (first to answer wins, the other is
+cancelled). A provider that keeps failing is skipped for a while
+(circuit breaker), then gets a single trial call.
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Callable, List, Optional
+from config import (
+    AI_PROVIDERS,
+    AI_HEALTH_WINDOW,
+    AI_HEALTH_SECONDS,
+    AI_EXPECTED_LATENCY,
+    AI_HEDGE_MIN_SAMPLES,
+    AI_HEDGE_DEFAULT_DELAY,
+    AI_HEDGE_MIN_DELAY,
+    AI_BREAKER_ERROR_RATE,
+    AI_BREAKER_MIN_CALLS,
+    AI_BREAKER_FAILURES,
+    AI_BREAKER_COOLDOWN,
+    AI_STREAM_IDLE_TIMEOUT
+)
+from .http_client import get_session, get_timeout
+from .metrics import LatencyTracker
+
+ANTHROPIC_VERSION = "2023-06-01"
+
+class ProviderError(Exception):
+    """A provider answered with an HTTP error"""
+
+    def __init__(self, provider: str, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"{provider} returned HTTP {status}")
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+class AIProvidersUnavailable(Exception):
+    """No provider could answer (errors = what each one tried failed with)"""
+
+    def __init__(self, errors: list, retry_after: float = 0.0):
+        super().__init__("; ".join(str(e) or type(e).__name__ for e in errors) or "every provider is cooling down")
+        self.errors = errors
+        self.retry_after = retry_after
+
+    def _all(self, status: int) -> bool:
+        return bool(self.errors) and all(getattr(e, 'status', None) == status for e in self.errors)
+
+    @property
+    def rate_limited(self) -> bool:
+        return self._all(429)
+
+    @property
+    def auth_failed(self) -> bool:
+        return self._all(401)
+
+def retry_after_seconds(headers) -> Optional[float]:
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+# ═══════════════════════════════════════════════════════════════
+# PROVIDERS
+# ═══════════════════════════════════════════════════════════════
+
+class Provider:
+    """One chat completion API (request format + health)"""
+
+    def __init__(self, name: str, url: str, model: str, key: str, api: str = 'openai',
+                 window: int = AI_HEALTH_WINDOW):
+        self.name = name
+        self.url = url
+        self.model = model
+        self.key = key
+        self.api = api
+        # Health - latency to the first words (streamed) or the whole answer
+        self.first_token = LatencyTracker(window)
+        self.complete = LatencyTracker(window)
+        self.outcomes = deque(maxlen=window)   # (when, answered)
+        self.failures_in_row = 0
+        self.opened_until = 0.0                # Circuit open (skipped) until then
+        self.probing = False                   # Trial call after the cooldown in flight
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.trips = 0
+        self.last_error = ""
+
+    def request(self, messages: List[dict], max_tokens: int, stream: bool) -> tuple:
+        """(headers, json body) in this provider's format"""
+        if self.api == 'anthropic':
+            return (
+                {"x-api-key": self.key, "anthropic-version": ANTHROPIC_VERSION, "Content-Type": "application/json"},
+                {
+                    "model": self.model,
+                    "system": "\n\n".join(msg['content'] for msg in messages if msg['role'] == 'system'),
+                    "messages": [msg for msg in messages if msg['role'] != 'system'],
+                    "temperature": 0.7,
+                    "max_tokens": max_tokens,
+                    "stream": stream
+                }
+            )
+        return (
+            {"Authorization": f"Bearer {self.key}", "Content-Type": "application/json"},
+            {
+                "model": self.model,
+                "messages": messages,
+                "temperature": 0.7,
+                "max_tokens": max_tokens,
+                "top_p": 1,
+                "stream": stream
+            }
+        )
+
+    def answer(self, data: dict) -> str:
+        if self.api == 'anthropic':
+            return "".join(block.get('text', '') for block in data['content'])
+        return data['choices'][0]['message']['content']
+
+    def delta(self, event: dict) -> Optional[str]:
+        """New text in one streamed event, if any"""
+        if self.api == 'anthropic':
+            return event.get('delta', {}).get('text') if event.get('type') == 'content_block_delta' else None
+        choices = event.get('choices')
+        return choices[0].get('delta', {}).get('content') if choices else None
+
+    async def call(self, messages: List[dict], max_tokens: int, on_text: Optional[Callable[[str], None]]) -> str:
+        """One completion; streamed (server-sent events) when on_text is given"""
+        headers, body = self.request(messages, max_tokens, on_text is not None)
+        timeout = get_timeout('llm_stream', idle=AI_STREAM_IDLE_TIMEOUT) if on_text else get_timeout('llm')
+        async with get_session().post(self.url, headers=headers, json=body, timeout=timeout) as response:
+            if response.status != 200:
+                raise ProviderError(self.name, response.status, retry_after_seconds(response.headers))
+            if not on_text:
+                return self.answer(await response.json())
+            text = ""
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                delta = self.delta(json.loads(data))
+                if delta:
+                    text += delta
+                    on_text(text)
+            return text
+
+    # ═══════════════════════════════════════════════════════════
+    # HEALTH
+    # ═══════════════════════════════════════════════════════════
+
+    def latency(self, stream: bool) -> LatencyTracker:
+        return self.first_token if stream else self.complete
+
+    def recent_outcomes(self, seconds: float = AI_HEALTH_SECONDS) -> list:
+        cutoff = time.monotonic() - seconds
+        return [answered for when, answered in self.outcomes if when >= cutoff]
+
+    def error_rate(self, seconds: float = AI_HEALTH_SECONDS) -> float:
+        outcomes = self.recent_outcomes(seconds)
+        return outcomes.count(False) / len(outcomes) if outcomes else 0.0
+
+    def state(self, now: float) -> str:
+        if not self.opened_until:
+            return 'closed'
+        return 'open' if now < self.opened_until else 'half-open'
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            'name': self.name,
+            'model': self.model,
+            'state': self.state(now),
+            'open_for': max(0.0, self.opened_until - now),
+            'calls': self.calls,
+            'errors': self.errors,
+            'cancelled': self.cancelled,
+            'trips': self.trips,
+            'error_rate': self.error_rate(),
+            'failures_in_row': self.failures_in_row,
+            'first_token': self.first_token.summary(),
+            'complete': self.complete.summary(),
+            'last_error': self.last_error
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# ROUTER
+# ═══════════════════════════════════════════════════════════════
+
+class LLMRouter:
+    """Picks, hedges and fails over between providers; owns their circuit breakers"""
+
+    def __init__(self, providers: List[Provider], expected_latency: float = AI_EXPECTED_LATENCY,
+                 hedge_min_samples: int = AI_HEDGE_MIN_SAMPLES, hedge_default_delay: float = AI_HEDGE_DEFAULT_DELAY,
+                 hedge_min_delay: float = AI_HEDGE_MIN_DELAY, breaker_error_rate: float = AI_BREAKER_ERROR_RATE,
+                 breaker_min_calls: int = AI_BREAKER_MIN_CALLS, breaker_failures: int = AI_BREAKER_FAILURES,
+                 breaker_cooldown: float = AI_BREAKER_COOLDOWN, health_seconds: float = AI_HEALTH_SECONDS):
+        self.providers = providers
+        self.health_seconds = health_seconds
+        self.expected_latency = expected_latency
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay
+        self.breaker_error_rate = breaker_error_rate
+        self.breaker_min_calls = breaker_min_calls
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.counters = {
+            'requests': 0,
+            'hedged': 0,       # A backup provider was started...
+            'hedge_wins': 0,   # ...and answered first
+            'failovers': 0,    # Next provider tried after an error
+            'failed': 0        # No provider could answer
+        }
+
+    # ═══════════════════════════════════════════════════════════
+    # CHOOSING
+    # ═══════════════════════════════════════════════════════════
+
+    def score(self, provider: Provider, stream: bool) -> float:
+        """Expected seconds to an answer, with failures making a provider look slower"""
+        tracker = provider.latency(stream)
+        latency = tracker.percentile(50) if tracker.samples else self.expected_latency
+        return latency * (1 + 3 * provider.error_rate(self.health_seconds))
+
+    def hedge_delay(self, provider: Provider, stream: bool) -> float:
+        tracker = provider.latency(stream)
+        if len(tracker.samples) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, tracker.percentile(95))
+
+    def ranked(self, stream: bool) -> List[Provider]:
+        """Providers that may be called now, healthiest first (config order breaks ties)"""
+        now = time.monotonic()
+        usable = [p for p in self.providers if p.state(now) == 'closed' or (p.state(now) == 'half-open' and not p.probing)]
+        return sorted(usable, key=lambda p: self.score(p, stream))
+
+    # ═══════════════════════════════════════════════════════════
+    # CIRCUIT BREAKER
+    # ═══════════════════════════════════════════════════════════
+
+    def _trip(self, provider: Provider, seconds: float):
+        provider.opened_until = time.monotonic() + seconds
+        provider.trips += 1
+        print(f"🔌 AI provider {provider.name} skipped for {seconds:.0f}s ({provider.last_error})")
+
+    def _succeeded(self, provider: Provider, seconds: float, stream: bool):
+        provider.probing = False
+        if provider.opened_until:
+            # Trial call worked - back in rotation with a clean slate
+            provider.opened_until = 0.0
+            provider.outcomes.clear()
+            print(f"🔌 AI provider {provider.name} is back")
+        provider.outcomes.append((time.monotonic(), True))
+        provider.failures_in_row = 0
+        if not stream:
+            provider.complete.record(seconds)
+
+    def _failed(self, provider: Provider, error: Exception):
+        provider.errors += 1
+        provider.failures_in_row += 1
+        provider.outcomes.append((time.monotonic(), False))
+        provider.last_error = str(error) or type(error).__name__
+        retry_after = getattr(error, 'retry_after', None)
+        status = getattr(error, 'status', None)
+        if provider.probing:
+            provider.probing = False
+            self._trip(provider, self.breaker_cooldown)
+        elif status == 429:
+            # Over its quota - no point asking again before it says so
+            self._trip(provider, retry_after or self.breaker_cooldown)
+        elif status == 401:
+            self._trip(provider, self.breaker_cooldown * 10)
+        elif provider.failures_in_row >= self.breaker_failures:
+            self._trip(provider, self.breaker_cooldown)
+        elif (len(provider.recent_outcomes(self.health_seconds)) >= self.breaker_min_calls
+              and provider.error_rate(self.health_seconds) > self.breaker_error_rate):
+            self._trip(provider, self.breaker_cooldown)
+
+    # ═══════════════════════════════════════════════════════════
+    # CALLING
+    # ═══════════════════════════════════════════════════════════
+
+    async def _attempt(self, provider: Provider, messages: List[dict], max_tokens: int, stream: bool,
+                       claim: Callable[[Provider, str], None]) -> str:
+        started = time.monotonic()
+        first = None
+
+        def forward(text: str):
+            nonlocal first
+            if first is None:
+                first = time.monotonic() - started
+                provider.first_token.record(first)
+            claim(provider, text)
+
+        provider.calls += 1
+        try:
+            text = await provider.call(messages, max_tokens, forward if stream else None)
+        except asyncio.CancelledError:
+            # Lost the race - says nothing about the provider's health
+            provider.cancelled += 1
+            provider.probing = False
+            raise
+        except Exception as e:
+            self._failed(provider, e)
+            raise
+        self._succeeded(provider, time.monotonic() - started, stream)
+        return text.strip()
+
+    async def complete(self, messages: List[dict], max_tokens: int,
+                       on_text: Optional[Callable[[str], None]] = None) -> tuple:
+        """
+        (answer, provider name) from the first provider to answer.
+        on_text: stream - called with the text so far, from whichever provider
+        sent words first. Raises AIProvidersUnavailable if none could answer.
+        """
+        stream = on_text is not None
+        queue = self.ranked(stream)
+        if not queue:
+            now = time.monotonic()
+            raise AIProvidersUnavailable([], min((p.opened_until - now for p in self.providers), default=0.0))
+        self.counters['requests'] += 1
+        pending = {}
+        errors = []
+        winner = None      # Streaming: the provider whose words are being shown
+        lead = None        # The provider a backup would race
+        lead_started = 0.0
+        hedged = False
+
+        def claim(provider: Provider, text: str):
+            nonlocal winner
+            if winner is None:
+                winner = provider
+                for task, other in pending.items():
+                    if other is not provider:
+                        task.cancel()
+            if winner is provider:
+                on_text(text)
+
+        def start() -> Optional[Provider]:
+            while queue:
+                provider = queue.pop(0)
+                now = time.monotonic()
+                if provider.state(now) == 'open' or provider.probing:
+                    continue   # Tripped (or already on trial) since it was ranked
+                if provider.state(now) == 'half-open':
+                    provider.probing = True
+                pending[asyncio.create_task(self._attempt(provider, messages, max_tokens, stream, claim))] = provider
+                return provider
+            return None
+
+        try:
+            lead, lead_started = start(), time.monotonic()
+            while pending:
+                timeout = None
+                if not hedged and queue and winner is None:
+                    timeout = max(0.0, lead_started + self.hedge_delay(lead, stream) - time.monotonic())
+                done, _ = await asyncio.wait(set(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if winner is None:
+                        # Slower than it usually is - race the next provider against it
+                        hedged = True
+                        if start():
+                            self.counters['hedged'] += 1
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.cancelled() or (winner is not None and winner is not provider):
+                        continue
+                    if task.exception() is None:
+                        if hedged and provider is not lead:
+                            self.counters['hedge_wins'] += 1
+                        return task.result(), provider.name
+                    errors.append(task.exception())
+                    if winner is provider:
+                        winner = None   # Died mid-stream - the next provider's text replaces it
+                if not pending and queue:
+                    lead = start()
+                    lead_started = time.monotonic()
+                    if lead:
+                        self.counters['failovers'] += 1
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self.counters['failed'] += 1
+        retry_after = min((getattr(e, 'retry_after', None) or self.breaker_cooldown for e in errors), default=0.0)
+        raise AIProvidersUnavailable(errors, retry_after)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            'providers': [provider.stats() for provider in self.providers]
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL ROUTER
+# ═══════════════════════════════════════════════════════════════
+
+llm_router = LLMRouter([
+    Provider(cfg['name'], cfg['url'], cfg['model'], cfg['key'], cfg.get('api', 'openai'))
+    for cfg in AI_PROVIDERS if cfg.get('key')
+])
+
+def get_llm_router_stats() -> dict:
+    return llm_router.stats()
+
+def format_llm_router_stats(stats: dict) -> str:
+    """Short summary for the status embed"""
+    if not stats['providers']:
+        return "no providers configured"
+    icons = {'closed': '🟢', 'half-open': '🟡', 'open': '🔴'}
+    lines = []
+    for provider in stats['providers']:
+        latency = provider['first_token'] if provider['first_token']['count'] else provider['complete']
+        line = (f"{icons[provider['state']]} **{provider['name']}** {provider['calls']} calls · "
+                f"{provider['error_rate'] * 100:.0f}% errors")
+        if latency['count']:
+            line += f" · p50 {latency['p50'] * 1000:.0f}ms p95 {latency['p95'] * 1000:.0f}ms"
+        if provider['state'] == 'open':
+            line += f" · back in {provider['open_for']:.0f}s"
+        lines.append(line)
+    lines.append(f"Hedged {stats['hedged']} (backup won {stats['hedge_wins']}) · "
+                 f"failovers {stats['failovers']} · failed {stats['failed']}")
+    return "\n".join(lines)
+
+__all__ = [
+    'Provider',
+    'LLMRouter',
+    'ProviderError',
+    'AIProvidersUnavailable',
+    'llm_router',
+    'get_llm_router_stats',
+    'format_llm_router_stats'
+]
@@ -0,0 +1,61 @@
+"""
+═══════════════════════════════════════════════════════════════
+📈 Metrics - Rolling latency percentiles and counters
+Small, dependency-free helpers used by the status commands
+═══════════════════════════════════════════════════════════════
+"""
+
+import math
+from collections import deque
+
+DEFAULT_WINDOW = 1000  # Samples kept per tracker
+
+class LatencyTracker:
+    """Keeps the last N samples and reports p50/p95/p99"""
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float):
+        """Add one sample (in seconds)"""
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile over the window, 0.0 if empty"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def summary(self) -> dict:
+        """count / avg / p50 / p95 / p99 (seconds)"""
+        if not self.samples:
+            return {'count': self.count, 'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+        ordered = sorted(self.samples)
+
+        def pick(pct):
+            return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+        return {
+            'count': self.count,
+            'avg': self.total / self.count,
+            'p50': pick(50),
+            'p95': pick(95),
+            'p99': pick(99)
+        }
+
+def format_latency(summary: dict) -> str:
+    """One-line human readable latency summary"""
+    if not summary.get('count'):
+        return "no samples yet"
+    return (
+        f"p50 {summary['p50'] * 1000:.0f}ms · p95 {summary['p95'] * 1000:.0f}ms · "
+        f"p99 {summary['p99'] * 1000:.0f}ms ({summary['count']} calls)"
+    )
+
+__all__ = ['LatencyTracker', 'format_latency']
@@ -0,0 +1,122 @@
+"""
+═══════════════════════════════════════════════════════════════
+📦 Moderation Batcher - Micro-batched, rate-limited provider calls
+Collects messages for a few ms, sends them as one request and fans
+the results back out to every waiting caller
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+from .rate_limit import TokenBucket
+
+class ProviderRateLimited(Exception):
+    """Provider answered HTTP 429"""
+
+    def __init__(self, provider: str, retry_after: float = 1.0):
+        super().__init__(f"{provider} rate limited (retry after {retry_after:.0f}s)")
+        self.provider = provider
+        self.retry_after = retry_after
+
+class MicroBatcher:
+    """
+    Queue in front of one provider.
+    handler(list_of_items) -> list_of_results (same order, same length).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 32,
+        max_wait: float = 0.02,
+        max_concurrency: int = 4,
+        bucket: Optional[TokenBucket] = None
+    ):
+        self.name = name
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.max_concurrency = max_concurrency
+        self.bucket = bucket
+        self._pending = []  # [(item, future)]
+        self._timer = None
+        self._semaphore = None
+        self._tasks = set()  # keep references so batches aren't garbage collected
+        self.batches = 0
+        self.items = 0
+        self.rate_limited = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its own result"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Cut a batch from the queue and send it in the background"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            self._pending = self._pending[self.max_batch:]
+            # Skip callers that already gave up (cancelled by the orchestrator)
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if batch:
+                task = asyncio.create_task(self._send(batch))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list):
+        """Rate-limit, call the provider, fan results out"""
+        async with self._semaphore:
+            try:
+                if self.bucket:
+                    await self.bucket.acquire()
+                # Callers that timed out while we waited shouldn't cost quota
+                batch = [(item, future) for item, future in batch if not future.done()]
+                if not batch:
+                    return
+                results = await self.handler([item for item, _ in batch])
+                self.batches += 1
+                self.items += len(batch)
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except ProviderRateLimited as e:
+                self.rate_limited += 1
+                if self.bucket:
+                    self.bucket.pause(e.retry_after)
+                self._fail(batch, e)
+            except Exception as e:
+                self._fail(batch, e)
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def stats(self) -> dict:
+        """Queue and batching counters"""
+        return {
+            'queued': len(self._pending),
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch': self.items / self.batches if self.batches else 0.0,
+            'rate_limited': self.rate_limited,
+            'bucket': self.bucket.stats() if self.bucket else None
+        }
+
+__all__ = ['MicroBatcher', 'ProviderRateLimited']
@@ -0,0 +1,218 @@
+"""
+═══════════════════════════════════════════════════════════════
+🏭 Moderation Pipeline - Worker pool behind on_message
+on_message enqueues and returns; workers classify → delete → warn → modlog
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+import discord
+from datetime import datetime
+from typing import Optional
+from config import (
+    MODERATION_WORKERS,
+    MODERATION_QUEUE_SIZE,
+    MODERATION_WARNING_SECONDS,
+    MODERATION_DRAIN_TIMEOUT
+)
+from .metrics import LatencyTracker
+from .modlog_sink import log_event
+
+class ModerationPipeline:
+    """Bounded queue + fixed pool of moderation workers"""
+
+    def __init__(self, bot, workers: int = MODERATION_WORKERS, max_queue: int = MODERATION_QUEUE_SIZE):
+        self.bot = bot
+        self.worker_count = workers
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.workers = []
+        self._shed_tasks = set()  # act() on shed messages, running in the background
+        self.accepting = True
+        self.enqueued = 0
+        self.processed = 0
+        self.flagged = 0
+        self.shed = 0
+        self.high_water = 0
+        self.queue_wait = LatencyTracker()
+        self.process_time = LatencyTracker()
+
+    # ═══════════════════════════════════════════════════════════
+    # LIFECYCLE
+    # ═══════════════════════════════════════════════════════════
+
+    def start(self):
+        """Spawn the workers (safe to call more than once)"""
+        if self.workers:
+            return
+        self.accepting = True
+        self.workers = [
+            asyncio.create_task(self._worker(i), name=f"moderation-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        print(f"🏭 Moderation pipeline started ({self.worker_count} workers)")
+
+    async def drain(self, timeout: float = MODERATION_DRAIN_TIMEOUT) -> bool:
+        """Stop accepting, let workers finish what's queued, then stop them"""
+        self.accepting = False
+        drained = True
+        if self.workers:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                drained = False
+                print(f"⚠️ Moderation queue not drained in {timeout}s ({self.queue.qsize()} left)")
+        if self._shed_tasks:
+            await asyncio.wait(self._shed_tasks, timeout=timeout)
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+        print("🏭 Moderation pipeline stopped")
+        return drained
+
+    # ═══════════════════════════════════════════════════════════
+    # INTAKE
+    # ═══════════════════════════════════════════════════════════
+
+    async def submit(self, message: discord.Message) -> bool:
+        """
+        Queue a message for moderation. Returns immediately.
+        When the queue is full only the local badword check runs (no API calls).
+        """
+        if not self.accepting:
+            return False
+        if not self.workers:
+            self.start()
+
+        try:
+            self.queue.put_nowait((time.monotonic(), message))
+        except asyncio.QueueFull:
+            self.shed += 1
+            from .moderation import check_badwords
+            verdict = check_badwords(message.content)
+            if verdict[0]:
+                # Not awaited - delete/warn/modlog would hold up on_message when we're already overloaded
+                task = asyncio.create_task(self.act(message, *verdict))
+                self._shed_tasks.add(task)
+                task.add_done_callback(self._shed_tasks.discard)
+            return False
+
+        self.enqueued += 1
+        self.high_water = max(self.high_water, self.queue.qsize())
+        return True
+
+    # ═══════════════════════════════════════════════════════════
+    # WORKERS
+    # ═══════════════════════════════════════════════════════════
+
+    async def _worker(self, index: int):
+        from . import check_message_toxicity
+
+        while True:
+            queued_at, message = await self.queue.get()
+            started = time.monotonic()
+            self.queue_wait.record(started - queued_at)
+            try:
+                is_toxic, category, confidence = await check_message_toxicity(message.content)
+                if is_toxic:
+                    await self.act(message, is_toxic, category, confidence)
+            except Exception as e:
+                print(f"❌ Moderation worker {index} error: {e}")
+            finally:
+                self.processed += 1
+                self.process_time.record(time.monotonic() - started)
+                self.queue.task_done()
+
+    async def act(self, message: discord.Message, is_toxic: bool, category: str, confidence: float):
+        """Delete → warn (auto-deleting) → modlog"""
+        self.flagged += 1
+
+        # Delete message
+        try:
+            await message.delete()
+        except:
+            pass
+
+        # Send warning to channel - Discord deletes it for us
+        try:
+            await message.channel.send(
+                f"⚠️ {message.author.mention} Your message was removed.\n"
+                f"**Reason:** {category}",
+                delete_after=MODERATION_WARNING_SECONDS
+            )
+        except:
+            pass
+
+        # Log to modlog (batched by the sink)
+        try:
+            embed = discord.Embed(
+                title="⚠️ Message Deleted",
+                description=f"**User:** {message.author.mention}\n**Channel:** {message.channel.mention}",
+                color=discord.Color.red(),
+                timestamp=datetime.utcnow()
+            )
+            embed.add_field(
+                name="Content",
+                value=f"```{message.content[:500]}```",
+                inline=False
+            )
+            embed.add_field(
+                name="Detection",
+                value=f"{category} ({confidence:.0%})",
+                inline=False
+            )
+            embed.set_footer(text=f"User ID: {message.author.id}")
+
+            log_event(self.bot, embed=embed)
+        except Exception as e:
+            print(f"⚠️ Modlog error: {e}")
+
+    # ═══════════════════════════════════════════════════════════
+    # STATS
+    # ═══════════════════════════════════════════════════════════
+
+    def stats(self) -> dict:
+        """Backpressure and throughput counters"""
+        return {
+            'workers': len(self.workers),
+            'depth': self.queue.qsize(),
+            'capacity': self.queue.maxsize,
+            'high_water': self.high_water,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'flagged': self.flagged,
+            'shed': self.shed,
+            'queue_wait': self.queue_wait.summary(),
+            'process_time': self.process_time.summary()
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL PIPELINE
+# ═══════════════════════════════════════════════════════════════
+
+_pipeline: Optional[ModerationPipeline] = None
+
+def get_pipeline(bot=None) -> Optional[ModerationPipeline]:
+    """Get (or create, when a bot is given) the shared pipeline"""
+    global _pipeline
+    if _pipeline is None and bot is not None:
+        _pipeline = ModerationPipeline(bot)
+    return _pipeline
+
+async def stop_moderation_pipeline() -> bool:
+    """Drain and stop the workers (called from /shutdown)"""
+    if _pipeline is None:
+        return True
+    return await _pipeline.drain()
+
+def get_pipeline_stats() -> dict:
+    """Stats for /modstatus (empty if the pipeline never started)"""
+    return _pipeline.stats() if _pipeline else {}
+
+__all__ = [
+    'ModerationPipeline',
+    'get_pipeline',
+    'stop_moderation_pipeline',
+    'get_pipeline_stats'
+]
@@ -5,10 +5,29 @@ Supports 100+ languages with badwords.txt + AI APIs
 ═══════════════════════════════════════════════════════════════
 """
 
-import aiohttp
-import re
+import asyncio
+import hashlib
 import os
-from typing import Tuple, Set
+from typing import List, Tuple, Set
+from config import (
+    MODERATION_LATENCY_BUDGET,
+    MODERATION_TIMEOUT_POLICY,
+    VERDICT_CACHE_SIZE,
+    VERDICT_CACHE_TTL,
+    VERDICT_CACHE_PERSIST,
+    VERDICT_CACHE_FILE,
+    MODERATION_BATCH_WINDOW,
+    MODERATION_BATCH_SIZE,
+    MODERATION_MAX_CONCURRENCY,
+    MODERATION_RATE_LIMITS
+)
+from .badword_matcher import BadwordMatcher, Match
+from .text_normalizer import fold_text, normalize_variants, normalize_variants_mapped, normalize_term
+from .http_client import get_session, get_timeout
+from .metrics import LatencyTracker
+from .ttl_cache import TTLCache
+from .rate_limit import TokenBucket
+from .mod_batcher import MicroBatcher, ProviderRateLimited
 
 PERSPECTIVE_API_KEY = os.getenv('PERSPECTIVE_API_KEY', '')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -39,16 +58,38 @@ def load_badwords() -> Set[str]:
 
 BADWORDS = load_badwords()
 
+# Compiled once, rebuilt only when the badword set changes.
+# Terms are folded like message text so "pénis" in the list still matches.
+BADWORD_MATCHER = BadwordMatcher(normalize_term(w) for w in BADWORDS)
+
+def rebuild_badword_matcher():
+    """Recompile the matcher from the current BADWORDS set"""
+    global BADWORD_MATCHER
+    BADWORD_MATCHER = BadwordMatcher(normalize_term(w) for w in BADWORDS)
+    # Cached verdicts were made with the old rules
+    VERDICT_CACHE.clear()
+
+def find_badwords(text: str) -> List[Match]:
+    """
+    Find every badword in text as (term, start, end) - checks the same
+    normalized forms as check_badwords, spans index the raw text
+    """
+    found = {}
+    for variant, offsets in normalize_variants_mapped(text):
+        for term, start, end in BADWORD_MATCHER.find_all(variant):
+            found.setdefault((term, offsets[start], offsets[end - 1] + 1), None)
+    return sorted(found, key=lambda m: (m[1], -m[2]))
+
 def check_badwords(text: str) -> Tuple[bool, str, float]:
     """Check if text contains badwords"""
     if not BADWORDS:
         return False, "N/A", 0.0
     
-    text_lower = text.lower()
-    for badword in BADWORDS:
-        pattern = r'\b' + re.escape(badword) + r'\b'
-        if re.search(pattern, text_lower, re.UNICODE):
-            return True, f"Badword: {badword}", 0.95
+    # Check the folded text and its de-obfuscated forms (leetspeak, repeats, ...)
+    for variant in normalize_variants(text):
+        match = BADWORD_MATCHER.search(variant)
+        if match:
+            return True, f"Badword: {match[0]}", 0.95
     
     return False, "Clean", 0.0
 
@@ -70,49 +111,65 @@ def detect_language(text: str) -> str:
         return 'ar'
     return 'en'
 
+def _retry_after(response) -> float:
+    """Seconds from a Retry-After header (defaults to 1s)"""
+    try:
+        return max(1.0, float(response.headers.get('Retry-After', 1)))
+    except (TypeError, ValueError):
+        return 1.0
+
 # ═══════════════════════════════════════════════════════════════
 # PERSPECTIVE API
 # ═══════════════════════════════════════════════════════════════
 
+async def query_perspective_api(text: str) -> Tuple[bool, str, float]:
+    """Call Perspective API - raises on timeout/network errors"""
+    language = detect_language(text)
+    session = get_session()
+    async with session.post(
+        "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze",
+        params={"key": PERSPECTIVE_API_KEY},
+        json={
+            "comment": {"text": text},
+            "languages": [language],
+            "requestedAttributes": {
+                "TOXICITY": {},
+                "SEVERE_TOXICITY": {},
+                "THREAT": {}
+            },
+            "doNotStore": True
+        },
+        timeout=get_timeout('perspective')
+    ) as response:
+        if response.status == 429:
+            raise ProviderRateLimited('perspective', _retry_after(response))
+        response.raise_for_status()   # An error page is no verdict
+        if response.status == 200:
+            data = await response.json()
+            scores = data.get('attributeScores', {})
+            
+            # AGGRESSIVE THRESHOLDS - Catches more!
+            severe = scores.get('SEVERE_TOXICITY', {}).get('summaryScore', {}).get('value', 0)
+            if severe > 0.5:  # Lowered from 0.7
+                return True, f"Severe toxicity ({language})", severe
+            
+            threat = scores.get('THREAT', {}).get('summaryScore', {}).get('value', 0)
+            if threat > 0.6:  # Lowered from 0.8
+                return True, f"Threat ({language})", threat
+            
+            toxicity = scores.get('TOXICITY', {}).get('summaryScore', {}).get('value', 0)
+            if toxicity > 0.75:  # Lowered from 0.85
+                return True, f"Toxicity ({language})", toxicity
+    
+    return False, "Clean", 0.0
+
 async def check_perspective_api(text: str) -> Tuple[bool, str, float]:
     """Check text using Perspective API"""
     if not PERSPECTIVE_API_KEY:
         return False, "N/A", 0.0
     
     try:
-        language = detect_language(text)
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://commentanalyzer.googleapis.com/v1alpha1/comments:analyze",
-                params={"key": PERSPECTIVE_API_KEY},
-                json={
-                    "comment": {"text": text},
-                    "languages": [language],
-                    "requestedAttributes": {
-                        "TOXICITY": {},
-                        "SEVERE_TOXICITY": {},
-                        "THREAT": {}
-                    },
-                    "doNotStore": True
-                },
-                timeout=aiohttp.ClientTimeout(total=8)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    scores = data.get('attributeScores', {})
-                    
-                    # AGGRESSIVE THRESHOLDS - Catches more!
-                    severe = scores.get('SEVERE_TOXICITY', {}).get('summaryScore', {}).get('value', 0)
-                    if severe > 0.5:  # Lowered from 0.7
-                        return True, f"Severe toxicity ({language})", severe
-                    
-                    threat = scores.get('THREAT', {}).get('summaryScore', {}).get('value', 0)
-                    if threat > 0.6:  # Lowered from 0.8
-                        return True, f"Threat ({language})", threat
-                    
-                    toxicity = scores.get('TOXICITY', {}).get('summaryScore', {}).get('value', 0)
-                    if toxicity > 0.75:  # Lowered from 0.85
-                        return True, f"Toxicity ({language})", toxicity
+        return await query_perspective_api(text)
     except Exception as e:
         print(f"⚠️ Perspective error: {e}")
     
@@ -122,66 +179,247 @@ async def check_perspective_api(text: str) -> Tuple[bool, str, float]:
 # OPENAI MODERATION
 # ═══════════════════════════════════════════════════════════════
 
+async def query_openai_moderation_batch(texts: List[str]) -> List[Tuple[bool, str, float]]:
+    """Call OpenAI Moderation API with many inputs at once - raises on timeout/429"""
+    session = get_session()
+    async with session.post(
+        "https://api.openai.com/v1/moderations",
+        headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        },
+        json={"input": texts},
+        timeout=get_timeout('openai')
+    ) as response:
+        if response.status == 429:
+            raise ProviderRateLimited('openai', _retry_after(response))
+        response.raise_for_status()   # An error page is no verdict
+        
+        verdicts = [(False, "Clean", 0.0)] * len(texts)
+        if response.status == 200:
+            data = await response.json()
+            
+            for i, (text, result) in enumerate(zip(texts, data['results'])):
+                if result['flagged']:
+                    categories = result['categories']
+                    scores = result['category_scores']
+                    flagged = [c for c, f in categories.items() if f]
+                    
+                    if flagged:
+                        highest = max(flagged, key=lambda x: scores[x])
+                        score = scores[highest]
+                        lang = detect_language(text)
+                        verdicts[i] = (True, f"{highest} ({lang})", score)
+    
+    return verdicts
+
+async def query_openai_moderation(text: str) -> Tuple[bool, str, float]:
+    """Call OpenAI Moderation API for one text - raises on timeout/429"""
+    return (await query_openai_moderation_batch([text]))[0]
+
 async def check_openai_moderation(text: str) -> Tuple[bool, str, float]:
     """Check text using OpenAI Moderation API"""
     if not OPENAI_API_KEY:
         return False, "N/A", 0.0
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/moderations",
-                headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "Content-Type": "application/json"
-                },
-                json={"input": text},
-                timeout=aiohttp.ClientTimeout(total=8)
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result = data['results'][0]
-                    
-                    if result['flagged']:
-                        categories = result['categories']
-                        scores = result['category_scores']
-                        flagged = [c for c, f in categories.items() if f]
-                        
-                        if flagged:
-                            highest = max(flagged, key=lambda x: scores[x])
-                            score = scores[highest]
-                            lang = detect_language(text)
-                            return True, f"{highest} ({lang})", score
+        return await query_openai_moderation(text)
     except Exception as e:
         print(f"⚠️ OpenAI error: {e}")
     
     return False, "Clean", 0.0
 
+# ═══════════════════════════════════════════════════════════════
+# REMOTE ORCHESTRATOR (all providers in parallel)
+# ═══════════════════════════════════════════════════════════════
+
+async def _perspective_batch(texts: List[str]) -> List[Tuple[bool, str, float]]:
+    """Perspective has no batch endpoint - one text per request"""
+    return [await query_perspective_api(texts[0])]
+
+def _make_batcher(name: str, handler, max_batch: int) -> MicroBatcher:
+    rate, burst = MODERATION_RATE_LIMITS.get(name, (1.0, 1))
+    return MicroBatcher(
+        name,
+        handler,
+        max_batch=max_batch,
+        max_wait=MODERATION_BATCH_WINDOW,
+        max_concurrency=MODERATION_MAX_CONCURRENCY,
+        bucket=TokenBucket(rate, burst)
+    )
+
+# One queue per provider - rate limited, OpenAI batched
+PROVIDER_BATCHERS = {
+    'perspective': _make_batcher('perspective', _perspective_batch, max_batch=1),
+    'openai': _make_batcher('openai', query_openai_moderation_batch, max_batch=MODERATION_BATCH_SIZE)
+}
+
+# name -> raising query function
+REMOTE_PROVIDERS = {name: batcher.submit for name, batcher in PROVIDER_BATCHERS.items()}
+
+provider_latency = {name: LatencyTracker() for name in REMOTE_PROVIDERS}
+provider_timeouts = {name: 0 for name in REMOTE_PROVIDERS}
+provider_errors = {name: 0 for name in REMOTE_PROVIDERS}
+
+def get_enabled_providers() -> List[str]:
+    """Remote providers that have an API key"""
+    enabled = []
+    if PERSPECTIVE_API_KEY:
+        enabled.append('perspective')
+    if OPENAI_API_KEY:
+        enabled.append('openai')
+    return enabled
+
+async def _timed_query(name: str, text: str) -> Tuple[bool, str, float]:
+    """Run one provider and record its latency (cancelled runs aren't recorded)"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        result = await REMOTE_PROVIDERS[name](text)
+    except (asyncio.TimeoutError, ProviderRateLimited):
+        provider_timeouts[name] += 1
+        provider_latency[name].record(loop.time() - start)
+        raise
+    except Exception:
+        provider_errors[name] += 1
+        raise
+    provider_latency[name].record(loop.time() - start)
+    return result
+
+async def check_remote_providers(text: str, providers: List[str] = None) -> Tuple[bool, str, float]:
+    """
+    Fire every enabled provider at once.
+    Returns as soon as one flags the message (cancelling the rest) or all
+    of them clear it. Providers that time out, get rate limited (429), or
+    are still running when MODERATION_LATENCY_BUDGET runs out, follow
+    MODERATION_TIMEOUT_POLICY.
+    """
+    return (await remote_verdict(text, providers))[0]
+
+async def remote_verdict(text: str, providers: List[str] = None) -> Tuple[Tuple[bool, str, float], bool]:
+    """(verdict, answered) - answered is False if any provider gave no verdict (fail-open/closed)"""
+    providers = get_enabled_providers() if providers is None else providers
+    if not providers:
+        return (False, "Clean", 0.0), True
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + MODERATION_LATENCY_BUDGET
+    tasks = {asyncio.create_task(_timed_query(name, text)): name for name in providers}
+    pending = set(tasks)
+    timed_out = []
+    failed = []
+    
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    result = task.result()
+                except (asyncio.TimeoutError, ProviderRateLimited):
+                    timed_out.append(name)
+                    continue
+                except Exception as e:
+                    print(f"⚠️ {name} moderation error: {e}")
+                    failed.append(name)
+                    continue
+                
+                if result[0]:
+                    return result, True
+        
+        # Budget ran out with providers still running
+        for task in pending:
+            provider_timeouts[tasks[task]] += 1
+            timed_out.append(tasks[task])
+    finally:
+        for task in pending:
+            task.cancel()
+    
+    if timed_out and MODERATION_TIMEOUT_POLICY == 'closed':
+        return (True, f"Moderation unavailable ({', '.join(timed_out)})", 0.0), False
+    
+    return (False, "Clean", 0.0), not (timed_out or failed)
+
+def get_batcher_stats() -> dict:
+    """Queue/batch/rate-limit counters per provider"""
+    return {name: batcher.stats() for name, batcher in PROVIDER_BATCHERS.items()}
+
+def get_provider_latency_stats() -> dict:
+    """p50/p95/p99 per remote provider"""
+    stats = {}
+    for name, tracker in provider_latency.items():
+        stats[name] = tracker.summary()
+        stats[name]['timeouts'] = provider_timeouts[name]
+        stats[name]['errors'] = provider_errors[name]
+    return stats
+
+# ═══════════════════════════════════════════════════════════════
+# VERDICT CACHE
+# ═══════════════════════════════════════════════════════════════
+
+VERDICT_CACHE = TTLCache(VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL)
+
+def verdict_key(text: str) -> str:
+    """Cache key - hash of the normalized text, so "LOL" and "lol" share a verdict"""
+    return hashlib.sha1(fold_text(text).encode('utf-8')).hexdigest()
+
+def rules_fingerprint() -> str:
+    """Hash of the badword set - a saved cache is only reused if this matches"""
+    return hashlib.sha1('\n'.join(sorted(BADWORDS)).encode('utf-8')).hexdigest()
+
+def save_verdict_cache() -> bool:
+    """Persist the cache for a warm start (called from /shutdown)"""
+    if not VERDICT_CACHE_PERSIST:
+        return False
+    return VERDICT_CACHE.save(VERDICT_CACHE_FILE, tag=rules_fingerprint())
+
+def load_verdict_cache() -> int:
+    """Warm the cache from disk"""
+    if not VERDICT_CACHE_PERSIST:
+        return 0
+    loaded = VERDICT_CACHE.load(VERDICT_CACHE_FILE, tag=rules_fingerprint())
+    if loaded:
+        print(f"✅ Loaded {loaded} cached moderation verdicts")
+    return loaded
+
+def get_verdict_cache_stats() -> dict:
+    """Hit/miss counters for /modstatus"""
+    return VERDICT_CACHE.stats()
+
 # ═══════════════════════════════════════════════════════════════
 # MAIN FUNCTION
 # ═══════════════════════════════════════════════════════════════
 
-async def check_message_toxicity(text: str) -> Tuple[bool, str, float]:
-    """Multi-layer moderation check"""
+async def check_message_toxicity(text: str, badwords: bool = True) -> Tuple[bool, str, float]:
+    """
+    Multi-layer moderation check
+    badwords=False skips layer 1 (the caller already ran it, or the chat filter is off)
+    """
+    
+    # Layer 0: same text seen recently
+    key = verdict_key(text)
+    cached = VERDICT_CACHE.get(key)
+    if cached is not None and (badwords or not cached[1].startswith("Badword")):
+        return tuple(cached)
     
     # Layer 1: badwords.txt (instant)
-    is_toxic, category, confidence = check_badwords(text)
-    if is_toxic:
-        return is_toxic, category, confidence
+    verdict = check_badwords(text) if badwords else (False, "Clean", 0.0)
+    answered = True
     
-    # Layer 2: Perspective API
-    if PERSPECTIVE_API_KEY:
-        is_toxic, category, confidence = await check_perspective_api(text)
-        if is_toxic:
-            return is_toxic, category, confidence
+    # Layer 2: Perspective + OpenAI in parallel
+    if not verdict[0]:
+        verdict, answered = await remote_verdict(text)
     
-    # Layer 3: OpenAI
-    if OPENAI_API_KEY:
-        is_toxic, category, confidence = await check_openai_moderation(text)
-        if is_toxic:
-            return is_toxic, category, confidence
+    # Only remember real verdicts - a provider that timed out, was rate limited
+    # or errored may flag the same text once it's back (raid spam repeats)
+    if answered:
+        VERDICT_CACHE.put(key, verdict)
     
-    return False, "Clean", 0.0
+    return verdict
 
 # ═══════════════════════════════════════════════════════════════
 # UTILITY FUNCTIONS
@@ -191,14 +429,18 @@ def reload_badwords() -> int:
     """Reload badwords from file"""
     global BADWORDS
     BADWORDS = load_badwords()
+    rebuild_badword_matcher()
     return len(BADWORDS)
 
 def add_badword(word: str) -> bool:
     """Add a word to badwords list"""
     try:
+        if word.lower() in BADWORDS:
+            return True
         with open(BADWORDS_FILE, 'a', encoding='utf-8') as f:
             f.write(f"\n{word.lower()}")
         BADWORDS.add(word.lower())
+        rebuild_badword_matcher()
         return True
     except:
         return False
@@ -212,7 +454,9 @@ def remove_badword(word: str) -> bool:
             for line in lines:
                 if line.strip().lower() != word.lower():
                     f.write(line)
-        BADWORDS.discard(word.lower())
+        if word.lower() in BADWORDS:
+            BADWORDS.discard(word.lower())
+            rebuild_badword_matcher()
         return True
     except:
         return False
@@ -231,3 +475,6 @@ def get_moderation_status() -> str:
     if OPENAI_API_KEY:
         parts.append("✅ OpenAI")
     return " | ".join(parts) if parts else "❌ Not configured"
+
+# Warm start from the last shutdown
+load_verdict_cache()
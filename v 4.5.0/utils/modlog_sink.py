@@ -0,0 +1,200 @@
+"""
+═══════════════════════════════════════════════════════════════
+📮 Modlog Sink - Batched, rate-limited writes to the modlog channel
+Buffers events, packs up to 10 embeds per message, keeps order and
+spills to an append-only file when Discord throttles us
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from datetime import datetime
+from typing import Optional
+import discord
+from config import (
+    MODLOG_CHANNEL_ID,
+    MODLOG_FLUSH_INTERVAL,
+    MODLOG_MAX_BUFFER,
+    MODLOG_RATE_LIMIT,
+    MODLOG_OVERFLOW_FILE
+)
+from .rate_limit import TokenBucket
+
+MAX_EMBEDS_PER_MESSAGE = 10    # Discord limit
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+
+class ModlogSink:
+    """Ordered buffer of modlog events flushed in packed messages"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.buffer = deque()  # ('embed', Embed) / ('text', str), in arrival order
+        self.bucket = TokenBucket(*MODLOG_RATE_LIMIT)
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._lock = asyncio.Lock()
+        self._closing = False
+        self.events = 0
+        self.messages_sent = 0
+        self.spilled = 0
+
+    # ═══════════════════════════════════════════════════════════
+    # INTAKE
+    # ═══════════════════════════════════════════════════════════
+
+    def add(self, embed: discord.Embed = None, content: str = None):
+        """Queue an embed or a text line (never blocks)"""
+        if embed is not None:
+            self.buffer.append(('embed', embed))
+        if content:
+            self.buffer.append(('text', content))
+        self.events += 1
+
+        # Too far behind - oldest events go to disk so memory stays bounded
+        while len(self.buffer) > MODLOG_MAX_BUFFER:
+            self._spill([self.buffer.popleft()], reason="buffer full")
+
+        self._ensure_running()
+        if len(self.buffer) >= MAX_EMBEDS_PER_MESSAGE:
+            self._wakeup.set()
+
+    def _ensure_running(self):
+        if not self._closing and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="modlog-sink")
+
+    # ═══════════════════════════════════════════════════════════
+    # FLUSHING
+    # ═══════════════════════════════════════════════════════════
+
+    async def _run(self):
+        """Flush every MODLOG_FLUSH_INTERVAL seconds, or early when a message is full"""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=MODLOG_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _next_batch(self) -> list:
+        """Take the next run of same-kind events that fits in one message"""
+        batch = []
+        kind = self.buffer[0][0]
+        size = 0
+        while self.buffer and self.buffer[0][0] == kind:
+            item = self.buffer[0][1]
+            if kind == 'embed':
+                if len(batch) >= MAX_EMBEDS_PER_MESSAGE or (batch and size + len(item) > MAX_EMBED_CHARS_PER_MESSAGE):
+                    break
+                size += len(item)
+            else:
+                item = item[:MAX_CONTENT_CHARS]
+                if batch and size + len(item) + 1 > MAX_CONTENT_CHARS:
+                    break
+                size += len(item) + 1
+            self.buffer.popleft()
+            # Send what was measured - an over-long line goes out cut, not whole
+            batch.append((kind, item))
+        return batch
+
+    async def flush(self):
+        """Send everything buffered, in order"""
+        async with self._lock:
+            while self.buffer:
+                channel = self.bot.get_channel(MODLOG_CHANNEL_ID)
+                batch = self._next_batch()
+
+                if not channel:
+                    self._spill(batch, reason="modlog channel not found")
+                    continue
+
+                try:
+                    await self.bucket.acquire()
+                    if batch[0][0] == 'embed':
+                        await channel.send(embeds=[embed for _, embed in batch])
+                    else:
+                        await channel.send("\n".join(text for _, text in batch))
+                    self.messages_sent += 1
+                except asyncio.CancelledError:
+                    # Stopped mid-send - the batch is out of the buffer, keep it on disk
+                    self._spill(batch, reason="cancelled while sending")
+                    raise
+                except discord.HTTPException as e:
+                    # Throttled or rejected - keep the record on disk
+                    retry_after = getattr(e, 'retry_after', None)
+                    if e.status == 429:
+                        self.bucket.pause(retry_after or 5)
+                    self._spill(batch, reason=f"HTTP {e.status}")
+                except Exception as e:
+                    self._spill(batch, reason=str(e))
+
+    def _spill(self, batch: list, reason: str):
+        """Append events to the overflow file (JSON lines, never rewritten)"""
+        try:
+            os.makedirs(os.path.dirname(MODLOG_OVERFLOW_FILE) or '.', exist_ok=True)
+            with open(MODLOG_OVERFLOW_FILE, 'a', encoding='utf-8') as f:
+                for kind, item in batch:
+                    record = {
+                        'logged_at': datetime.utcnow().isoformat(),
+                        'reason': reason,
+                        'kind': kind,
+                        'data': item.to_dict() if kind == 'embed' else item
+                    }
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.spilled += len(batch)
+        except Exception as e:
+            print(f"❌ Failed to write modlog overflow ({len(batch)} events lost): {e}")
+
+    async def close(self):
+        """Flush what's left and stop (called from /shutdown)"""
+        self._closing = True
+        if self._task is not None:
+            # Let the loop finish the flush it may be in the middle of
+            self._wakeup.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            'buffered': len(self.buffer),
+            'events': self.events,
+            'messages_sent': self.messages_sent,
+            'spilled': self.spilled
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL SINK
+# ═══════════════════════════════════════════════════════════════
+
+_sink: Optional[ModlogSink] = None
+
+def get_modlog_sink(bot) -> ModlogSink:
+    """Get (or create) the shared sink"""
+    global _sink
+    if _sink is None:
+        _sink = ModlogSink(bot)
+    return _sink
+
+def log_event(bot, embed: discord.Embed = None, content: str = None):
+    """Queue a modlog event - returns immediately"""
+    get_modlog_sink(bot).add(embed=embed, content=content)
+
+async def close_modlog_sink():
+    """Flush and stop the sink"""
+    if _sink is not None:
+        await _sink.close()
+
+def get_modlog_stats() -> dict:
+    return _sink.stats() if _sink else {}
+
+__all__ = [
+    'ModlogSink',
+    'get_modlog_sink',
+    'log_event',
+    'close_modlog_sink',
+    'get_modlog_stats'
+]
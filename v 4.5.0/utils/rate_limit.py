@@ -0,0 +1,71 @@
+"""
+═══════════════════════════════════════════════════════════════
+🪣 Rate Limiting - Async token bucket
+Smooths outbound calls to stay under provider quotas
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+
+class TokenBucket:
+    """
+    Classic token bucket: `rate` tokens per second, up to `capacity`.
+    acquire() waits (it never rejects) until enough tokens are available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waits = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens if available right now, without waiting"""
+        self._refill()
+        if time.monotonic() >= self.blocked_until and self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1):
+        """Wait until `tokens` can be taken (requests are served in order)"""
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    self.waits += 1
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                self.waits += 1
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for a while (e.g. after HTTP 429 Retry-After)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    def stats(self) -> dict:
+        self._refill()
+        return {
+            'rate': self.rate,
+            'capacity': self.capacity,
+            'available': round(self.tokens, 2),
+            'waits': self.waits,
+            'paused_for': max(0.0, round(self.blocked_until - time.monotonic(), 2))
+        }
+
+__all__ = ['TokenBucket']
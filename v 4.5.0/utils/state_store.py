@@ -0,0 +1,252 @@
+"""
+═══════════════════════════════════════════════════════════════
+🗄️ State Store - In-memory JSON datasets with debounced writes
+Each dataset is read once; reads come from memory, writes mark the
+record dirty and a background writer hands them to the storage backend
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import copy
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Optional
+from config import STATE_FLUSH_DELAY
+from .storage import DATASETS, dataset_for, get_backend, open_storage, run_storage, run_storage_sync
+
+class StoreView(Mapping):
+    """
+    Read-only view of a dataset: keys, len() and `in` cost nothing,
+    each record is copied only when it is read
+    """
+
+    def __init__(self, store: 'JsonStore'):
+        self._store = store
+
+    def __getitem__(self, key: str) -> Any:
+        self._store.reads += 1
+        return copy.deepcopy(self._store.data[key])
+
+    def __iter__(self):
+        # Over a copy of the keys so writes while iterating are fine
+        return iter(list(self._store.data))
+
+    def __len__(self) -> int:
+        return len(self._store.data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._store.data
+
+class JsonStore:
+    """One dataset ({key: record}) kept in memory"""
+
+    def __init__(self, filepath: str, flush_delay: float = STATE_FLUSH_DELAY):
+        self.filepath = filepath
+        self.dataset = dataset_for(filepath)
+        self.flush_delay = flush_delay
+        self.data: Dict[str, Any] = {}
+        self.loaded = False
+        self.dirty = set()  # keys changed since the last flush
+        self._flush_task = None
+        self.reads = 0
+        self.writes = 0
+        self.flushes = 0
+
+    # ═══════════════════════════════════════════════════════════
+    # LOADING
+    # ═══════════════════════════════════════════════════════════
+
+    async def load_async(self):
+        """Read the dataset on the storage thread (preloaded from on_ready)"""
+        if self.loaded:
+            return
+        backend = await open_storage()
+        try:
+            data = await run_storage(backend.load, self.dataset)
+        except Exception as e:
+            print(f"⚠️ Failed to load {self.dataset}: {e}")
+            data = {}
+        if not self.loaded:  # A blocking read may have won the race
+            self.data = data
+            self.loaded = True
+
+    def _ensure_loaded(self):
+        # Blocking fallback for stores nobody preloaded (scripts, import time)
+        if self.loaded:
+            return
+        backend = get_backend()
+        try:
+            self.data = run_storage_sync(backend.load, self.dataset)
+        except Exception as e:
+            print(f"⚠️ Failed to load {self.dataset}: {e}")
+        self.loaded = True
+
+    # ═══════════════════════════════════════════════════════════
+    # READS (copies, so callers can't change state by accident)
+    # Records in self.data are never changed in place - writes swap in
+    # a new record - so a flush can hand them to the storage thread as is
+    # ═══════════════════════════════════════════════════════════
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._ensure_loaded()
+        self.reads += 1
+        if key in self.data:
+            return copy.deepcopy(self.data[key])
+        return default
+
+    def snapshot(self) -> StoreView:
+        """Read-only view of the whole dataset (load_json on a managed file)"""
+        self._ensure_loaded()
+        return StoreView(self)
+
+    # ═══════════════════════════════════════════════════════════
+    # WRITES
+    # ═══════════════════════════════════════════════════════════
+
+    def set(self, key: str, value: Any):
+        self._ensure_loaded()
+        self.data[key] = copy.deepcopy(value)
+        self._mark_dirty(key)
+
+    def update(self, key: str, fields: dict, default: dict = None):
+        """Merge fields into a record, creating it from default if missing"""
+        self._ensure_loaded()
+        if key in self.data:
+            record = dict(self.data[key])
+        else:
+            record = copy.deepcopy(default) if default else {}
+        record.update(copy.deepcopy(fields))
+        self.data[key] = record
+        self._mark_dirty(key)
+
+    def delete(self, key: str):
+        self._ensure_loaded()
+        if key in self.data:
+            del self.data[key]
+            self._mark_dirty(key)
+
+    def replace(self, data: dict):
+        """Swap the whole dataset (save_json on a managed file)"""
+        self._ensure_loaded()
+        old, self.data = self.data, copy.deepcopy(dict(data))
+        # Only records that actually changed get written
+        for key in old.keys() | self.data.keys():
+            if old.get(key) != self.data.get(key):
+                self._mark_dirty(key)
+
+    def _mark_dirty(self, key: str):
+        self.writes += 1
+        self.dirty.add(key)
+        self._schedule_flush()
+
+    # ═══════════════════════════════════════════════════════════
+    # FLUSHING
+    # ═══════════════════════════════════════════════════════════
+
+    def _schedule_flush(self):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (scripts, startup) - write straight away
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later(), name=f"state-flush:{self.filepath}")
+
+    async def _flush_later(self):
+        """Wait out the debounce window, then write once for every change in it"""
+        await asyncio.sleep(self.flush_delay)
+        await self.flush_async()
+
+    def _prepare(self):
+        # Runs on the loop so the backend gets a consistent snapshot -
+        # a shallow copy is enough, records are never changed in place
+        backend = get_backend()
+        keys, self.dirty = self.dirty, set()
+        return backend, keys, backend.prepare(self.dataset, dict(self.data), keys)
+
+    def _committed(self, ok: bool, keys: set) -> bool:
+        if ok:
+            self.flushes += 1
+        else:
+            # Keep the changes so the next flush retries them
+            self.dirty |= keys
+        return ok
+
+    async def flush_async(self) -> bool:
+        """Write pending changes now, on the storage thread"""
+        if not self.dirty:
+            return True
+        backend, keys, payload = self._prepare()
+        return self._committed(await run_storage(backend.commit, self.dataset, payload), keys)
+
+    def flush(self) -> bool:
+        """Write pending changes now (blocking)"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        if not self.dirty:
+            return True
+        backend, keys, payload = self._prepare()
+        return self._committed(run_storage_sync(backend.commit, self.dataset, payload), keys)
+
+    def stats(self) -> dict:
+        return {
+            'records': len(self.data),
+            'dirty': len(self.dirty),
+            'reads': self.reads,
+            'writes': self.writes,
+            'flushes': self.flushes
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL STORES (one per dataset)
+# ═══════════════════════════════════════════════════════════════
+
+_stores: Dict[str, JsonStore] = {}
+
+def get_store(filepath: str) -> JsonStore:
+    """Get (or create) the store for a file"""
+    key = os.path.normpath(filepath)
+    if key not in _stores:
+        _stores[key] = JsonStore(filepath)
+    return _stores[key]
+
+def find_store(filepath: str) -> Optional[JsonStore]:
+    """The store for a file, if it is (or should be) managed by one"""
+    if dataset_for(filepath) != filepath:
+        return get_store(filepath)
+    return _stores.get(os.path.normpath(filepath))
+
+def flush_all_stores() -> bool:
+    """Write every pending change (blocking - for code without an event loop)"""
+    ok = True
+    for store in _stores.values():
+        ok = store.flush() and ok
+    return ok
+
+async def flush_all_stores_async() -> bool:
+    """Write every pending change on the storage thread (called from /shutdown)"""
+    ok = True
+    for store in list(_stores.values()):
+        ok = await store.flush_async() and ok
+    return ok
+
+async def load_all_stores():
+    """Read every managed dataset now, so no command waits on the first read"""
+    for filepath in DATASETS.values():
+        await get_store(filepath).load_async()
+
+def get_state_stats() -> dict:
+    return {store.dataset: store.stats() for store in _stores.values()}
+
+__all__ = [
+    'StoreView',
+    'JsonStore',
+    'get_store',
+    'find_store',
+    'flush_all_stores',
+    'flush_all_stores_async',
+    'load_all_stores',
+    'get_state_stats'
+]
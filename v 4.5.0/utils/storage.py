@@ -0,0 +1,363 @@
+"""
+═══════════════════════════════════════════════════════════════
+💾 Storage - Pluggable persistence behind the state store
+JSON files (small installs) or SQLite in WAL mode with real tables
+and indexes. Every call runs on one storage thread, off the event loop.
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+from config import (
+    STORAGE_BACKEND,
+    SQLITE_DB_FILE,
+    USER_SETTINGS_FILE,
+    PROFILES_FILE,
+    LEGACY_PROFILES_FILE,
+    FAQS_FILE,
+    LEARNED_FACTS_FILE,
+    BADWORDS_JSON_FILE
+)
+
+# Dataset name -> the JSON file it has always lived in
+DATASETS = {
+    'user_settings': USER_SETTINGS_FILE,
+    'profiles': PROFILES_FILE,
+    'faqs': FAQS_FILE,
+    'learned_facts': LEARNED_FACTS_FILE,
+    'badwords': BADWORDS_JSON_FILE
+}
+
+_PATH_TO_DATASET = {os.path.normpath(path): name for name, path in DATASETS.items()}
+
+def dataset_for(filepath: str) -> str:
+    """Dataset name for a file (unknown files are their own dataset)"""
+    return _PATH_TO_DATASET.get(os.path.normpath(filepath), filepath)
+
+def path_for(dataset: str) -> str:
+    return DATASETS.get(dataset, dataset)
+
+# One thread owns all storage I/O, so writes never interleave
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+
+async def run_storage(func, *args):
+    """Run a storage call on the storage thread"""
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+
+def run_storage_sync(func, *args):
+    """Same, for code without an event loop (startup, shutdown)"""
+    return _executor.submit(func, *args).result()
+
+# ═══════════════════════════════════════════════════════════════
+# JSON BACKEND
+# ═══════════════════════════════════════════════════════════════
+
+class JsonBackend:
+    """Whole-file JSON per dataset (temp file + rename)"""
+
+    name = 'json'
+
+    def load(self, dataset: str) -> dict:
+        filepath = path_for(dataset)
+        try:
+            if os.path.exists(filepath):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            print(f"⚠️ Failed to load {filepath}: {e}")
+        return {}
+
+    def prepare(self, dataset: str, data: dict, dirty: set) -> dict:
+        """Called on the loop: the snapshot is already a copy, nothing to do"""
+        return data
+
+    def commit(self, dataset: str, payload: dict) -> bool:
+        """Serialize and write on the storage thread"""
+        filepath = path_for(dataset)
+        try:
+            text = json.dumps(payload, indent=2, ensure_ascii=False)
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, filepath)
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save {filepath}: {e}")
+            return False
+
+    def find_birthdays(self, month_day: str) -> dict:
+        return {
+            user_id: profile
+            for user_id, profile in self.load('profiles').items()
+            if profile.get('birthday') == month_day
+        }
+
+    def close(self):
+        pass
+
+# ═══════════════════════════════════════════════════════════════
+# SQLITE BACKEND
+# ═══════════════════════════════════════════════════════════════
+
+# Record datasets: table, key column, columns copied out of the record for indexing
+RECORD_TABLES = {
+    'user_settings': ('user_settings', 'user_id', ('language', 'timezone')),
+    'profiles': ('profiles', 'user_id', ('birthday', 'roblox_id')),
+    'faqs': ('faqs', 'faq_id', ('question',))
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS user_settings (
+    user_id TEXT PRIMARY KEY,
+    language TEXT,
+    timezone TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT PRIMARY KEY,
+    birthday TEXT,
+    roblox_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_profiles_birthday ON profiles(birthday);
+CREATE INDEX IF NOT EXISTS idx_profiles_roblox_id ON profiles(roblox_id);
+CREATE TABLE IF NOT EXISTS faqs (
+    faq_id TEXT PRIMARY KEY,
+    question TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS learned_facts (
+    category TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    fact TEXT NOT NULL,
+    PRIMARY KEY (category, position)
+);
+CREATE TABLE IF NOT EXISTS badwords (
+    word TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS kv (
+    dataset TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (dataset, key)
+);
+"""
+
+class SQLiteBackend:
+    """SQLite (WAL) with one table per dataset; only changed rows are written"""
+
+    name = 'sqlite'
+
+    def __init__(self, db_path: str = SQLITE_DB_FILE):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        # Only ever used from the storage thread
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # ═══════════════════════════════════════════════════════════
+    # READS
+    # ═══════════════════════════════════════════════════════════
+
+    def load(self, dataset: str) -> dict:
+        if dataset in RECORD_TABLES:
+            table, key_column, _ = RECORD_TABLES[dataset]
+            rows = self.conn.execute(f"SELECT {key_column}, data FROM {table}")
+            return {key: json.loads(data) for key, data in rows}
+
+        if dataset == 'learned_facts':
+            facts = {}
+            rows = self.conn.execute("SELECT category, fact FROM learned_facts ORDER BY category, position")
+            for category, fact in rows:
+                facts.setdefault(category, []).append(fact)
+            return facts
+
+        if dataset == 'badwords':
+            words = [word for (word,) in self.conn.execute("SELECT word FROM badwords ORDER BY word")]
+            return {'words': words} if words else {}
+
+        rows = self.conn.execute("SELECT key, data FROM kv WHERE dataset = ?", (dataset,))
+        return {key: json.loads(data) for key, data in rows}
+
+    def find_birthdays(self, month_day: str) -> dict:
+        rows = self.conn.execute("SELECT user_id, data FROM profiles WHERE birthday = ?", (month_day,))
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    # ═══════════════════════════════════════════════════════════
+    # WRITES
+    # ═══════════════════════════════════════════════════════════
+
+    def prepare(self, dataset: str, data: dict, dirty: set) -> dict:
+        """Called on the loop: copy out just the changed records (None = deleted)"""
+        return {key: json.dumps(data[key], ensure_ascii=False) if key in data else None for key in dirty}
+
+    def commit(self, dataset: str, payload: dict) -> bool:
+        try:
+            with self.conn:
+                self._apply(dataset, payload)
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save {dataset} to {self.db_path}: {e}")
+            return False
+
+    def _apply(self, dataset: str, changes: dict, full: bool = False):
+        """Write changes inside the caller's transaction (full = they replace the whole dataset)"""
+        if dataset in RECORD_TABLES:
+            table, key_column, columns = RECORD_TABLES[dataset]
+            if full:
+                self.conn.execute(f"DELETE FROM {table}")
+            placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+            upsert = f"INSERT OR REPLACE INTO {table} ({key_column}, {', '.join(columns)}, data) VALUES ({placeholders})"
+            for key, data in changes.items():
+                if data is None:
+                    self.conn.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+                    continue
+                record = json.loads(data)
+                values = [record.get(column) if isinstance(record, dict) else None for column in columns]
+                self.conn.execute(upsert, (key, *[None if v is None else str(v) for v in values], data))
+            return
+
+        if dataset == 'learned_facts':
+            if full:
+                self.conn.execute("DELETE FROM learned_facts")
+            for category, data in changes.items():
+                self.conn.execute("DELETE FROM learned_facts WHERE category = ?", (category,))
+                if data is None:
+                    continue
+                self.conn.executemany(
+                    "INSERT INTO learned_facts (category, position, fact) VALUES (?, ?, ?)",
+                    [(category, position, fact) for position, fact in enumerate(json.loads(data))]
+                )
+            return
+
+        if dataset == 'badwords':
+            words = json.loads(changes.get('words') or '[]')
+            self.conn.execute("DELETE FROM badwords")
+            self.conn.executemany("INSERT OR IGNORE INTO badwords (word) VALUES (?)", [(w,) for w in words])
+            return
+
+        if full:
+            self.conn.execute("DELETE FROM kv WHERE dataset = ?", (dataset,))
+        for key, data in changes.items():
+            if data is None:
+                self.conn.execute("DELETE FROM kv WHERE dataset = ? AND key = ?", (dataset, key))
+            else:
+                self.conn.execute("INSERT OR REPLACE INTO kv (dataset, key, data) VALUES (?, ?, ?)", (dataset, key, data))
+
+    # ═══════════════════════════════════════════════════════════
+    # MIGRATION
+    # ═══════════════════════════════════════════════════════════
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def migrate_from_json(self, force: bool = False) -> Dict[str, int]:
+        """
+        One-shot import of the old JSON files (runs once per database).
+        user_profiles.json (old birthday file) is merged under profiles.json.
+        """
+        if self.get_meta('migrated_from_json') and not force:
+            return {}
+
+        source = JsonBackend()
+        counts = {}
+        with self.conn:
+            for dataset in DATASETS:
+                data = source.load(dataset)
+                if dataset == 'profiles':
+                    legacy = source.load(LEGACY_PROFILES_FILE)
+                    data = {**legacy, **data}
+                changes = {key: json.dumps(value, ensure_ascii=False) for key, value in data.items()}
+                self._apply(dataset, changes, full=True)
+                counts[dataset] = len(data)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.utcnow().isoformat(),)
+            )
+        print(f"💾 Migrated JSON → SQLite: {counts}")
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL BACKEND
+# ═══════════════════════════════════════════════════════════════
+
+_backend = None
+
+def _open_backend():
+    if STORAGE_BACKEND == 'sqlite':
+        backend = SQLiteBackend()
+        backend.migrate_from_json()
+        return backend
+    return JsonBackend()
+
+def get_backend():
+    """Get (or open, on the storage thread) the configured backend"""
+    global _backend
+    if _backend is None:
+        _backend = run_storage_sync(_open_backend)
+        print(f"💾 Storage backend: {_backend.name}")
+    return _backend
+
+async def open_storage():
+    """Same as get_backend, without blocking the event loop (on_ready)"""
+    global _backend
+    if _backend is None:
+        backend = await run_storage(_open_backend)
+        if _backend is None:
+            _backend = backend
+            print(f"💾 Storage backend: {_backend.name}")
+    return _backend
+
+async def find_birthdays(month_day: str) -> dict:
+    """Profiles whose birthday is month_day ('MM-DD'), indexed on SQLite"""
+    from .state_store import get_store
+    # Pending profile edits must be on disk before querying it
+    await get_store(PROFILES_FILE).flush_async()
+    backend = get_backend()
+    return await run_storage(backend.find_birthdays, month_day)
+
+def close_storage():
+    """Close the backend (after the stores are flushed)"""
+    global _backend
+    if _backend is not None:
+        run_storage_sync(_backend.close)
+        _backend = None
+
+def get_storage_stats() -> dict:
+    return {'backend': _backend.name if _backend else STORAGE_BACKEND}
+
+__all__ = [
+    'DATASETS',
+    'JsonBackend',
+    'SQLiteBackend',
+    'dataset_for',
+    'run_storage',
+    'get_backend',
+    'open_storage',
+    'find_birthdays',
+    'close_storage',
+    'get_storage_stats'
+]
+
+if __name__ == "__main__":
+    # python -m utils.storage  →  migrate the JSON files into SQLite now
+    SQLiteBackend().migrate_from_json(force=True)
@@ -0,0 +1,138 @@
+"""
+═══════════════════════════════════════════════════════════════
+✍️ Streaming Reply - Shows an AI answer while it's being written
+The first words are posted as soon as they arrive; after that the
+reply is edited at most once per AI_STREAM_EDIT_INTERVAL with
+everything that came in meanwhile. Text past one Discord message
+rolls into follow-up messages.
+═══════════════════════════════════════════════════════════════
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+import discord
+from config import AI_STREAM_EDIT_INTERVAL, AI_STREAM_MESSAGE_CHARS
+from .metrics import LatencyTracker, format_latency
+
+CURSOR = " ▌"  # Shown at the end while the answer is still coming
+
+# Time from the user's message to the first words of the answer on screen
+first_visible_latency = LatencyTracker()
+stream_counters = {
+    'replies': 0,
+    'updates': 0,      # Text updates received from the stream
+    'edits': 0,        # ...of which reached Discord (the rest were coalesced)
+    'followups': 0,    # Extra messages for answers over one message
+    'errors': 0
+}
+
+def split_message(text: str, limit: int = AI_STREAM_MESSAGE_CHARS) -> List[str]:
+    """
+    Cut text into messages of at most limit chars, at a line break or
+    space where possible. A piece never changes once the text has grown
+    past it, so already-sent messages don't need editing again.
+    """
+    pieces = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit)
+        if cut < limit // 2:
+            cut = text.rfind(' ', 0, limit)
+        if cut < limit // 2:
+            cut = limit
+        pieces.append(text[:cut])
+        text = text[cut:].lstrip()
+    pieces.append(text)
+    return pieces
+
+class StreamingReply:
+    """One AI answer to a message, posted and edited as it streams in"""
+
+    def __init__(self, message: discord.Message, started: Optional[float] = None):
+        self.message = message
+        self.started = started or time.monotonic()
+        self.text = ""
+        self.sent: List[discord.Message] = []
+        self.shown: List[str] = []   # What each sent message currently says
+        self.first_visible: Optional[float] = None
+        self._changed = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._task = None
+        stream_counters['replies'] += 1
+
+    def update(self, text: str):
+        """New text from the stream (never blocks - the render loop picks up the latest)"""
+        self.text = text
+        stream_counters['updates'] += 1
+        self._changed.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._finished.is_set():
+            await self._changed.wait()
+            self._changed.clear()
+            if self._finished.is_set():
+                break
+            await self._render(self.text, final=False)
+            # Everything arriving during this pause goes out as one edit
+            try:
+                await asyncio.wait_for(self._finished.wait(), AI_STREAM_EDIT_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _render(self, text: str, final: bool):
+        pieces = split_message(text.strip() or "…")
+        for i, piece in enumerate(pieces):
+            content = piece if final or i < len(pieces) - 1 else piece + CURSOR
+            try:
+                if i < len(self.sent):
+                    if self.shown[i] != content:
+                        await self.sent[i].edit(content=content)
+                        stream_counters['edits'] += 1
+                        self.shown[i] = content
+                    continue
+                if i == 0:
+                    sent = await self.message.reply(content, mention_author=False)
+                    if self.first_visible is None:
+                        self.first_visible = time.monotonic() - self.started
+                        first_visible_latency.record(self.first_visible)
+                else:
+                    sent = await self.message.channel.send(content)
+                    stream_counters['followups'] += 1
+                self.sent.append(sent)
+                self.shown.append(content)
+            except Exception as e:
+                stream_counters['errors'] += 1
+                print(f"⚠️ Streaming reply update failed: {e}")
+                return
+
+    async def finish(self, text: str):
+        """Show the complete answer (sources included) and stop editing"""
+        self.text = text
+        self._finished.set()
+        self._changed.set()
+        if self._task is not None:
+            await self._task
+        await self._render(text, final=True)
+
+def get_stream_stats() -> dict:
+    return {
+        'first_visible': first_visible_latency.summary(),
+        **stream_counters
+    }
+
+def format_stream_stats(stats: dict) -> str:
+    """Short summary for the status embed"""
+    return (
+        f"First words after: {format_latency(stats['first_visible'])}\n"
+        f"{stats['replies']} replies · {stats['edits']} edits for {stats['updates']} updates · "
+        f"{stats['followups']} follow-ups"
+    )
+
+__all__ = [
+    'StreamingReply',
+    'split_message',
+    'get_stream_stats',
+    'format_stream_stats'
+]
@@ -0,0 +1,201 @@
+"""
+═══════════════════════════════════════════════════════════════
+🧹 Text Normalizer - Undo filter-dodging tricks before matching
+Folds homoglyphs, strips zero-width/combining marks, maps leetspeak
+and collapses repeated letters so badwords are caught locally
+═══════════════════════════════════════════════════════════════
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Tuple
+
+CACHE_SIZE = 4096  # Distinct message texts kept
+
+# ═══════════════════════════════════════════════════════════════
+# TRANSLATION TABLES (built once at import)
+# ═══════════════════════════════════════════════════════════════
+
+# Invisible characters people paste between letters
+ZERO_WIDTH_CHARS = (
+    '\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e'
+    '\u200b\u200c\u200d\u200e\u200f\u202a\u202b\u202c\u202d\u202e'
+    '\u2060\u2061\u2062\u2063\u2064\u3164\ufeff\uffa0'
+)
+
+# Look-alike letters from other scripts -> latin
+CONFUSABLES = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h',
+    'о': 'o', 'р': 'p', 'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'і': 'i',
+    'ї': 'i', 'ј': 'j', 'ѕ': 's', 'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w', 'ɡ': 'g',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'ν': 'v',
+    'ο': 'o', 'ρ': 'p', 'τ': 't', 'υ': 'u', 'χ': 'x', 'γ': 'y', 'ω': 'w',
+    # Latin look-alikes NFKD leaves alone
+    'ı': 'i', 'ł': 'l', 'ø': 'o', 'đ': 'd', 'ħ': 'h', 'ß': 'ss', 'æ': 'ae',
+    'œ': 'oe', 'ƒ': 'f', 'ʀ': 'r', 'ɪ': 'i', 'ʏ': 'y', 'ᴀ': 'a', 'ᴇ': 'e',
+    'ᴏ': 'o', 'ᴜ': 'u',
+}
+
+# Leetspeak digits/symbols -> letters (applied as a separate variant).
+# Digits only inside words that have letters ("p0rn", not "at 5 3 x"),
+# symbols only right next to a letter ("sh!t", not "7!t")
+LEET_DIGITS = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b',
+    '9': 'g',
+}
+LEET_SYMBOLS = {
+    '@': 'a', '$': 's', '!': 'i', '|': 'l', '+': 't', '€': 'e', '£': 'l',
+    '¥': 'y',
+}
+
+def _build_fold_table() -> dict:
+    """Zero-width + combining marks -> removed, confusables -> latin"""
+    table = {ord(char): None for char in ZERO_WIDTH_CHARS}
+    # Every combining mark in the BMP (accents, Zalgo stacks, ...)
+    for code in range(0x300, 0x10000):
+        if unicodedata.combining(chr(code)) or unicodedata.category(chr(code)) == 'Mn':
+            table[code] = None
+    for char, replacement in CONFUSABLES.items():
+        table[ord(char)] = replacement
+        if len(char.upper()) == 1:
+            table[ord(char.upper())] = replacement
+    return table
+
+FOLD_TABLE = _build_fold_table()
+LEET_DIGIT_TABLE = str.maketrans(LEET_DIGITS)
+
+# "f.u.c.k" / "f u c k" / "f-u-c-k" -> "fuck" (3+ single letters, same separator)
+SPACED_LETTERS = re.compile(r'\b[^\W\d_](?:([ .\-_*~])[^\W\d_])(?:\1[^\W\d_])+\b')
+WORDS = re.compile(r'[^\W_]+')
+# "!" only before a letter - after one it is just an exclamation mark
+LEET_SYMBOL = re.compile(r'(?<=[^\W\d_])[@$|+€£¥]|[@$!|+€£¥](?=[^\W\d_])')
+# Runs of 3+ only - "annal" must not become "anal"
+LONG_REPEATS = re.compile(r'(.)\1{2,}')
+WHITESPACE = re.compile(r'\s+')
+
+# ═══════════════════════════════════════════════════════════════
+# NORMALIZATION
+# ═══════════════════════════════════════════════════════════════
+
+def fold_text(text: str) -> str:
+    """
+    Base fold: compatibility-decompose (fullwidth, fancy fonts, accents),
+    drop zero-width/combining marks, map confusables, lowercase
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = text.translate(FOLD_TABLE).lower()
+    return WHITESPACE.sub(' ', text).strip()
+
+def _join_spaced(text: str) -> str:
+    """Glue letters split by a repeated separator back together"""
+    return SPACED_LETTERS.sub(lambda m: m.group(0).replace(m.group(1), ''), text)
+
+def _unleet_word(match: re.Match) -> str:
+    word = match.group(0)
+    return word.translate(LEET_DIGIT_TABLE) if any(char.isalpha() for char in word) else word
+
+def _unleet(text: str) -> str:
+    """Leetspeak -> letters, keeping plain numbers and punctuation as they are"""
+    text = WORDS.sub(_unleet_word, text)
+    # A couple of passes so symbol runs next to a letter go too ("a$$")
+    for _ in range(3):
+        unleeted = LEET_SYMBOL.sub(lambda m: LEET_SYMBOLS[m.group(0)], text)
+        if unleeted == text:
+            break
+        text = unleeted
+    return text
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_variants(text: str) -> Tuple[str, ...]:
+    """
+    All normalized forms worth matching against, most literal first.
+    Leetspeak and repeat-collapsing are separate variants so words that
+    really contain digits ("ped0") or double letters ("ass") still match.
+    """
+    base = _join_spaced(fold_text(text))
+    leet = _join_spaced(_unleet(base))
+
+    variants = []
+    for form in (base, leet):
+        for candidate in (form, LONG_REPEATS.sub(r'\1\1', form), LONG_REPEATS.sub(r'\1', form)):
+            if candidate not in variants:
+                variants.append(candidate)
+    return tuple(variants)
+
+# ═══════════════════════════════════════════════════════════════
+# NORMALIZATION WITH OFFSETS (for showing where a match is)
+# ═══════════════════════════════════════════════════════════════
+
+def _drop(text: str, offsets: list, positions) -> Tuple[str, list]:
+    """Remove characters at positions, keeping offsets in step"""
+    positions = set(positions)
+    if not positions:
+        return text, offsets
+    kept = [i for i in range(len(text)) if i not in positions]
+    return ''.join(text[i] for i in kept), [offsets[i] for i in kept]
+
+def _fold_mapped(text: str) -> Tuple[str, list]:
+    """fold_text, plus the raw index every folded character came from"""
+    chars, offsets = [], []
+    for index, char in enumerate(text):
+        for folded in unicodedata.normalize('NFKD', char).translate(FOLD_TABLE).lower():
+            if folded.isspace():
+                if not chars or chars[-1] == ' ':
+                    continue
+                folded = ' '
+            chars.append(folded)
+            offsets.append(index)
+    if chars and chars[-1] == ' ':
+        chars.pop()
+        offsets.pop()
+    return ''.join(chars), offsets
+
+def _join_spaced_mapped(text: str, offsets: list) -> Tuple[str, list]:
+    separators = (i for m in SPACED_LETTERS.finditer(text)
+                  for i in range(m.start(), m.end()) if text[i] == m.group(1))
+    return _drop(text, offsets, separators)
+
+def _collapse_mapped(text: str, offsets: list, keep: int) -> Tuple[str, list]:
+    return _drop(text, offsets, (i for m in LONG_REPEATS.finditer(text) for i in range(m.start() + keep, m.end())))
+
+def normalize_variants_mapped(text: str) -> Tuple[Tuple[str, Tuple[int, ...]], ...]:
+    """
+    normalize_variants, each variant paired with the raw-text index of
+    every character in it - so a match in a variant can be shown in the
+    original message. Slower; meant for staff tools, not every message.
+    """
+    base = _join_spaced_mapped(*_fold_mapped(text))
+    # Leetspeak swaps one character for one, offsets stay valid
+    leet = _join_spaced_mapped(_unleet(base[0]), base[1])
+
+    variants = {}
+    for form, offsets in (base, leet):
+        for candidate in ((form, offsets), _collapse_mapped(form, offsets, 2), _collapse_mapped(form, offsets, 1)):
+            variants.setdefault(candidate[0], tuple(candidate[1]))
+    return tuple(variants.items())
+
+def normalize_term(term: str) -> str:
+    """Fold a badword the same way message text is folded"""
+    return fold_text(term)
+
+def get_normalizer_stats() -> dict:
+    """Cache statistics for status commands"""
+    info = normalize_variants.cache_info()
+    total = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'size': info.currsize,
+        'hit_rate': info.hits / total if total else 0.0
+    }
+
+__all__ = [
+    'fold_text',
+    'normalize_variants',
+    'normalize_variants_mapped',
+    'normalize_term',
+    'get_normalizer_stats'
+]
@@ -0,0 +1,120 @@
+"""
+═══════════════════════════════════════════════════════════════
+⏳ TTL Cache - Bounded LRU cache with per-entry expiry
+Used for moderation verdicts (and anything else worth remembering)
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """
+    LRU cache with a size cap and a time-to-live per entry.
+    Uses wall-clock time so entries can be saved and reloaded.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value or None (expired entries count as misses)"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any, ttl: float = None):
+        """Store value, evicting the least recently used entries if full"""
+        self._data[key] = (time.time() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTENCE (optional warm start)
+    # ═══════════════════════════════════════════════════════════
+
+    def save(self, filepath: str, tag: str = "") -> bool:
+        """Write live entries to a JSON file (temp file + rename)"""
+        now = time.time()
+        entries = [
+            [key, expires_at, value]
+            for key, (expires_at, value) in self._data.items()
+            if expires_at > now
+        ]
+        try:
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'tag': tag, 'entries': entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, filepath)
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save cache {filepath}: {e}")
+            return False
+
+    def load(self, filepath: str, tag: str = "") -> int:
+        """
+        Load entries saved by save().
+        Skipped entirely if the tag differs (e.g. rules changed since).
+        """
+        try:
+            if not os.path.exists(filepath):
+                return 0
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Failed to load cache {filepath}: {e}")
+            return 0
+
+        if data.get('tag', '') != tag:
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for key, expires_at, value in data.get('entries', []):
+            if expires_at > now:
+                self._data[key] = (expires_at, value)
+                loaded += 1
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+        return loaded
+
+__all__ = ['TTLCache']
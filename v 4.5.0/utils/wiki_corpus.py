@@ -0,0 +1,330 @@
+"""
+═══════════════════════════════════════════════════════════════
+🗄️ Wiki Corpus - Page store for the scraped wikis
+One append-only body file per wiki (zlib records, read through mmap)
+plus a small title → offset index: a page is one seek, the corpus
+is never loaded whole. Replaces the all-in-one wiki_data.json.
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional
+from .wiki_index import content_hash
+
+WIKI_CORPUS_DIR = "data/wiki_corpus"
+LEGACY_WIKI_DATA_FILE = "data/wiki_data.json"  # one JSON for every wiki, migrated once
+
+RECORD_HEADER = struct.Struct("<I")  # length of the compressed record that follows
+COMPACT_DEAD_RATIO = 0.5             # Rewrite the body file once half of it is dead
+COMPACT_MIN_BYTES = 1 << 20          # ...but don't bother below 1 MB
+
+# Index entry per title (a tuple is a fraction of the size of a dict)
+OFFSET, LENGTH, URL, LAST_UPDATED, HASH, REVID = range(6)
+
+def encode_record(record: dict) -> bytes:
+    payload = zlib.compress(json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    return RECORD_HEADER.pack(len(payload)) + payload
+
+def index_entry(offset: int, length: int, page: dict) -> tuple:
+    return (offset, length, page.get("url"), page.get("last_updated", ""),
+            page.get("content_hash") or content_hash(page.get("content", "")), page.get("revid"))
+
+# ═══════════════════════════════════════════════════════════════
+# CORPUS (one wiki)
+# ═══════════════════════════════════════════════════════════════
+
+class WikiCorpus:
+    """
+    {wiki}.pages - every version of every page ever written, appended
+    {wiki}.idx.json - where the current version of each page lives
+    The body file is the source of truth: deletions are appended as
+    tombstones, so a lost or stale index is rebuilt by replaying it.
+    """
+
+    def __init__(self, wiki_key: str, directory: Optional[str] = None):
+        self.wiki_key = wiki_key
+        self.directory = directory = directory or WIKI_CORPUS_DIR
+        self.body_path = os.path.join(directory, f"{wiki_key}.pages")
+        self.index_path = os.path.join(directory, f"{wiki_key}.idx.json")
+        self.lock = threading.RLock()
+        self.pages: Dict[str, tuple] = {}
+        self.end = 0           # Bytes of the body file the index accounts for
+        self.live_bytes = 0    # ...of which belong to current page versions
+        self.compactions = 0
+        self._map: Optional[mmap.mmap] = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        self._recover()
+        self._remap()
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __contains__(self, title: str) -> bool:
+        return title in self.pages
+
+    def __iter__(self):
+        return iter(list(self.pages))
+
+    # ═══════════════════════════════════════════════════════════
+    # OPENING
+    # ═══════════════════════════════════════════════════════════
+
+    def _load_index(self):
+        try:
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.pages = {title: tuple(entry) for title, entry in data["pages"].items()}
+                self.end = data["end"]
+                self.live_bytes = sum(entry[LENGTH] + RECORD_HEADER.size for entry in self.pages.values())
+        except Exception as e:
+            print(f"⚠️ Wiki corpus index for {self.wiki_key} unreadable, rebuilding: {e}")
+            self.pages, self.end, self.live_bytes = {}, 0, 0
+
+    def _recover(self):
+        """Replay body records the index hasn't seen (crash between append and index write)"""
+        size = os.path.getsize(self.body_path) if os.path.exists(self.body_path) else 0
+        if size < self.end:
+            # Body file older than the index - can't trust either, start from the body
+            print(f"⚠️ Wiki corpus {self.wiki_key}: index ahead of body file, rebuilding")
+            self.pages, self.end, self.live_bytes = {}, 0, 0
+            if not size:
+                self._save_index()
+        if size == self.end:
+            return
+
+        replayed = 0
+        with open(self.body_path, 'r+b') as f:
+            f.seek(self.end)
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                (length,) = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                try:
+                    record = json.loads(zlib.decompress(payload))
+                except Exception:
+                    break  # Torn write at the tail
+                self._apply(record, self.end, length)
+                self.end += RECORD_HEADER.size + length
+                replayed += 1
+            # Anything past the last whole record is a half-written append
+            f.truncate(self.end)
+
+        if replayed:
+            print(f"🗄️ Wiki corpus {self.wiki_key}: replayed {replayed} records into the index")
+        self._save_index()
+
+    def _apply(self, record: dict, offset: int, length: int):
+        old = self.pages.pop(record["title"], None)
+        if old is not None:
+            self.live_bytes -= old[LENGTH] + RECORD_HEADER.size
+        if not record.get("deleted"):
+            self.pages[record["title"]] = index_entry(offset, length, record)
+            self.live_bytes += length + RECORD_HEADER.size
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self.end:
+            with open(self.body_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _save_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"end": self.end, "pages": self.pages}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    # ═══════════════════════════════════════════════════════════
+    # READS
+    # ═══════════════════════════════════════════════════════════
+
+    def get(self, title: str) -> Optional[dict]:
+        """The full page record (content, images...) - one mmap slice"""
+        with self.lock:
+            entry = self.pages.get(title)
+            if entry is None:
+                return None
+            start = entry[OFFSET] + RECORD_HEADER.size
+            payload = self._map[start:start + entry[LENGTH]]
+        return json.loads(zlib.decompress(payload))
+
+    def meta(self, title: str) -> Optional[dict]:
+        """Title, URL, last_updated, content_hash and revid, without touching the body file"""
+        entry = self.pages.get(title)
+        if entry is None:
+            return None
+        return {
+            "title": title,
+            "url": entry[URL],
+            "last_updated": entry[LAST_UPDATED],
+            "content_hash": entry[HASH],
+            "revid": entry[REVID]
+        }
+
+    def titles(self) -> List[str]:
+        return list(self.pages)
+
+    def metadata(self) -> Dict[str, dict]:
+        """meta() for every page (what the search index needs to spot changes)"""
+        with self.lock:
+            return {title: self.meta(title) for title in self.pages}
+
+    def last_updated(self) -> str:
+        return max((entry[LAST_UPDATED] for entry in self.pages.values()), default="")
+
+    # ═══════════════════════════════════════════════════════════
+    # WRITES
+    # ═══════════════════════════════════════════════════════════
+
+    def update(self, pages: Dict[str, dict], deleted: Iterable[str] = ()) -> bool:
+        """Append new page versions and tombstones, then point the index at them"""
+        deleted = [title for title in deleted if title in self.pages]
+        if not pages and not deleted:
+            return True
+        try:
+            with self.lock:
+                records = list(pages.values()) + [{"title": title, "deleted": True} for title in deleted]
+                with open(self.body_path, 'ab') as f:
+                    offset = self.end
+                    for record in records:
+                        data = encode_record(record)
+                        f.write(data)
+                        self._apply(record, offset, len(data) - RECORD_HEADER.size)
+                        offset += len(data)
+                    f.flush()
+                    # Body on disk before the index that points into it
+                    os.fsync(f.fileno())
+                self.end = offset
+                self._remap()
+                self._save_index()
+                if self.needs_compaction():
+                    self.compact()
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save wiki corpus {self.wiki_key}: {e}")
+            return False
+
+    def needs_compaction(self) -> bool:
+        dead = self.end - self.live_bytes
+        return self.end >= COMPACT_MIN_BYTES and dead > self.end * COMPACT_DEAD_RATIO
+
+    def compact(self) -> bool:
+        """Rewrite the body file with only the current version of each page"""
+        with self.lock:
+            if self._map is None:
+                return False
+            tmp_path = f"{self.body_path}.tmp"
+            pages = {}
+            offset = 0
+            with open(tmp_path, 'wb') as f:
+                for title in sorted(self.pages):
+                    entry = self.pages[title]
+                    f.write(self._map[entry[OFFSET]:entry[OFFSET] + RECORD_HEADER.size + entry[LENGTH]])
+                    pages[title] = (offset,) + entry[LENGTH:]
+                    offset += RECORD_HEADER.size + entry[LENGTH]
+                f.flush()
+                os.fsync(f.fileno())
+
+            # The old file is still mapped (Windows won't replace it otherwise)
+            self._map.close()
+            self._map = None
+            os.replace(tmp_path, self.body_path)
+            # Index last: a crash before this leaves it ahead of the new body → rebuilt on open
+            self.pages, self.end, self.live_bytes = pages, offset, offset
+            self._save_index()
+            self._remap()
+            self.compactions += 1
+            print(f"🗄️ Wiki corpus {self.wiki_key} compacted: {len(pages)} pages, {offset // 1024} KB")
+            return True
+
+    def stats(self) -> dict:
+        index_bytes = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        return {
+            'pages': len(self.pages),
+            'bytes': self.end,
+            'dead_bytes': self.end - self.live_bytes,
+            'index_bytes': index_bytes,
+            'compactions': self.compactions,
+            'last_updated': self.last_updated()
+        }
+
+    def close(self):
+        with self.lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL CORPORA
+# ═══════════════════════════════════════════════════════════════
+
+_corpora: Dict[str, WikiCorpus] = {}
+_corpora_lock = threading.Lock()
+
+def migrate_wiki_data(path: str, directory: str) -> int:
+    """Move a legacy wiki_data.json into per-wiki corpora (one-off, keeps a .migrated copy)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            wiki_data = json.load(f)
+    except Exception as e:
+        print(f"⚠️ Failed to read {path} for migration: {e}")
+        return 0
+
+    migrated = 0
+    for wiki_key, pages in wiki_data.items():
+        corpus = WikiCorpus(wiki_key, directory)
+        pages = {title: {**page, "title": page.get("title", title)} for title, page in pages.items()}
+        if corpus.update(pages):
+            migrated += len(pages)
+        corpus.close()
+
+    os.replace(path, f"{path}.migrated")
+    print(f"🗄️ Migrated {migrated} wiki pages from {path} to {directory}")
+    return migrated
+
+def _migrate_legacy():
+    # Only before any corpus is open - migration writes through its own instances
+    if not _corpora and os.path.exists(LEGACY_WIKI_DATA_FILE):
+        migrate_wiki_data(LEGACY_WIKI_DATA_FILE, WIKI_CORPUS_DIR)
+
+def get_corpus(wiki_key: str) -> WikiCorpus:
+    """The corpus for one wiki (opened on first use; safe from any thread)"""
+    with _corpora_lock:
+        if wiki_key not in _corpora:
+            _migrate_legacy()
+            _corpora[wiki_key] = WikiCorpus(wiki_key, WIKI_CORPUS_DIR)
+        return _corpora[wiki_key]
+
+def list_corpora() -> List[str]:
+    """Wikis that have a corpus on disk"""
+    with _corpora_lock:
+        _migrate_legacy()
+    if not os.path.isdir(WIKI_CORPUS_DIR):
+        return []
+    return sorted(name[:-len(".pages")] for name in os.listdir(WIKI_CORPUS_DIR) if name.endswith(".pages"))
+
+def close_corpora():
+    """Unmap every corpus (called from /shutdown)"""
+    with _corpora_lock:
+        for corpus in _corpora.values():
+            corpus.close()
+        _corpora.clear()
+
+__all__ = [
+    'WikiCorpus',
+    'get_corpus',
+    'list_corpora',
+    'migrate_wiki_data',
+    'close_corpora'
+]
@@ -9,9 +9,23 @@ import aiohttp
 import asyncio
 import json
 import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from html import unescape
 from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from config import WIKI_MERGE_BATCH
+from .ai_cache import invalidate_responses
+from .crawl_scheduler import CrawlError, crawl, get_budget
+from .http_client import get_session
+from .storage import run_storage
+from .wiki_corpus import WikiCorpus, get_corpus, list_corpora
+from .wiki_journal import CrawlJournal, get_journal
+from .wiki_index import get_wiki_index, get_wiki_index_stats, update_wiki_index, content_hash
+from .wiki_vectors import update_wiki_vectors
 
 # ═══════════════════════════════════════════════════════════════
 # CONFIGURATION
@@ -30,33 +44,76 @@ WIKIS = {
     }
 }
 
-WIKI_DATA_FILE = "data/wiki_data.json"
-RATE_LIMIT_DELAY = 0.5  # Seconds between requests
+WIKI_SYNC_FILE = "data/wiki_sync.json"  # recentchanges watermark per wiki
+WIKI_STATS_FILE = "data/wiki_stats.json"  # /wikiinfo manifest, rewritten by every crawl
+BATCH_SIZE = 50  # Titles per query (MediaWiki's limit without apihighlimits)
+PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # HTML/wikitext → text processes
 CACHE_DURATION_DAYS = 30  # Re-scrape pages older than this
+RECENTCHANGES_MAX_AGE_DAYS = 80  # MediaWiki keeps ~90 days; older watermark → full sync
+CRAWL_HISTORY = 10  # Past crawls kept per wiki in the stats manifest
 
 # ═══════════════════════════════════════════════════════════════
 # HELPER FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
-def load_wiki_data() -> dict:
-    """Load cached wiki data"""
+# fetch_wiki runs for several wikis at once; they share the sync file and the index
+_save_lock = asyncio.Lock()
+_merge_locks: Dict[str, asyncio.Lock] = {}  # one journal → corpus merge per wiki at a time
+
+def load_sync_state() -> dict:
+    """Load {wiki_key: {"watermark": timestamp, ...}}"""
+    try:
+        if os.path.exists(WIKI_SYNC_FILE):
+            with open(WIKI_SYNC_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Failed to load wiki sync state: {e}")
+    return {}
+
+def save_sync_state(state: dict) -> bool:
+    """Save sync state (temp file + rename)"""
+    try:
+        os.makedirs(os.path.dirname(WIKI_SYNC_FILE), exist_ok=True)
+        tmp_path = f"{WIKI_SYNC_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, WIKI_SYNC_FILE)
+        return True
+    except Exception as e:
+        print(f"⚠️ Failed to save wiki sync state: {e}")
+        return False
+
+def load_wiki_stats() -> dict:
+    """Load the stats manifest ({wiki_key: {...}, "index": {...}})"""
     try:
-        if os.path.exists(WIKI_DATA_FILE):
-            with open(WIKI_DATA_FILE, 'r', encoding='utf-8') as f:
+        if os.path.exists(WIKI_STATS_FILE):
+            with open(WIKI_STATS_FILE, 'r', encoding='utf-8') as f:
                 return json.load(f)
     except Exception as e:
-        print(f"⚠️ Failed to load wiki data: {e}")
+        print(f"⚠️ Failed to load wiki stats: {e}")
     return {}
 
-def save_wiki_data(data: dict) -> bool:
-    """Save wiki data to file"""
+def save_wiki_stats(stats: dict) -> bool:
+    """Save the stats manifest (temp file + rename)"""
     try:
-        os.makedirs(os.path.dirname(WIKI_DATA_FILE), exist_ok=True)
-        with open(WIKI_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.makedirs(os.path.dirname(WIKI_STATS_FILE), exist_ok=True)
+        tmp_path = f"{WIKI_STATS_FILE}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        os.replace(tmp_path, WIKI_STATS_FILE)
         return True
     except Exception as e:
-        print(f"⚠️ Failed to save wiki data: {e}")
+        print(f"⚠️ Failed to save wiki stats: {e}")
+        return False
+
+def watermark_usable(watermark: Optional[str]) -> bool:
+    """recentchanges only goes back so far - past that, do a full sync"""
+    if not watermark:
+        return False
+    try:
+        stamp = datetime.strptime(watermark, "%Y-%m-%dT%H:%M:%SZ")
+        return datetime.utcnow() - stamp < timedelta(days=RECENTCHANGES_MAX_AGE_DAYS)
+    except ValueError:
         return False
 
 def should_update_page(page_data: dict) -> bool:
@@ -71,51 +128,409 @@ def should_update_page(page_data: dict) -> bool:
     except:
         return True
 
+# ═══════════════════════════════════════════════════════════════
+# CRAWL STATS (the manifest /wikiinfo reads)
+# ═══════════════════════════════════════════════════════════════
+
+_running: Dict[str, dict] = {}  # wiki_key → crawl in progress in this process
+
+def crawl_started(wiki_key: str, mode: str, resumed: bool):
+    """Note a crawl in the manifest (a crash leaves it 'running' → shown as interrupted)"""
+    budget = get_budget(WIKIS[wiki_key]["api_url"])
+    _running[wiki_key] = {
+        'clock': time.monotonic(),
+        'budget': budget.stats()
+    }
+    stats = load_wiki_stats()
+    stats.setdefault(wiki_key, {})["crawl"] = {
+        "state": "running",
+        "mode": mode,
+        "started": datetime.utcnow().isoformat(),
+        "resumed": resumed
+    }
+    save_wiki_stats(stats)
+
+def crawl_finished(wiki_key: str, corpus: Optional[WikiCorpus] = None, scraped: int = 0,
+                   failed: int = 0, error: Optional[str] = None, index: Optional[dict] = None):
+    """Close the crawl in the manifest: outcome, duration, budget counters, corpus/index size"""
+    run = _running.pop(wiki_key, None)
+    stats = load_wiki_stats()
+    entry = stats.setdefault(wiki_key, {})
+    crawl_stats = entry.get("crawl", {})
+    now = datetime.utcnow().isoformat()
+    
+    crawl_stats.update({
+        "state": "failed" if error else "partial" if failed else "ok",
+        "finished": now,
+        "scraped": scraped,
+        "failed": failed,
+        "error": error
+    })
+    if run:
+        crawl_stats["seconds"] = round(time.monotonic() - run['clock'], 1)
+        # Counters are per host - what moved during this crawl
+        budget = get_budget(WIKIS[wiki_key]["api_url"]).stats()
+        for counter in ('requests', 'throttled', 'retries', 'errors'):
+            crawl_stats[counter] = budget[counter] - run['budget'][counter]
+    entry["crawl"] = crawl_stats
+    
+    if not error:
+        entry[f"last_{crawl_stats.get('mode', 'full')}_sync"] = now
+        entry["history"] = (entry.get("history", []) + [{
+            "mode": crawl_stats.get("mode"),
+            "finished": now,
+            "seconds": crawl_stats.get("seconds"),
+            "scraped": scraped
+        }])[-CRAWL_HISTORY:]
+    if corpus is not None:
+        corpus_stats = corpus.stats()
+        entry.update({
+            "pages": corpus_stats['pages'],
+            "bytes": corpus_stats['bytes'],
+            "last_update": corpus_stats['last_updated']
+        })
+    if index is not None:
+        stats["index"] = index_summary(index)
+    save_wiki_stats(stats)
+
+def index_summary(index: dict) -> dict:
+    return {key: index[key] for key in ('pages', 'segments', 'deleted', 'bytes')}
+
+async def refresh_index_stats():
+    """Re-read the index size into the manifest (after a compaction)"""
+    index = await asyncio.to_thread(get_wiki_index_stats)
+    stats = load_wiki_stats()
+    stats["index"] = index_summary(index)
+    save_wiki_stats(stats)
+
+def rebuild_wiki_stats() -> dict:
+    """Manifest from the corpora themselves (first run after an upgrade)"""
+    stats = load_wiki_stats()
+    for wiki_key in list_corpora():
+        corpus_stats = get_corpus(wiki_key).stats()
+        stats.setdefault(wiki_key, {}).update({
+            "pages": corpus_stats['pages'],
+            "bytes": corpus_stats['bytes'],
+            "last_update": corpus_stats['last_updated']
+        })
+    stats["index"] = index_summary(get_wiki_index_stats())
+    save_wiki_stats(stats)
+    return stats
+
+def crawl_health(wiki_key: str, entry: dict) -> str:
+    """One line on how the last crawl went"""
+    crawl_stats = entry.get("crawl")
+    if not crawl_stats:
+        return "No crawl recorded yet"
+    state = crawl_stats["state"]
+    if state == "running":
+        if wiki_key in _running:
+            return f"🔄 Crawling since {crawl_stats['started'][:16].replace('T', ' ')}"
+        return "⏸️ Interrupted - resumes on the next fetch"
+    if state == "failed":
+        return f"❌ Failed: {crawl_stats.get('error') or 'unknown error'}"
+    
+    health = "⚠️" if state == "partial" or crawl_stats.get("throttled") else "✅"
+    line = f"{health} {crawl_stats['scraped']} scraped"
+    if crawl_stats.get("failed"):
+        line += f", {crawl_stats['failed']} failed (retried next sync)"
+    if crawl_stats.get("throttled"):
+        line += f", throttled {crawl_stats['throttled']}x"
+    return line
+
 # ═══════════════════════════════════════════════════════════════
 # WIKI SCRAPER
 # ═══════════════════════════════════════════════════════════════
 
+async def get_page_chunk(wiki_key: str, session: aiohttp.ClientSession,
+                         continue_param: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+    """One allpages request: (titles, apcontinue for the next one or None). Raises CrawlError."""
+    wiki = WIKIS[wiki_key]
+    params = {
+        "action": "query",
+        "list": "allpages",
+        "aplimit": "500",
+        "format": "json"
+    }
+    
+    if continue_param:
+        params["apcontinue"] = continue_param
+    
+    data = await get_budget(wiki["api_url"]).call(session, wiki["api_url"], params)
+    titles = [page["title"] for page in data.get("query", {}).get("allpages", [])]
+    return titles, data.get("continue", {}).get("apcontinue")
+
 async def get_all_pages(wiki_key: str, session: aiohttp.ClientSession) -> List[str]:
     """Get list of all pages in wiki"""
-    wiki = WIKIS[wiki_key]
     pages = []
     continue_param = None
     
     while True:
+        try:
+            titles, continue_param = await get_page_chunk(wiki_key, session, continue_param)
+        except CrawlError as e:
+            print(f"❌ Failed to fetch page list: {e}")
+            break
+        
+        pages.extend(titles)
+        if not continue_param:
+            break
+    
+    return pages
+
+async def get_latest_change(wiki_key: str, session: aiohttp.ClientSession) -> Optional[str]:
+    """Timestamp of the newest recent change (the watermark for a full sync)"""
+    wiki = WIKIS[wiki_key]
+    params = {
+        "action": "query",
+        "list": "recentchanges",
+        "rcprop": "timestamp",
+        "rclimit": "1",
+        "format": "json"
+    }
+    
+    try:
+        data = await get_budget(wiki["api_url"]).call(session, wiki["api_url"], params)
+    except CrawlError as e:
+        print(f"❌ Error fetching latest change: {e}")
+        return None
+    
+    changes = data.get("query", {}).get("recentchanges", [])
+    return changes[0]["timestamp"] if changes else None
+
+async def get_recent_changes(wiki_key: str, since: str, session: aiohttp.ClientSession) -> Optional[Tuple[set, set, str]]:
+    """
+    Replay recentchanges since the watermark (oldest first).
+    Returns (titles to re-scrape, titles to drop, new watermark), or None on error.
+    """
+    wiki = WIKIS[wiki_key]
+    changed, deleted = set(), set()
+    watermark = since
+    continue_param = None
+    
+    while True:
+        # rcstart is inclusive: the last change gets replayed, but nothing
+        # that landed in the same second as the watermark is missed
         params = {
             "action": "query",
-            "list": "allpages",
-            "aplimit": "500",
+            "list": "recentchanges",
+            "rcstart": since,
+            "rcdir": "newer",
+            "rcnamespace": "0",
+            "rctype": "edit|new|log",
+            "rcprop": "title|timestamp|ids|loginfo",
+            "rclimit": "500",
             "format": "json"
         }
         
         if continue_param:
-            params["apcontinue"] = continue_param
+            params["rccontinue"] = continue_param
         
         try:
-            async with session.get(wiki["api_url"], params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Add pages
-                    for page in data.get("query", {}).get("allpages", []):
-                        pages.append(page["title"])
-                    
-                    # Check if more pages exist
-                    if "continue" in data:
-                        continue_param = data["continue"]["apcontinue"]
-                    else:
-                        break
+            data = await get_budget(wiki["api_url"]).call(session, wiki["api_url"], params)
+        except CrawlError as e:
+            print(f"❌ Error fetching recent changes: {e}")
+            return None
+        
+        for change in data.get("query", {}).get("recentchanges", []):
+            title = change["title"]
+            watermark = max(watermark, change["timestamp"])
+            kind = change.get("type")
+            
+            if kind in ("edit", "new"):
+                changed.add(title)
+                deleted.discard(title)
+            elif kind == "log" and change.get("logtype") == "delete":
+                if change.get("logaction") == "restore":
+                    changed.add(title)
+                    deleted.discard(title)
                 else:
-                    print(f"❌ Failed to fetch page list: HTTP {response.status}")
-                    break
-        except Exception as e:
-            print(f"❌ Error fetching page list: {e}")
-            break
+                    deleted.add(title)
+                    changed.discard(title)
+            elif kind == "log" and change.get("logtype") == "move":
+                # Rename: new title gets the page; old one is gone or a redirect
+                log_params = change.get("logparams", {})
+                if "suppressredirect" in log_params:
+                    deleted.add(title)
+                    changed.discard(title)
+                else:
+                    changed.add(title)
+                target = log_params.get("target_title")
+                if target and log_params.get("target_ns", 0) == 0:
+                    changed.add(target)
+                    deleted.discard(target)
         
-        await asyncio.sleep(RATE_LIMIT_DELAY)
+        if "continue" in data:
+            continue_param = data["continue"]["rccontinue"]
+        else:
+            break
     
-    return pages
+    return changed, deleted, watermark
+
+# ═══════════════════════════════════════════════════════════════
+# HTML / WIKITEXT → TEXT (process pool, keeps parsing off the event loop)
+# ═══════════════════════════════════════════════════════════════
+
+def html_to_text(html: str) -> str:
+    """Plain text of a page's HTML"""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    # Get text content
+    text = soup.get_text()
+    
+    # Clean up text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+WIKI_COMMENTS = re.compile(r'<!--.*?-->|<ref[^>]*/>|<ref[^>]*>.*?</ref>', re.S | re.I)
+WIKI_NOISE = re.compile(r'__[A-Z]+__|<(?:gallery|nowiki|math|syntaxhighlight)[^>]*>.*?</(?:gallery|nowiki|math|syntaxhighlight)>', re.S | re.I)
+WIKI_TEMPLATE = re.compile(r'\{\{([^{}]*)\}\}')
+WIKI_LINK = re.compile(r'\[\[([^\[\]]*)\]\]')
+WIKI_FILE_LINK = re.compile(r'^(?:file|image|category|media):', re.I)
+WIKI_EXTERNAL_LINK = re.compile(r'\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]')
+WIKI_TABLE = re.compile(r'^\{\|.*?^\|\}', re.S | re.M)
+WIKI_HEADING = re.compile(r'^(=+)\s*(.*?)\s*\1\s*$', re.M)
+WIKI_LIST = re.compile(r'^[*#:;]+\s*', re.M)
+WIKI_QUOTES = re.compile(r"'{2,}")
+HTML_TAG = re.compile(r'<[^>]+>')
+
+def _wiki_link(match: re.Match) -> str:
+    target, _, label = match.group(1).partition('|')
+    if WIKI_FILE_LINK.match(target.strip()):
+        return ''
+    return (label or target).strip()
+
+def _wiki_template(match: re.Match) -> str:
+    """Infoboxes and the like: keep the parameters ("rarity: Legendary"), drop the name"""
+    values = []
+    for param in match.group(1).split('|')[1:]:
+        key, sep, value = param.partition('=')
+        value = (value if sep else key).strip()
+        if value:
+            values.append(f"{key.strip()}: {value}" if sep and key.strip() else value)
+    return '\n' + '\n'.join(values) + '\n' if values else ''
+
+def _wiki_table(match: re.Match) -> str:
+    """Tables: one line per row, cells joined, attributes dropped"""
+    rows, cells = [], []
+    for line in match.group(0).splitlines()[1:-1]:
+        line = line.strip()
+        if line.startswith('|-'):
+            rows.append(' '.join(cells))
+            cells = []
+            continue
+        if not line or line[0] not in '|!':
+            if cells:
+                cells[-1] += ' ' + line
+            continue
+        for cell in re.split(r'\|\||!!', line[2:] if line.startswith('|+') else line[1:]):
+            # "style=... | content" - the part after a lone pipe is the text
+            head, sep, tail = cell.partition('|')
+            cells.append((tail if sep and '=' in head else cell).strip())
+    rows.append(' '.join(cells))
+    return '\n' + '\n'.join(row for row in rows if row) + '\n'
+
+def wikitext_to_text(wikitext: str) -> str:
+    """
+    Plain text of a page's wikitext. Templates aren't expanded - their
+    parameters are kept instead, so infobox values still make it in.
+    """
+    text = WIKI_NOISE.sub('', WIKI_COMMENTS.sub('', wikitext))
+    # Innermost first, so links inside templates and templates inside templates work
+    for pattern, replace in ((WIKI_LINK, _wiki_link), (WIKI_TEMPLATE, _wiki_template)):
+        while True:
+            text, count = pattern.subn(replace, text)
+            if not count:
+                break
+    text = WIKI_TABLE.sub(_wiki_table, text)
+    text = WIKI_EXTERNAL_LINK.sub(r'\1', text)
+    text = WIKI_HEADING.sub(r'\2', text)
+    text = WIKI_LIST.sub('', text)
+    text = unescape(HTML_TAG.sub(' ', WIKI_QUOTES.sub('', text)))
+    
+    # Same clean-up as html_to_text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+def html_batch_to_text(htmls: List[str]) -> List[str]:
+    """One pool task per chunk of pages (a task per page costs more in pickling)"""
+    return [html_to_text(html) for html in htmls]
+
+def wikitext_batch_to_text(wikitexts: List[str]) -> List[str]:
+    return [wikitext_to_text(wikitext) for wikitext in wikitexts]
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    global _parse_pool
+    if _parse_pool is None:
+        try:
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+        except Exception as e:
+            print(f"⚠️ No process pool for wiki parsing, using a thread: {e}")
+            return None
+    return _parse_pool
+
+def close_parse_pool():
+    """Stop the parser processes (called from /shutdown)"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
+async def parse_pages(convert, pages: List[str]) -> List[str]:
+    """convert (a *_batch_to_text) for many pages, split across the parser processes"""
+    if not pages:
+        return []
+    
+    pool = get_parse_pool()
+    if pool is not None:
+        loop = asyncio.get_running_loop()
+        size = -(-len(pages) // PARSE_WORKERS)
+        try:
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(pool, convert, pages[i:i + size])
+                for i in range(0, len(pages), size)
+            ))
+            return [text for part in parts for text in part]
+        except BrokenProcessPool as e:
+            print(f"⚠️ Wiki parser pool died, falling back to a thread: {e}")
+            close_parse_pool()
+    
+    return await asyncio.to_thread(convert, pages)
+
+async def parse_html(htmls: List[str]) -> List[str]:
+    """html_to_text for many pages"""
+    return await parse_pages(html_batch_to_text, htmls)
+
+async def parse_wikitext(wikitexts: List[str]) -> List[str]:
+    """wikitext_to_text for many pages"""
+    return await parse_pages(wikitext_batch_to_text, wikitexts)
+
+def make_page_data(wiki_key: str, page_title: str, text: str, images: List[str], revid: Optional[int] = None) -> dict:
+    """The cached record for one page"""
+    wiki = WIKIS[wiki_key]
+    content = text[:5000]  # Limit content length
+    
+    return {
+        "title": page_title,
+        "content": content,
+        "content_hash": content_hash(content),
+        "url": f"{wiki['base_url']}/wiki/{page_title.replace(' ', '_')}",
+        "images": images[:5],  # Top 5 images
+        "revid": revid,
+        "last_updated": datetime.utcnow().isoformat()
+    }
+
+# ═══════════════════════════════════════════════════════════════
+# PAGE SCRAPING
+# ═══════════════════════════════════════════════════════════════
 
 async def scrape_page(wiki_key: str, page_title: str, session: aiohttp.ClientSession) -> Optional[dict]:
     """Scrape single wiki page"""
@@ -129,116 +544,284 @@ async def scrape_page(wiki_key: str, page_title: str, session: aiohttp.ClientSes
     }
     
     try:
-        async with session.get(wiki["api_url"], params=params) as response:
-            if response.status != 200:
-                return None
-            
-            data = await response.json()
-            
-            if "parse" not in data:
-                return None
-            
-            # Extract HTML content
-            html = data["parse"]["text"]["*"]
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
-            
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
-            
-            # Get images
-            images = data["parse"].get("images", [])
-            
-            return {
-                "title": page_title,
-                "content": text[:5000],  # Limit content length
-                "url": f"{wiki['base_url']}/wiki/{page_title.replace(' ', '_')}",
-                "images": images[:5],  # Top 5 images
-                "last_updated": datetime.utcnow().isoformat()
-            }
+        data = await get_budget(wiki["api_url"]).call(session, wiki["api_url"], params)
+        
+        if "parse" not in data:
+            return None
+        
+        # Extract HTML content
+        html = data["parse"]["text"]["*"]
+        text = (await parse_html([html]))[0]
+        
+        # Get images
+        images = data["parse"].get("images", [])
+        
+        return make_page_data(wiki_key, page_title, text, images, data["parse"].get("revid"))
     
     except Exception as e:
         print(f"❌ Error scraping {page_title}: {e}")
         return None
 
+async def fetch_batch(wiki_key: str, titles: List[str], session: aiohttp.ClientSession) -> Tuple[dict, set]:
+    """
+    Wikitext for up to BATCH_SIZE pages in one query (prop=revisions|images),
+    following continuation until every page is complete.
+    Not TextExtracts: without exintro it sends one page per request, and it
+    strips the infobox/table markup the per-page parse used to read.
+    Returns ({title: {"wikitext", "revid", "images"}}, missing titles).
+    Raises RetryableError (the crawl retries the batch later) or CrawlError.
+    """
+    wiki = WIKIS[wiki_key]
+    budget = get_budget(wiki["api_url"])
+    params = {
+        "action": "query",
+        "titles": "|".join(titles),
+        "prop": "revisions|images",
+        "rvprop": "ids|timestamp|content",
+        "rvslots": "main",
+        "imlimit": "max",
+        "format": "json",
+        "formatversion": "2"
+    }
+    
+    pages, missing = {}, set()
+    requested = {}  # title as the API spells it → title we asked for
+    continue_params = {}
+    
+    while True:
+        data = await budget.get(session, wiki["api_url"], {**params, **continue_params})
+        
+        if "error" in data:
+            raise CrawlError(data["error"].get("info", "API error"))
+        
+        query = data.get("query", {})
+        for change in query.get("normalized", []):
+            requested[change["to"]] = change["from"]
+        
+        for page in query.get("pages", []):
+            title = requested.get(page["title"], page["title"])
+            if page.get("missing") or page.get("invalid"):
+                missing.add(title)
+                continue
+            
+            entry = pages.setdefault(title, {"wikitext": None, "revid": None, "images": []})
+            if page.get("revisions"):
+                revision = page["revisions"][0]
+                entry["revid"] = revision["revid"]
+                content = revision.get("slots", {}).get("main", {}).get("content")
+                if content is not None:
+                    entry["wikitext"] = content
+            entry["images"] += [image["title"].split(":", 1)[-1] for image in page.get("images", [])]
+        
+        # Content (by response size) and images are capped per request - keep going until the batch is done
+        if "continue" not in data:
+            break
+        continue_params = data["continue"]
+    
+    # A page the API never sent text for counts as failed, not missing
+    return {title: page for title, page in pages.items() if page["wikitext"] is not None}, missing
+
+async def parse_batch(wiki_key: str, titles: List[str], fetched: Tuple[dict, set]) -> Tuple[List[str], dict, set]:
+    """Turn a fetched batch into page records"""
+    raw, missing = fetched
+    found = list(raw)
+    texts = await parse_wikitext([raw[title]["wikitext"] for title in found])
+    pages = {
+        title: make_page_data(wiki_key, title, text, raw[title]["images"], raw[title]["revid"])
+        for title, text in zip(found, texts)
+    }
+    return titles, pages, missing
+
 async def fetch_wiki(wiki_key: str, force: bool = False, progress_callback=None) -> int:
     """
     Fetch entire wiki
+    Uses recentchanges since the last run when possible (delta sync).
+    Progress is journaled, so a crawl cut short by a crash/restart resumes
+    where it stopped on the next call.
     Returns number of pages scraped
     """
-    print(f"\n🔍 Fetching {WIKIS[wiki_key]['name']} wiki...")
+    try:
+        return await sync_wiki(wiki_key, force, progress_callback)
+    except Exception as e:
+        if wiki_key in _running:
+            crawl_finished(wiki_key, error=str(e) or type(e).__name__)
+        raise
+
+async def sync_wiki(wiki_key: str, force: bool, progress_callback) -> int:
+    """fetch_wiki without the bookkeeping for crawls that blow up"""
+    name = WIKIS[wiki_key]['name']
+    print(f"\n🔍 Fetching {name} wiki...")
     
-    # Load existing data
-    all_data = load_wiki_data()
-    if wiki_key not in all_data:
-        all_data[wiki_key] = {}
+    # Cached pages (only the title index is in memory)
+    corpus = get_corpus(wiki_key)
     
-    wiki_data = all_data[wiki_key]
+    session = get_session()
+    journal = await get_journal()
     
-    async with aiohttp.ClientSession() as session:
-        # Get all pages
-        pages = await get_all_pages(wiki_key, session)
-        print(f"📄 Found {len(pages)} pages")
-        
-        if not pages:
+    plan = await run_storage(journal.get_crawl, wiki_key)
+    if plan:
+        print(f"⏯️ Resuming {plan['mode']} sync of {name} from {plan['started']} "
+              f"({plan['queued'] - plan['pending']}/{plan['queued']} pages done)")
+        # Pages scraped after the last merge before the interruption
+        await merge_checkpoint(wiki_key, corpus, journal)
+        crawl_started(wiki_key, plan["mode"], resumed=True)
+    else:
+        sync = load_sync_state().get(wiki_key, {})
+        if not force and len(corpus) and watermark_usable(sync.get("watermark")):
+            crawl_started(wiki_key, 'delta', resumed=False)
+            plan = await start_delta_sync(wiki_key, sync, session, journal)
+        else:
+            crawl_started(wiki_key, 'full', resumed=False)
+            plan = await start_full_sync(wiki_key, force, session, journal)
+        if plan is None:
+            crawl_finished(wiki_key, corpus, error="could not read recent changes")
             return 0
+    
+    if not plan["listed"] and not await list_pages(wiki_key, corpus, plan, session, journal):
+        # The journal keeps the cursor - the next run carries on listing
+        crawl_finished(wiki_key, corpus, error="could not list pages")
+        return 0
+    
+    titles = await run_storage(journal.titles, wiki_key, 'pending')
+    print(f"🔄 Scraping {len(titles)} pages...")
+    scraped_count = await scrape_pages(wiki_key, titles, corpus, session, journal, progress_callback)
+    await merge_checkpoint(wiki_key, corpus, journal)
+    failed = await run_storage(journal.titles, wiki_key, 'failed')
+    
+    async with _save_lock:
+        # Re-index changed pages for /wikisearch (CPU heavy - keep it off the event loop)
+        await asyncio.to_thread(index_corpus, corpus)
+        index = await asyncio.to_thread(get_wiki_index_stats)
+        # ...and re-embed them for the AI chat's context
+        vectors = await asyncio.to_thread(update_wiki_vectors, wiki_key)
+        # Cached AI answers may quote the old text
+        if scraped_count or (vectors and (vectors['embedded'] or vectors['deleted'])):
+            invalidate_responses(f"{name} wiki updated")
         
-        # Filter pages that need updating
-        if not force:
-            pages_to_scrape = [
-                p for p in pages 
-                if p not in wiki_data or should_update_page(wiki_data[p])
-            ]
-        else:
-            pages_to_scrape = pages
+        # Only move the watermark once the pages are safely saved
+        if plan["watermark"]:
+            sync_state = load_sync_state()
+            sync_state[wiki_key] = {
+                "watermark": plan["watermark"],
+                "pending": failed,
+                "last_sync": datetime.utcnow().isoformat()
+            }
+            save_sync_state(sync_state)
+    
+    await run_storage(journal.finish, wiki_key)
+    crawl_finished(wiki_key, corpus, scraped_count, len(failed), index=index)
+    print(f"✅ Scraped {scraped_count} pages from {name}")
+    return scraped_count
+
+async def start_full_sync(wiki_key: str, force: bool, session: aiohttp.ClientSession,
+                          journal: CrawlJournal) -> dict:
+    """Plan a crawl of every (missing/stale) page"""
+    # Anything edited while we crawl is picked up by the next delta sync
+    watermark = await get_latest_change(wiki_key, session)
+    await run_storage(journal.start_crawl, wiki_key, 'full', force, watermark)
+    return await run_storage(journal.get_crawl, wiki_key)
+
+async def start_delta_sync(wiki_key: str, sync: dict, session: aiohttp.ClientSession,
+                           journal: CrawlJournal) -> Optional[dict]:
+    """Plan a crawl of what changed since the watermark; deleted/moved pages get dropped"""
+    watermark = sync["watermark"]
+    changes = await get_recent_changes(wiki_key, watermark, session)
+    if changes is None:
+        return None
+    changed, deleted, new_watermark = changes
+    # Leftovers from last time happened before anything in this batch
+    changed |= set(sync.get("pending", [])) - deleted
+    print(f"🕒 Since {watermark}: {len(changed)} changed, {len(deleted)} deleted/moved")
+    
+    await run_storage(journal.start_crawl, wiki_key, 'delta', False, new_watermark,
+                      sorted(changed), sorted(deleted), True)
+    return await run_storage(journal.get_crawl, wiki_key)
+
+async def list_pages(wiki_key: str, corpus: WikiCorpus, plan: dict, session: aiohttp.ClientSession,
+                     journal: CrawlJournal) -> bool:
+    """Queue every page that needs scraping, one allpages chunk at a time"""
+    cursor = plan["cursor"]
+    listed = plan["queued"]
+    
+    while True:
+        try:
+            titles, cursor = await get_page_chunk(wiki_key, session, cursor)
+        except CrawlError as e:
+            print(f"❌ Failed to fetch page list: {e}")
+            return False
         
-        print(f"🔄 Scraping {len(pages_to_scrape)} pages...")
+        # Filter pages that need updating
+        if not plan["force"]:
+            titles = [t for t in titles if t not in corpus or should_update_page(corpus.meta(t))]
         
-        # Scrape pages
-        scraped_count = 0
-        for i, page_title in enumerate(pages_to_scrape, 1):
-            page_data = await scrape_page(wiki_key, page_title, session)
-            
-            if page_data:
-                wiki_data[page_title] = page_data
-                scraped_count += 1
-            
-            # Progress update
-            if progress_callback and i % 50 == 0:
-                await progress_callback(f"Scraped {i}/{len(pages_to_scrape)} pages...")
-            
-            # Rate limiting
-            await asyncio.sleep(RATE_LIMIT_DELAY)
+        await run_storage(journal.add_listing, wiki_key, titles, cursor, cursor is None)
+        listed += len(titles)
+        if cursor is None:
+            break
+    
+    print(f"📄 Queued {listed} pages")
+    return True
+
+async def merge_checkpoint(wiki_key: str, corpus: WikiCorpus, journal: CrawlJournal):
+    """Append journaled pages to the wiki corpus, then drop them from the journal"""
+    async with _merge_locks.setdefault(wiki_key, asyncio.Lock()):
+        pages, deleted = await run_storage(journal.unmerged, wiki_key)
+        if not pages and not deleted:
+            return
         
-        # Save data
-        all_data[wiki_key] = wiki_data
-        save_wiki_data(all_data)
+        saved = await asyncio.to_thread(corpus.update, pages, deleted)
         
-        print(f"✅ Scraped {scraped_count} pages from {WIKIS[wiki_key]['name']}")
-        return scraped_count
+        if saved:
+            await run_storage(journal.mark_merged, wiki_key, list(pages) + deleted)
+
+async def scrape_pages(wiki_key: str, titles: List[str], corpus: WikiCorpus, session: aiohttp.ClientSession,
+                       journal: CrawlJournal, progress_callback=None) -> int:
+    """
+    Scrape titles into the journal (merged into the corpus every WIKI_MERGE_BATCH
+    pages), returns how many succeeded.
+    Batches run in parallel under the wiki host's crawl budget; while one
+    batch is parsed, the others keep downloading.
+    """
+    wiki = WIKIS[wiki_key]
+    batches = [titles[i:i + BATCH_SIZE] for i in range(0, len(titles), BATCH_SIZE)]
+    scraped_count = 0
+    
+    async def scrape_batch(batch: List[str]) -> int:
+        nonlocal scraped_count
+        fetched = await fetch_batch(wiki_key, batch, session)
+        _, pages, missing = await parse_batch(wiki_key, batch, fetched)
+        # Missing = deleted between listing and fetching; anything else without text failed
+        failed = [title for title in batch if title not in pages and title not in missing]
+        unmerged = await run_storage(journal.record_batch, wiki_key, pages, missing, failed)
+        if unmerged >= WIKI_MERGE_BATCH:
+            await merge_checkpoint(wiki_key, corpus, journal)
+        scraped_count += len(pages)
+        return len(pages)
+    
+    unfinished = await crawl(get_budget(wiki["api_url"]), batches, scrape_batch,
+                             total=len(titles), label=wiki["name"], progress_callback=progress_callback)
+    if unfinished:
+        await run_storage(journal.record_batch, wiki_key, {}, [], [t for batch in unfinished for t in batch])
+    
+    return scraped_count
 
 async def fetch_all_wikis(force: bool = False, progress_callback=None) -> Dict[str, int]:
     """
-    Fetch all wikis
+    Fetch all wikis (concurrently - each host has its own crawl budget)
     Returns dict of wiki_key: pages_scraped
     """
-    results = {}
+    wiki_keys = list(WIKIS.keys())
+    counts = await asyncio.gather(
+        *(fetch_wiki(wiki_key, force, progress_callback) for wiki_key in wiki_keys),
+        return_exceptions=True
+    )
     
-    for wiki_key in WIKIS.keys():
-        try:
-            count = await fetch_wiki(wiki_key, force, progress_callback)
-            results[wiki_key] = count
-        except Exception as e:
-            print(f"❌ Failed to fetch {wiki_key}: {e}")
-            results[wiki_key] = 0
+    results = {}
+    for wiki_key, count in zip(wiki_keys, counts):
+        if isinstance(count, Exception):
+            print(f"❌ Failed to fetch {wiki_key}: {count}")
+            count = 0
+        results[wiki_key] = count
     
     return results
 
@@ -246,54 +829,62 @@ async def fetch_all_wikis(force: bool = False, progress_callback=None) -> Dict[s
 # SEARCH FUNCTIONS
 # ═══════════════════════════════════════════════════════════════
 
+def index_corpus(corpus: WikiCorpus) -> dict:
+    """Bring the search index in line with a wiki's corpus (only changed pages are read)"""
+    return update_wiki_index(corpus.wiki_key, corpus.metadata(), corpus.get)
+
 def search_wikis(query: str, limit: int = 5) -> List[dict]:
-    """Search all wikis for query"""
-    wiki_data = load_wiki_data()
+    """Search all wikis for query (BM25 over the prebuilt index)"""
+    index = get_wiki_index()
+    if not len(index):
+        # No index on disk yet - build it once from the cached pages
+        for wiki_key in list_corpora():
+            index_corpus(get_corpus(wiki_key))
+        if not len(index):
+            return []
+    
     results = []
-    query_lower = query.lower()
+    for segment, doc_id, score, terms in index.search(query, limit):
+        wiki_key, page_title, url, _ = segment.docs[doc_id]
+        results.append({
+            "wiki": WIKIS.get(wiki_key, {}).get("name", wiki_key),
+            "title": page_title,
+            "url": url,
+            "snippet": segment.snippet(doc_id, terms),
+            "relevance": round(score, 2)
+        })
     
-    for wiki_key, pages in wiki_data.items():
-        wiki_name = WIKIS[wiki_key]["name"]
-        
-        for page_title, page_data in pages.items():
-            # Check if query matches title or content
-            if (query_lower in page_title.lower() or 
-                query_lower in page_data.get("content", "").lower()):
-                
-                results.append({
-                    "wiki": wiki_name,
-                    "title": page_title,
-                    "url": page_data.get("url"),
-                    "snippet": page_data.get("content", "")[:200] + "...",
-                    "relevance": (
-                        100 if query_lower in page_title.lower() else 50
-                    )
-                })
-    
-    # Sort by relevance
-    results.sort(key=lambda x: x["relevance"], reverse=True)
-    
-    return results[:limit]
+    return results
 
 def get_wiki_stats() -> dict:
-    """Get statistics about cached wiki data"""
-    wiki_data = load_wiki_data()
+    """Get statistics about cached wiki data (from the manifest - no corpus reads)"""
+    manifest = load_wiki_stats()
+    if not manifest and list_corpora():
+        # Corpora from before the manifest existed - count them once
+        manifest = rebuild_wiki_stats()
     
     stats = {
         "total_pages": 0,
-        "wikis": {}
+        "wikis": {},
+        "index": manifest.get("index", {})
     }
     
-    for wiki_key, pages in wiki_data.items():
-        wiki_name = WIKIS[wiki_key]["name"]
-        page_count = len(pages)
+    for wiki_key, entry in manifest.items():
+        if wiki_key == "index":
+            continue
+        wiki_name = WIKIS.get(wiki_key, {}).get("name", wiki_key)
+        page_count = entry.get("pages", 0)
+        durations = [run["seconds"] for run in entry.get("history", []) if run.get("seconds") is not None]
         
         stats["wikis"][wiki_name] = {
             "pages": page_count,
-            "last_update": max(
-                (p.get("last_updated", "") for p in pages.values()),
-                default="Never"
-            )
+            "bytes": entry.get("bytes", 0),
+            "last_update": entry.get("last_update") or "Never",
+            "last_full_sync": entry.get("last_full_sync"),
+            "last_delta_sync": entry.get("last_delta_sync"),
+            "last_crawl": entry.get("crawl", {}),
+            "average_crawl_seconds": round(sum(durations) / len(durations), 1) if durations else None,
+            "health": crawl_health(wiki_key, entry)
         }
         stats["total_pages"] += page_count
     
@@ -306,6 +897,8 @@ def get_wiki_stats() -> dict:
 __all__ = [
     'fetch_wiki',
     'fetch_all_wikis',
+    'close_parse_pool',
     'search_wikis',
-    'get_wiki_stats'
+    'get_wiki_stats',
+    'refresh_index_stats'
 ]
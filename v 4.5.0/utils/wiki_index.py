@@ -0,0 +1,619 @@
+"""
+═══════════════════════════════════════════════════════════════
+🔎 Wiki Index - Segmented inverted index with BM25 for /wikisearch
+Each fetch only indexes pages whose text changed (new small segment +
+tombstones); segments are merged in tiers and compacted in the background
+═══════════════════════════════════════════════════════════════
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .text_normalizer import fold_text
+
+WIKI_INDEX_DIR = "data/wiki_index"
+LEGACY_INDEX_FILE = "data/wiki_index.bin"  # single-file index, replaced by WIKI_INDEX_DIR
+INDEX_MAGIC = b"CSRIDX3\n"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 2.0            # A title hit is worth this many body hits (per idf)
+PREFIX_WEIGHT = 0.5          # "drag" → "dragon" scores half of an exact match
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_EXPANSIONS = 30   # Most common completions kept per prefix
+SNIPPET_CHARS = 200
+
+MAX_SEGMENTS = 8             # More than this → merge the smallest ones
+MERGE_FACTOR = 4             # Segments merged together at a time
+COMPACT_DELETED_RATIO = 0.2  # Compaction rewrites everything past this much dead weight
+
+TOKEN_RE = re.compile(r"\w+")
+
+# ═══════════════════════════════════════════════════════════════
+# TOKENIZER
+# ═══════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=65536)
+def fold_token(token: str) -> str:
+    """Case-fold one token (accents, fullwidth, look-alikes)"""
+    return fold_text(token)
+
+def tokenize(text: str) -> List[str]:
+    return [term for term in map(fold_token, TOKEN_RE.findall(text)) if term]
+
+def content_hash(text: str) -> str:
+    """Fingerprint of a page's text - unchanged pages are never re-indexed"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def page_hash(page: dict) -> str:
+    return page.get("content_hash") or content_hash(page.get("content", ""))
+
+@lru_cache(maxsize=256)
+def _highlighter(terms: frozenset) -> "re.Pattern":
+    """One regex for every matched term (folding only changes case for wiki text)"""
+    alternatives = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b", re.IGNORECASE)
+
+# ═══════════════════════════════════════════════════════════════
+# SEGMENT (immutable once built)
+# ═══════════════════════════════════════════════════════════════
+
+class IndexSegment:
+    """
+    Postings are flat arrays; each term points at a slice of them.
+    Page text is kept as one blob of per-page zlib chunks for snippets.
+    """
+
+    def __init__(self, docs, doc_len, terms, post_docs, post_tf, title_docs, contents, content_offsets):
+        self.docs = docs                    # doc_id -> [wiki_key, title, url, content_hash]
+        self.doc_len = doc_len              # array('I') tokens per page
+        self.terms = terms                  # term -> (start, count, title_start, title_count)
+        self.post_docs = post_docs          # array('I')
+        self.post_tf = post_tf              # array('B'), tf capped at 255 (BM25 saturates long before)
+        self.title_docs = title_docs        # array('I')
+        self.contents = contents            # bytes, zlib per page
+        self.content_offsets = content_offsets  # array('I'), len(docs) + 1
+        self.sorted_terms = sorted(terms)
+        self.total_length = sum(doc_len)
+        self.set_average_length(self.total_length / len(doc_len) if doc_len else 1.0)
+
+    def set_average_length(self, avg_len: float):
+        """BM25 length norms use the average over the whole index, not the segment"""
+        self.doc_norm = [BM25_K1 * (1 - BM25_B + BM25_B * length / (avg_len or 1.0)) for length in self.doc_len]
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    # ═══════════════════════════════════════════════════════════
+    # BUILD
+    # ═══════════════════════════════════════════════════════════
+
+    @classmethod
+    def build(cls, pages: Iterable[Tuple[str, str, dict]]) -> "IndexSegment":
+        """Index (wiki_key, title, page) triples; pages look like wiki corpus records"""
+        docs = []
+        doc_len = array('I')
+        body = defaultdict(list)   # term -> [(doc_id, tf)]
+        titles = defaultdict(list) # term -> [doc_id]
+        blob = bytearray()
+        content_offsets = array('I', [0])
+
+        for wiki_key, page_title, page in pages:
+            doc_id = len(docs)
+            content = page.get("content", "")
+            docs.append([wiki_key, page_title, page.get("url"), page_hash(page)])
+
+            tokens = tokenize(content)
+            doc_len.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                body[term].append((doc_id, min(tf, 0xFF)))
+            for term in set(tokenize(page_title)):
+                titles[term].append(doc_id)
+
+            blob += zlib.compress(content.encode('utf-8'))
+            content_offsets.append(len(blob))
+
+        terms = {}
+        post_docs, post_tf, title_docs = array('I'), array('B'), array('I')
+        for term in sorted(body.keys() | titles.keys()):
+            postings = body.get(term, [])
+            title_postings = titles.get(term, [])
+            terms[term] = (len(post_docs), len(postings), len(title_docs), len(title_postings))
+            post_docs.extend(doc_id for doc_id, _ in postings)
+            post_tf.extend(tf for _, tf in postings)
+            title_docs.extend(title_postings)
+
+        return cls(docs, doc_len, terms, post_docs, post_tf, title_docs, bytes(blob), content_offsets)
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTENCE
+    # magic | header length | JSON header | raw arrays | content blob
+    # ═══════════════════════════════════════════════════════════
+
+    def save(self, filepath: str) -> bool:
+        sections = [self.doc_len, self.post_docs, self.post_tf, self.title_docs, self.content_offsets]
+        header = json.dumps({
+            'byteorder': sys.byteorder,
+            'docs': self.docs,
+            # Postings are stored in sorted term order, so counts are enough
+            'terms': [[term, *self.terms[term][1::2]] for term in self.sorted_terms],
+            'sections': [len(section) for section in sections]
+        }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        try:
+            os.makedirs(os.path.dirname(filepath) or '.', exist_ok=True)
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(INDEX_MAGIC)
+                f.write(struct.pack('<I', len(header)))
+                f.write(header)
+                for section in sections:
+                    f.write(section.tobytes())
+                f.write(self.contents)
+            os.replace(tmp_path, filepath)
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save wiki index segment {filepath}: {e}")
+            return False
+
+    @classmethod
+    def load(cls, filepath: str) -> Optional["IndexSegment"]:
+        try:
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+        except OSError:
+            return None
+
+        try:
+            if not raw.startswith(INDEX_MAGIC):
+                return None
+            pos = len(INDEX_MAGIC)
+            (header_len,) = struct.unpack_from('<I', raw, pos)
+            pos += 4
+            header = json.loads(raw[pos:pos + header_len].decode('utf-8'))
+            pos += header_len
+
+            sections = []
+            for typecode, count in zip('IIBII', header['sections']):
+                section = array(typecode)
+                size = count * section.itemsize
+                section.frombytes(raw[pos:pos + size])
+                if header['byteorder'] != sys.byteorder:
+                    section.byteswap()
+                sections.append(section)
+                pos += size
+            doc_len, post_docs, post_tf, title_docs, content_offsets = sections
+
+            terms = {}
+            start = title_start = 0
+            for term, count, title_count in header['terms']:
+                terms[term] = (start, count, title_start, title_count)
+                start += count
+                title_start += title_count
+
+            return cls(header['docs'], doc_len, terms, post_docs, post_tf, title_docs, raw[pos:], content_offsets)
+        except Exception as e:
+            print(f"⚠️ Wiki index segment {filepath} is unreadable: {e}")
+            return None
+
+    # ═══════════════════════════════════════════════════════════
+    # QUERY
+    # ═══════════════════════════════════════════════════════════
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Indexed terms starting with prefix (capped scan)"""
+        i = bisect_left(self.sorted_terms, prefix)
+        matches = []
+        while i < len(self.sorted_terms) and self.sorted_terms[i].startswith(prefix) and len(matches) < 500:
+            matches.append(self.sorted_terms[i])
+            i += 1
+        return matches
+
+    def doc_freq(self, term: str) -> Tuple[int, int]:
+        """(body df, title df) in this segment"""
+        entry = self.terms.get(term)
+        return (entry[1], entry[3]) if entry else (0, 0)
+
+    def score_into(self, scores: dict, weights: Dict[str, float], body_idf: dict, title_idf: dict, deleted: set):
+        """Add BM25 (+ title boost) for live docs; keys are (segment, doc_id)"""
+        post_docs, post_tf, doc_norm = self.post_docs, self.post_tf, self.doc_norm
+        for term, weight in weights.items():
+            entry = self.terms.get(term)
+            if entry is None:
+                continue
+            start, count, title_start, title_count = entry
+            if count:
+                factor = weight * body_idf[term] * (BM25_K1 + 1)
+                for j in range(start, start + count):
+                    doc_id = post_docs[j]
+                    if doc_id in deleted:
+                        continue
+                    tf = post_tf[j]
+                    scores[(self, doc_id)] += factor * tf / (tf + doc_norm[doc_id])
+            if title_count:
+                bonus = weight * TITLE_BOOST * title_idf[term]
+                for j in range(title_start, title_start + title_count):
+                    doc_id = self.title_docs[j]
+                    if doc_id not in deleted:
+                        scores[(self, doc_id)] += bonus
+
+    # ═══════════════════════════════════════════════════════════
+    # SNIPPETS
+    # ═══════════════════════════════════════════════════════════
+
+    def content(self, doc_id: int) -> str:
+        start, end = self.content_offsets[doc_id], self.content_offsets[doc_id + 1]
+        return zlib.decompress(self.contents[start:end]).decode('utf-8')
+
+    def snippet(self, doc_id: int, terms, size: int = SNIPPET_CHARS) -> str:
+        """The window with the most query hits, hits in **bold**"""
+        content = self.content(doc_id)
+        hits = [m.span() for m in _highlighter(frozenset(terms)).finditer(content)]
+        if not hits:
+            return content[:size] + ("..." if len(content) > size else "")
+
+        # Slide over the hits, keep the window that covers the most
+        best_first, best_count, last = 0, 0, 0
+        for first in range(len(hits)):
+            while last < len(hits) and hits[last][1] - hits[first][0] <= size:
+                last += 1
+            if last - first > best_count:
+                best_first, best_count = first, last - first
+
+        # Start a little before the first hit, on a word boundary
+        start = max(0, hits[best_first][0] - size // 5)
+        if start:
+            space = content.find(' ', start)
+            start = space + 1 if 0 <= space < hits[best_first][0] else start
+        end = min(len(content), start + size)
+        if end < len(content):
+            space = content.rfind(' ', start, end)
+            end = space if space > hits[best_first][1] else end
+
+        parts, pos = [], start
+        for hit_start, hit_end in hits[best_first:best_first + best_count]:
+            if hit_end > end:
+                break
+            parts.append(content[pos:hit_start])
+            parts.append(f"**{content[hit_start:hit_end]}**")
+            pos = hit_end
+        parts.append(content[pos:end])
+
+        text = ''.join(parts).strip()
+        return ("..." if start > 0 else "") + text + ("..." if end < len(content) else "")
+
+    def live_pages(self, deleted: set):
+        """(wiki_key, title, page) for every doc not deleted - input for merges"""
+        for doc_id, (wiki_key, page_title, url, digest) in enumerate(self.docs):
+            if doc_id not in deleted:
+                yield wiki_key, page_title, {"content": self.content(doc_id), "url": url, "content_hash": digest}
+
+    def stats(self) -> dict:
+        return {
+            'pages': len(self.docs),
+            'terms': len(self.terms),
+            'postings': len(self.post_docs),
+            'bytes': (len(self.contents) + self.post_docs.itemsize * len(self.post_docs)
+                      + self.post_tf.itemsize * len(self.post_tf) + self.title_docs.itemsize * len(self.title_docs))
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# INDEX (segments + tombstones + manifest)
+# ═══════════════════════════════════════════════════════════════
+
+class WikiIndex:
+    """
+    Searchable view over a list of segments.
+    Replacing or deleting a page tombstones its old doc; new text goes into
+    a fresh segment. manifest.json is rewritten last, so a crash mid-update
+    leaves the previous index intact.
+    """
+
+    def __init__(self, directory: str = WIKI_INDEX_DIR):
+        self.directory = directory
+        self.segments: List[IndexSegment] = []
+        self.names: Dict[IndexSegment, str] = {}
+        self.deleted: Dict[IndexSegment, set] = {}
+        self.live: Dict[Tuple[str, str], Tuple[IndexSegment, int]] = {}  # (wiki_key, title) -> doc
+        self.next_segment = 1
+        self.lock = threading.Lock()  # updates and merges run in worker threads
+        self.merges = 0
+        self.last_update = {}
+
+    def __len__(self) -> int:
+        return len(self.live)
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTENCE
+    # ═══════════════════════════════════════════════════════════
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, "manifest.json")
+
+    @classmethod
+    def load(cls, directory: str = WIKI_INDEX_DIR) -> "WikiIndex":
+        index = cls(directory)
+        try:
+            with open(index.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        index.next_segment = manifest.get('next_segment', 1)
+        for entry in manifest.get('segments', []):
+            segment = IndexSegment.load(os.path.join(directory, entry['name']))
+            if segment is None:
+                # Lost a segment - start over, search_wikis rebuilds from the wiki corpus
+                return cls(directory)
+            index._attach(segment, entry['name'], set(entry.get('deleted', [])))
+        index._refresh_norms()
+        return index
+
+    def _save_manifest(self):
+        manifest = {
+            'next_segment': self.next_segment,
+            'segments': [
+                {'name': self.names[segment], 'deleted': sorted(self.deleted[segment])}
+                for segment in self.segments
+            ]
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+        # Segment files no longer referenced (merged away, or the old single-file index)
+        keep = set(self.names.values()) | {"manifest.json"}
+        for name in os.listdir(self.directory):
+            if name not in keep:
+                os.remove(os.path.join(self.directory, name))
+        if self.directory == WIKI_INDEX_DIR and os.path.exists(LEGACY_INDEX_FILE):
+            os.remove(LEGACY_INDEX_FILE)
+
+    def _write_segment(self, segment: IndexSegment) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"seg_{self.next_segment:06d}.bin"
+        self.next_segment += 1
+        if not segment.save(os.path.join(self.directory, name)):
+            raise OSError(f"could not write {name}")
+        return name
+
+    # ═══════════════════════════════════════════════════════════
+    # SEGMENT BOOKKEEPING
+    # ═══════════════════════════════════════════════════════════
+
+    def _attach(self, segment: IndexSegment, name: str, deleted: set = None):
+        deleted = deleted or set()
+        self.segments = self.segments + [segment]  # new list - searches keep their snapshot
+        self.names[segment] = name
+        self.deleted[segment] = deleted
+        for doc_id, (wiki_key, page_title, _, _) in enumerate(segment.docs):
+            if doc_id not in deleted:
+                old = self.live.get((wiki_key, page_title))
+                if old is not None and old[0] in self.deleted:  # not a segment being merged away
+                    self.deleted[old[0]].add(old[1])
+                self.live[(wiki_key, page_title)] = (segment, doc_id)
+
+    def _detach(self, segments: List[IndexSegment]):
+        self.segments = [segment for segment in self.segments if segment not in segments]
+        for segment in segments:
+            self.names.pop(segment, None)
+            self.deleted.pop(segment, None)
+
+    def _refresh_norms(self):
+        total = sum(segment.doc_len[doc_id] for segment, doc_id in self.live.values())
+        avg_len = total / len(self.live) if self.live else 1.0
+        for segment in self.segments:
+            segment.set_average_length(avg_len)
+
+    def _tombstone(self, key: Tuple[str, str]):
+        old = self.live.pop(key, None)
+        if old is not None:
+            self.deleted[old[0]].add(old[1])
+
+    # ═══════════════════════════════════════════════════════════
+    # UPDATES
+    # ═══════════════════════════════════════════════════════════
+
+    def update_wiki(self, wiki_key: str, pages: dict, load: Optional[Callable[[str], dict]] = None) -> dict:
+        """
+        Bring one wiki in line with {title: page}: add new pages, replace
+        pages whose text changed, delete pages that are gone, skip the rest.
+        With load, pages only needs content_hash/url and load(title) fetches
+        the full page for the ones that changed.
+        """
+        with self.lock:
+            changed = []
+            skipped = 0
+            for page_title, page in pages.items():
+                current = self.live.get((wiki_key, page_title))
+                if current is not None and current[0].docs[current[1]][3] == page_hash(page):
+                    skipped += 1
+                    continue
+                changed.append((wiki_key, page_title, page))
+
+            if load is not None:
+                changed = [(key, page_title, load(page_title)) for key, page_title, _ in changed]
+                changed = [entry for entry in changed if entry[2] is not None]
+
+            gone = [key for key in self.live if key[0] == wiki_key and key[1] not in pages]
+            replaced = sum(1 for _, page_title, _ in changed if (wiki_key, page_title) in self.live)
+            result = {
+                'added': len(changed) - replaced,
+                'replaced': replaced,
+                'deleted': len(gone),
+                'skipped': skipped
+            }
+            self.last_update[wiki_key] = result
+            if not changed and not gone:
+                return result
+
+            for key in gone:
+                self._tombstone(key)
+            if changed:
+                segment = IndexSegment.build(changed)
+                self._attach(segment, self._write_segment(segment))
+            self._drop_empty_segments()
+            self._maybe_merge()
+            self._refresh_norms()
+            self._save_manifest()
+            return result
+
+    def _drop_empty_segments(self):
+        dead = [segment for segment in self.segments if len(self.deleted[segment]) >= len(segment.docs)]
+        if dead:
+            self._detach(dead)
+
+    def _maybe_merge(self):
+        """Tiered policy: too many segments → merge the smallest few into one"""
+        while len(self.segments) > MAX_SEGMENTS:
+            smallest = sorted(self.segments, key=lambda s: len(s.docs) - len(self.deleted[s]))[:MERGE_FACTOR]
+            self._merge(smallest)
+
+    def _merge(self, segments: List[IndexSegment]):
+        """Rewrite segments as one, dropping tombstoned docs"""
+        pages = [page for segment in segments for page in segment.live_pages(self.deleted[segment])]
+        self._detach(segments)
+        if pages:
+            merged = IndexSegment.build(pages)
+            self._attach(merged, self._write_segment(merged))
+        self.merges += 1
+
+    def needs_compaction(self) -> bool:
+        total = sum(len(segment.docs) for segment in self.segments)
+        dead = total - len(self.live)
+        return len(self.segments) > 1 or (total and dead / total > COMPACT_DELETED_RATIO)
+
+    def compact(self) -> bool:
+        """Merge everything into a single segment (background job)"""
+        with self.lock:
+            if not self.needs_compaction():
+                return False
+            self._merge(list(self.segments))
+            self._refresh_norms()
+            self._save_manifest()
+            return True
+
+    # ═══════════════════════════════════════════════════════════
+    # QUERY
+    # ═══════════════════════════════════════════════════════════
+
+    def query_terms(self, query: str, segments: List[IndexSegment]) -> Dict[str, float]:
+        """term -> weight (exact terms 1.0, prefix completions PREFIX_WEIGHT)"""
+        weights = {}
+        for term in tokenize(query):
+            if any(term in segment.terms for segment in segments):
+                weights[term] = 1.0
+            if len(term) >= MIN_PREFIX_LENGTH:
+                completions = set()
+                for segment in segments:
+                    completions.update(segment.expand_prefix(term))
+                if len(completions) > MAX_PREFIX_EXPANSIONS:
+                    completions = heapq.nlargest(
+                        MAX_PREFIX_EXPANSIONS, completions,
+                        key=lambda t: sum(sum(segment.doc_freq(t)) for segment in segments)
+                    )
+                for completion in completions:
+                    weights.setdefault(completion, PREFIX_WEIGHT)
+        return weights
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[IndexSegment, int, float, Dict[str, float]]]:
+        """Top pages as (segment, doc_id, score, matched term weights)"""
+        segments = self.segments  # snapshot - merges swap the list, never edit it
+        weights = self.query_terms(query, segments)
+        if not weights:
+            return []
+
+        # Collection-wide idf, so a page scores the same whichever segment it's in
+        n = max(len(self.live), 1)
+        body_idf, title_idf = {}, {}
+        for term in weights:
+            body_df = title_df = 0
+            for segment in segments:
+                df, tdf = segment.doc_freq(term)
+                body_df += df
+                title_df += tdf
+            body_idf[term] = math.log(1 + max(n - body_df + 0.5, 0.5) / (body_df + 0.5))
+            title_idf[term] = math.log(1 + max(n - title_df + 0.5, 0.5) / (title_df + 0.5))
+
+        scores = defaultdict(float)
+        for segment in segments:
+            segment.score_into(scores, weights, body_idf, title_idf, self.deleted.get(segment, set()))
+
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(segment, doc_id, score, weights) for (segment, doc_id), score in top]
+
+    def stats(self) -> dict:
+        total = sum(len(segment.docs) for segment in self.segments)
+        return {
+            'pages': len(self.live),
+            'segments': len(self.segments),
+            'deleted': total - len(self.live),
+            'merges': self.merges,
+            'terms': len(set().union(*(segment.terms for segment in self.segments))) if self.segments else 0,
+            'bytes': sum(segment.stats()['bytes'] for segment in self.segments),
+            'last_update': dict(self.last_update)
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL INDEX
+# ═══════════════════════════════════════════════════════════════
+
+_index: Optional[WikiIndex] = None
+
+def get_wiki_index() -> WikiIndex:
+    """The index (read from disk on first use; empty if never built)"""
+    global _index
+    if _index is None:
+        _index = WikiIndex.load()
+    return _index
+
+def update_wiki_index(wiki_key: str, pages: dict, load: Optional[Callable[[str], dict]] = None) -> dict:
+    """Incrementally index one wiki after a fetch (safe to run in a thread)"""
+    result = get_wiki_index().update_wiki(wiki_key, pages, load)
+    print(f"🔎 Wiki index {wiki_key}: +{result['added']} ~{result['replaced']} "
+          f"-{result['deleted']} ({result['skipped']} unchanged)")
+    return result
+
+def build_wiki_index(wiki_data: dict) -> WikiIndex:
+    """Index every wiki in {wiki_key: {title: page}} (only changed pages do any work)"""
+    index = get_wiki_index()
+    for wiki_key, pages in wiki_data.items():
+        update_wiki_index(wiki_key, pages)
+    return index
+
+def compact_wiki_index() -> bool:
+    """Merge all segments and purge deleted docs (run off the event loop)"""
+    index = get_wiki_index()
+    if index.compact():
+        print(f"🔎 Wiki index compacted: {len(index)} pages in 1 segment")
+        return True
+    return False
+
+def get_wiki_index_stats() -> dict:
+    return get_wiki_index().stats()
+
+__all__ = [
+    'IndexSegment',
+    'WikiIndex',
+    'tokenize',
+    'content_hash',
+    'get_wiki_index',
+    'update_wiki_index',
+    'build_wiki_index',
+    'compact_wiki_index',
+    'get_wiki_index_stats'
+]
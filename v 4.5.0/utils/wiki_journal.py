@@ -0,0 +1,200 @@
+"""
+═══════════════════════════════════════════════════════════════
+📓 Wiki Crawl Journal - Checkpoints that make crawls resumable
+SQLite (WAL): the crawl plan, the allpages cursor, which titles are
+still to do, and scraped pages not yet merged into the wiki store.
+Every batch is one transaction, so a crash loses at most one batch.
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from .storage import run_storage, run_storage_sync
+
+WIKI_JOURNAL_FILE = "data/wiki_crawl.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    wiki_key TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,          -- 'full' or 'delta'
+    force INTEGER NOT NULL,
+    watermark TEXT,              -- recentchanges timestamp to store when done
+    cursor TEXT,                 -- allpages apcontinue (full sync listing)
+    listed INTEGER NOT NULL,     -- 1 once every title to scrape is queued
+    started TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS queue (
+    wiki_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,         -- pending / done / missing / failed
+    PRIMARY KEY (wiki_key, title)
+);
+CREATE INDEX IF NOT EXISTS queue_state ON queue (wiki_key, state);
+CREATE TABLE IF NOT EXISTS pages (
+    wiki_key TEXT NOT NULL,
+    title TEXT NOT NULL,
+    data TEXT,                   -- page record as JSON; NULL = remove the page
+    PRIMARY KEY (wiki_key, title)
+);
+"""
+
+class CrawlJournal:
+    """One journal for every wiki; all calls run on the storage thread"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path = path or WIKI_JOURNAL_FILE
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    # ═══════════════════════════════════════════════════════════
+    # CRAWL PLAN
+    # ═══════════════════════════════════════════════════════════
+
+    def get_crawl(self, wiki_key: str) -> Optional[dict]:
+        """The unfinished crawl for a wiki, if any"""
+        row = self.conn.execute(
+            "SELECT mode, force, watermark, cursor, listed, started FROM crawls WHERE wiki_key = ?", (wiki_key,)
+        ).fetchone()
+        if row is None:
+            return None
+        mode, force, watermark, cursor, listed, started = row
+        counts = dict(self.conn.execute(
+            "SELECT state, COUNT(*) FROM queue WHERE wiki_key = ? GROUP BY state", (wiki_key,)
+        ).fetchall())
+        return {
+            'mode': mode,
+            'force': bool(force),
+            'watermark': watermark,
+            'cursor': cursor,
+            'listed': bool(listed),
+            'started': started,
+            'queued': sum(counts.values()),
+            'pending': counts.get('pending', 0)
+        }
+
+    def start_crawl(self, wiki_key: str, mode: str, force: bool, watermark: Optional[str],
+                    titles: Iterable[str] = (), deleted: Iterable[str] = (), listed: bool = False):
+        """Record a new crawl (delta syncs know all their titles up front)"""
+        with self.conn:
+            self._clear(wiki_key)
+            self.conn.execute(
+                "INSERT INTO crawls (wiki_key, mode, force, watermark, cursor, listed, started) "
+                "VALUES (?, ?, ?, ?, NULL, ?, ?)",
+                (wiki_key, mode, int(force), watermark, int(listed), datetime.utcnow().isoformat())
+            )
+            self._enqueue(wiki_key, titles)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (wiki_key, title, data) VALUES (?, ?, NULL)",
+                ((wiki_key, title) for title in deleted)
+            )
+
+    def add_listing(self, wiki_key: str, titles: Iterable[str], cursor: Optional[str], listed: bool):
+        """Queue one allpages chunk and move the cursor past it, atomically"""
+        with self.conn:
+            self._enqueue(wiki_key, titles)
+            self.conn.execute(
+                "UPDATE crawls SET cursor = ?, listed = ? WHERE wiki_key = ?", (cursor, int(listed), wiki_key)
+            )
+
+    def _enqueue(self, wiki_key: str, titles: Iterable[str]):
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO queue (wiki_key, title, state) VALUES (?, ?, 'pending')",
+            ((wiki_key, title) for title in titles)
+        )
+
+    # ═══════════════════════════════════════════════════════════
+    # PROGRESS
+    # ═══════════════════════════════════════════════════════════
+
+    def titles(self, wiki_key: str, state: str = 'pending') -> List[str]:
+        rows = self.conn.execute(
+            "SELECT title FROM queue WHERE wiki_key = ? AND state = ? ORDER BY title", (wiki_key, state)
+        )
+        return [title for (title,) in rows]
+
+    def record_batch(self, wiki_key: str, pages: Dict[str, dict], missing: Iterable[str],
+                     failed: Iterable[str]) -> int:
+        """Store a scraped batch; returns how many changes are waiting to be merged"""
+        missing, failed = list(missing), list(failed)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (wiki_key, title, data) VALUES (?, ?, ?)",
+                [(wiki_key, title, json.dumps(page, ensure_ascii=False)) for title, page in pages.items()]
+                + [(wiki_key, title, None) for title in missing]
+            )
+            self.conn.executemany(
+                "UPDATE queue SET state = ? WHERE wiki_key = ? AND title = ?",
+                [('done', wiki_key, title) for title in pages]
+                + [('missing', wiki_key, title) for title in missing]
+                + [('failed', wiki_key, title) for title in failed]
+            )
+        return self.unmerged_count(wiki_key)
+
+    def unmerged_count(self, wiki_key: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages WHERE wiki_key = ?", (wiki_key,)).fetchone()[0]
+
+    def unmerged(self, wiki_key: str) -> Tuple[Dict[str, dict], List[str]]:
+        """(pages to write, titles to remove) since the last merge"""
+        pages, deleted = {}, []
+        for title, data in self.conn.execute("SELECT title, data FROM pages WHERE wiki_key = ?", (wiki_key,)):
+            if data is None:
+                deleted.append(title)
+            else:
+                pages[title] = json.loads(data)
+        return pages, deleted
+
+    def mark_merged(self, wiki_key: str, titles: Iterable[str]):
+        """The wiki store has these now - drop them from the journal"""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM pages WHERE wiki_key = ? AND title = ?", ((wiki_key, title) for title in titles)
+            )
+
+    def finish(self, wiki_key: str):
+        """Crawl done and merged - forget it"""
+        with self.conn:
+            self._clear(wiki_key)
+
+    def _clear(self, wiki_key: str):
+        for table in ('crawls', 'queue', 'pages'):
+            self.conn.execute(f"DELETE FROM {table} WHERE wiki_key = ?", (wiki_key,))
+
+    def close(self):
+        self.conn.close()
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL JOURNAL
+# ═══════════════════════════════════════════════════════════════
+
+_journal: Optional[CrawlJournal] = None
+
+async def get_journal() -> CrawlJournal:
+    """Get (or open, on the storage thread) the crawl journal"""
+    global _journal
+    if _journal is None:
+        journal = await run_storage(CrawlJournal)
+        if _journal is None:  # Another wiki's sync may have opened it meanwhile
+            _journal = journal
+        else:
+            await run_storage(journal.close)
+    return _journal
+
+def close_journal():
+    """Close the journal database (called from /shutdown)"""
+    global _journal
+    if _journal is not None:
+        run_storage_sync(_journal.close)
+        _journal = None
+
+__all__ = [
+    'CrawlJournal',
+    'get_journal',
+    'close_journal'
+]
@@ -0,0 +1,384 @@
+"""
+═══════════════════════════════════════════════════════════════
+🧭 Wiki Vectors - Retrieval for the AI chat's game context
+Every page is cut into overlapping chunks, each chunk becomes a
+hashed TF-IDF vector (one row of a sparse NumPy matrix, built at
+crawl time). A question is one matrix-vector product away from its
+best-matching chunks across the whole corpus.
+═══════════════════════════════════════════════════════════════
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from .wiki_corpus import get_corpus, list_corpora
+from .wiki_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+    print("⚠️ numpy not installed - AI wiki context falls back to the search index")
+
+WIKI_VECTORS_DIR = "data/wiki_vectors"
+
+TERM_BUCKETS = 1 << 18       # Columns of the matrix - terms are hashed into these
+CHUNK_WORDS = 120            # Words per chunk...
+CHUNK_OVERLAP = 30           # ...and how many the next chunk repeats
+TITLE_WEIGHT = 2             # Page title terms count this many times in each of its chunks
+REBUILD_RATIO = 0.25         # Re-embed everything (fresh IDF) once this share of pages changed
+CANDIDATES_PER_RESULT = 4    # Top chunks looked at per result (best chunk per page wins)
+
+WORD_RE = re.compile(r"\S+")
+
+# ═══════════════════════════════════════════════════════════════
+# FEATURES
+# ═══════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=262144)
+def term_hash(term: str) -> int:
+    """Matrix column of a term (262k columns: collisions are rare enough to ignore)"""
+    return zlib.crc32(term.encode('utf-8')) & (TERM_BUCKETS - 1)
+
+def split_chunks(text: str) -> List[Tuple[int, int]]:
+    """(start, end) character spans of CHUNK_WORDS-word windows"""
+    words = [match.span() for match in WORD_RE.finditer(text)]
+    if not words:
+        return []
+    step = CHUNK_WORDS - CHUNK_OVERLAP
+    spans = []
+    for i in range(0, len(words), step):
+        window = words[i:i + CHUNK_WORDS]
+        spans.append((window[0][0], window[-1][1]))
+        if i + CHUNK_WORDS >= len(words):
+            break
+    return spans
+
+def chunk_features(title: str, text: str, spans: List[Tuple[int, int]]) -> List[Tuple[List[int], List[int]]]:
+    """(term hashes, term frequencies) per chunk"""
+    title_terms = Counter({term: TITLE_WEIGHT for term in tokenize(title)})
+    features = []
+    for start, end in spans or [(0, 0)]:
+        counts = Counter(tokenize(text[start:end]))
+        counts.update(title_terms)
+        features.append(([term_hash(term) for term in counts], list(counts.values())))
+    return features
+
+# ═══════════════════════════════════════════════════════════════
+# VECTOR STORE
+# ═══════════════════════════════════════════════════════════════
+
+class WikiVectors:
+    """
+    The chunk x term matrix, stored by column (CSC): the entries of column c
+    are row_ids/values[indptr[c]:indptr[c + 1]]. A question only touches the
+    columns of its own terms, so scoring reads a few postings, not the matrix.
+    rows  - [wiki_key, title, start, end] per matrix row (chunk)
+    pages - {wiki_key: {title: content_hash}} of what's embedded
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or WIKI_VECTORS_DIR
+        self.lock = threading.Lock()
+        self.indptr = np.zeros(TERM_BUCKETS + 1, dtype=np.int64)
+        self.row_ids = np.zeros(0, dtype=np.int32)
+        self.values = np.zeros(0, dtype=np.float32)
+        self.idf = None
+        self.rows: List[list] = []
+        self.pages: Dict[str, Dict[str, str]] = {}
+        self.changed = 0        # Pages embedded with a stale IDF since the last rebuild
+        self.built = None
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # ═══════════════════════════════════════════════════════════
+    # PERSISTENCE
+    # vectors.npz (raw arrays) + chunks.json (rows/pages)
+    # ═══════════════════════════════════════════════════════════
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @classmethod
+    def load(cls, directory: Optional[str] = None) -> "WikiVectors":
+        store = cls(directory)
+        try:
+            if os.path.exists(store.path("chunks.json")):
+                with open(store.path("chunks.json"), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                arrays = np.load(store.path("vectors.npz"))
+                if meta["buckets"] != TERM_BUCKETS or arrays["row_ids"].max(initial=-1) >= len(meta["rows"]):
+                    print("⚠️ Wiki vectors out of date, they will be rebuilt")
+                    return cls(directory)
+                store.indptr = arrays["indptr"]
+                store.row_ids = arrays["row_ids"]
+                store.values = arrays["values"]
+                store.idf = arrays["idf"]
+                store.rows = meta["rows"]
+                store.pages = meta["pages"]
+                store.changed = meta["changed"]
+                store.built = meta["built"]
+        except Exception as e:
+            print(f"⚠️ Failed to load wiki vectors, they will be rebuilt: {e}")
+            return cls(directory)
+        return store
+
+    def save(self) -> bool:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path("vectors.npz.tmp"), 'wb') as f:
+                np.savez(f, indptr=self.indptr, row_ids=self.row_ids, values=self.values, idf=self.idf)
+            os.replace(self.path("vectors.npz.tmp"), self.path("vectors.npz"))
+            # chunks.json last: it's what load() checks the arrays against
+            with open(self.path("chunks.json.tmp"), 'w', encoding='utf-8') as f:
+                json.dump({
+                    "buckets": TERM_BUCKETS,
+                    "rows": self.rows,
+                    "pages": self.pages,
+                    "changed": self.changed,
+                    "built": self.built
+                }, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(self.path("chunks.json.tmp"), self.path("chunks.json"))
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to save wiki vectors: {e}")
+            return False
+
+    # ═══════════════════════════════════════════════════════════
+    # EMBEDDING
+    # ═══════════════════════════════════════════════════════════
+
+    def embed_pages(self, pages: List[Tuple[str, str, dict]], idf=None, first_row: int = 0):
+        """
+        Matrix entries for (wiki_key, title, page) triples →
+        (row_ids, columns, values, rows, idf). Every chunk's terms go into
+        flat arrays, so weighting and normalising are a few NumPy calls.
+        """
+        rows, row_ids, columns, tfs = [], [], [], []
+        for wiki_key, page_title, page in pages:
+            content = page.get("content", "")
+            spans = split_chunks(content)
+            for (terms, counts), (start, end) in zip(chunk_features(page_title, content, spans),
+                                                     spans or [(0, 0)]):
+                row_ids.extend([first_row + len(rows)] * len(terms))
+                columns.extend(terms)
+                tfs.extend(counts)
+                rows.append([wiki_key, page_title, start, end])
+
+        row_ids = np.array(row_ids, dtype=np.int32)
+        columns = np.array(columns, dtype=np.int64)
+        tfs = np.array(tfs, dtype=np.float32)
+        if idf is None:
+            # Each (chunk, term) pair appears once, so this counts chunks per term
+            df = np.bincount(columns, minlength=TERM_BUCKETS)
+            idf = (np.log((1 + len(rows)) / (1 + df)) + 1).astype(np.float32)
+
+        values = (1 + np.log(tfs)) * idf[columns]
+        # L2-normalise each chunk: scores become cosine similarities
+        norms = np.sqrt(np.bincount(row_ids - first_row, weights=values * values, minlength=len(rows)))
+        values = (values / np.maximum(norms[row_ids - first_row], 1e-9)).astype(np.float32)
+        return row_ids, columns, values, rows, idf
+
+    def set_entries(self, row_ids, columns, values):
+        """Sort entries by column and rebuild the column pointers"""
+        order = np.argsort(columns, kind='stable')
+        counts = np.bincount(columns, minlength=TERM_BUCKETS)
+        self.indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self.row_ids = row_ids[order].astype(np.int32)
+        self.values = values[order].astype(np.float32)
+
+    def entries(self) -> tuple:
+        """(row_ids, columns, values) of every stored entry"""
+        columns = np.repeat(np.arange(TERM_BUCKETS, dtype=np.int64), np.diff(self.indptr))
+        return self.row_ids, columns, self.values
+
+    def embed_query(self, query: str) -> Tuple[List[int], List[float]]:
+        """Columns and unit-vector weights for a question (same hashing and IDF as the chunks)"""
+        counts = Counter(term_hash(term) for term in tokenize(query))
+        weights = {column: (1 + math.log(tf)) * float(self.idf[column]) for column, tf in counts.items()}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        if not norm:
+            return [], []
+        return list(weights), [weight / norm for weight in weights.values()]
+
+    # ═══════════════════════════════════════════════════════════
+    # UPDATES
+    # ═══════════════════════════════════════════════════════════
+
+    def rebuild(self, wiki_keys: List[str]) -> int:
+        """Embed every page of these wikis with a fresh IDF"""
+        pages = []
+        hashes = {}
+        for wiki_key in wiki_keys:
+            corpus = get_corpus(wiki_key)
+            hashes[wiki_key] = {}
+            for page_title in corpus.titles():
+                page = corpus.get(page_title)
+                if page is not None:
+                    pages.append((wiki_key, page_title, page))
+                    hashes[wiki_key][page_title] = page.get("content_hash", "")
+
+        row_ids, columns, values, rows, idf = self.embed_pages(pages)
+        with self.lock:
+            self.set_entries(row_ids, columns, values)
+            self.rows, self.idf, self.pages = rows, idf, hashes
+            self.changed = 0
+            self.built = datetime.utcnow().isoformat()
+            self.rebuilds += 1
+        self.save()
+        return len(pages)
+
+    def update_wiki(self, wiki_key: str) -> dict:
+        """Re-embed a wiki's new/changed pages and drop deleted ones (after a crawl)"""
+        corpus = get_corpus(wiki_key)
+        current = corpus.metadata()
+        embedded = self.pages.get(wiki_key, {})
+        changed = [title for title, meta in current.items() if embedded.get(title) != meta["content_hash"]]
+        gone = [title for title in embedded if title not in current]
+        result = {'embedded': len(changed), 'deleted': len(gone), 'rebuilt': False}
+        if not changed and not gone:
+            return result
+
+        total = sum(len(titles) for titles in self.pages.values()) + len(changed)
+        if self.idf is None or self.changed + len(changed) + len(gone) > REBUILD_RATIO * total:
+            # Enough drift that the old IDF misjudges which words are rare
+            result['embedded'] = self.rebuild(sorted(set(self.pages) | set(list_corpora()) | {wiki_key}))
+            result['rebuilt'] = True
+            return result
+
+        pages = []
+        for page_title in changed:
+            page = corpus.get(page_title)
+            if page is not None:
+                pages.append((wiki_key, page_title, page))
+
+        dropped = set(changed) | set(gone)
+        keep = np.array([not (row[0] == wiki_key and row[1] in dropped) for row in self.rows], dtype=bool)
+        renumber = (np.cumsum(keep) - 1).astype(np.int32)
+        row_ids, columns, values = self.entries()
+        kept = keep[row_ids]
+        new_row_ids, new_columns, new_values, rows, _ = self.embed_pages(pages, self.idf, int(keep.sum()))
+
+        with self.lock:
+            self.set_entries(np.concatenate([renumber[row_ids[kept]], new_row_ids]),
+                             np.concatenate([columns[kept], new_columns]),
+                             np.concatenate([values[kept], new_values]))
+            self.rows = [row for row, k in zip(self.rows, keep) if k] + rows
+            hashes = {title: digest for title, digest in embedded.items() if title not in dropped}
+            hashes.update((page_title, page.get("content_hash", "")) for _, page_title, page in pages)
+            self.pages[wiki_key] = hashes
+            self.changed += len(changed) + len(gone)
+        self.save()
+        return result
+
+    # ═══════════════════════════════════════════════════════════
+    # SEARCH
+    # ═══════════════════════════════════════════════════════════
+
+    def search(self, query: str, limit: int = 3, min_score: float = 0.0) -> List[dict]:
+        """Best chunks for a question, at most one per page"""
+        with self.lock:
+            if self.idf is None or not self.rows:
+                return []
+            columns, weights = self.embed_query(query)
+            if not columns:
+                return []
+            # Matrix-vector product, restricted to the question's non-zero columns
+            spans = [(self.indptr[column], self.indptr[column + 1]) for column in columns]
+            row_ids = np.concatenate([self.row_ids[start:end] for start, end in spans])
+            values = np.concatenate([self.values[start:end] * weight for (start, end), weight in zip(spans, weights)])
+            scores = np.bincount(row_ids, weights=values, minlength=len(self.rows))
+            rows = self.rows
+
+        wanted = min(len(rows), limit * CANDIDATES_PER_RESULT)
+        top = np.argpartition(-scores, wanted - 1)[:wanted]
+        results, seen = [], set()
+        for row_id in top[np.argsort(-scores[top])]:
+            score = float(scores[row_id])
+            if score < min_score or len(results) == limit:
+                break
+            wiki_key, page_title, start, end = rows[row_id]
+            if (wiki_key, page_title) in seen:
+                continue
+            page = get_corpus(wiki_key).get(page_title)
+            if page is None:
+                continue
+            seen.add((wiki_key, page_title))
+            results.append({
+                "wiki": wiki_key,
+                "title": page_title,
+                "url": page.get("url"),
+                "content": page.get("content", "")[start:end],
+                "score": round(score, 3)
+            })
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'chunks': len(self.rows),
+            'pages': sum(len(titles) for titles in self.pages.values()),
+            'entries': len(self.values),
+            'bytes': self.indptr.nbytes + self.row_ids.nbytes + self.values.nbytes,
+            'changed_since_rebuild': self.changed,
+            'built': self.built
+        }
+
+# ═══════════════════════════════════════════════════════════════
+# MODULE-LEVEL STORE
+# ═══════════════════════════════════════════════════════════════
+
+_vectors: Optional[WikiVectors] = None
+_build_lock = threading.Lock()
+
+def vectors_available() -> bool:
+    return np is not None
+
+def get_wiki_vectors() -> WikiVectors:
+    """The vector store (read from disk on first use)"""
+    global _vectors
+    if _vectors is None:
+        _vectors = WikiVectors.load()
+    return _vectors
+
+def update_wiki_vectors(wiki_key: str) -> Optional[dict]:
+    """Embed a wiki's changed pages after a fetch (safe to run in a thread)"""
+    if np is None:
+        return None
+    with _build_lock:
+        result = get_wiki_vectors().update_wiki(wiki_key)
+    if result['embedded'] or result['deleted']:
+        action = "rebuilt" if result['rebuilt'] else f"+{result['embedded']} -{result['deleted']}"
+        print(f"🧭 Wiki vectors {wiki_key}: {action} ({len(get_wiki_vectors())} chunks)")
+    return result
+
+def search_wiki_vectors(query: str, limit: int = 3, min_score: float = 0.0) -> List[dict]:
+    """Top chunks for a question (builds the vectors on first use; run in a thread)"""
+    if np is None:
+        return []
+    store = get_wiki_vectors()
+    if not len(store):
+        with _build_lock:
+            if not len(store) and list_corpora():
+                store.rebuild(list_corpora())
+    return store.search(query, limit, min_score)
+
+def get_wiki_vectors_stats() -> dict:
+    return get_wiki_vectors().stats() if np is not None else {}
+
+__all__ = [
+    'WikiVectors',
+    'vectors_available',
+    'get_wiki_vectors',
+    'update_wiki_vectors',
+    'search_wiki_vectors',
+    'get_wiki_vectors_stats'
+]